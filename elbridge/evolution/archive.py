@@ -0,0 +1,221 @@
+"""External Pareto archive.
+
+NSGA-II keeps only pop_size plans, and crowding truncation drops non-dominated plans a run may never find again. The
+archive keeps every non-dominated plan seen during a run (or, with a max_size, the most spread out of them), indexed
+by score vector so that inserting a plan and pruning the plans it dominates doesn't compare it against the whole
+archive: for two objectives the index is a sorted list searched by bisection, otherwise a score matrix compared in
+one vectorized pass. Accepted plans can be streamed to a JSON Lines file, from which read_archive rebuilds the archive.
+The file starts with the names of the master graph's vertices, in index order, so that its plans can be read onto a
+graph whose vertices have changed (see readers.plans).
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.metrics import MetricsLog
+from elbridge.evolution.sorting import crowding_distances
+from elbridge.utilities.utils import vertex_order
+
+Point = Tuple[float, ...]
+
+
+class ArchivedPlan(NamedTuple):
+    fingerprint: int
+    scores: Point
+    assignment: np.ndarray
+
+
+class _SortedFront:
+    """
+    Mutually non-dominated two-objective points, sorted by increasing first objective; the second objective then
+    decreases, so both the point that could dominate a new one and the run of points a new one dominates are found
+    by bisection.
+    """
+
+    def __init__(self):
+        self._points: List[Point] = []
+        self._first: List[float] = []
+        # negated second objectives, increasing
+        self._second: List[float] = []
+
+    def insert(self, point: Point) -> Optional[List[Point]]:
+        """Add a point. Returns the points it dominates, which are removed, or None if it is dominated."""
+        idx = bisect_left(self._first, point[0])
+        if idx < len(self._points) and self._points[idx] == point:
+            return []
+        # the point with the best second objective among those at least as good in the first
+        if idx < len(self._points) and self._points[idx][1] >= point[1]:
+            return None
+
+        end = bisect_right(self._first, point[0])
+        start = bisect_left(self._second, -point[1], 0, end)
+        dominated = self._points[start:end]
+
+        self._points[start:end] = [point]
+        self._first[start:end] = [point[0]]
+        self._second[start:end] = [-point[1]]
+        return dominated
+
+    def remove(self, point: Point) -> None:
+        idx = bisect_left(self._first, point[0])
+        del self._points[idx], self._first[idx], self._second[idx]
+
+    def points(self) -> List[Point]:
+        return list(self._points)
+
+
+class _NondominatedList:
+    """Mutually non-dominated points of any dimension, as rows of a score matrix."""
+
+    def __init__(self, objective_count: int):
+        self._points = np.empty((0, objective_count))
+
+    def insert(self, point: Point) -> Optional[List[Point]]:
+        """Add a point. Returns the points it dominates, which are removed, or None if it is dominated."""
+        vector = np.asarray(point, dtype=float)
+        at_least = np.all(self._points >= vector, axis=1)
+        at_most = np.all(self._points <= vector, axis=1)
+        if np.any(at_least & at_most):
+            return []
+        if np.any(at_least):
+            return None
+
+        dominated = [tuple(row) for row in self._points[at_most].tolist()]
+        self._points = np.vstack([self._points[~at_most], vector])
+        return dominated
+
+    def remove(self, point: Point) -> None:
+        self._points = self._points[~np.all(self._points == np.asarray(point, dtype=float), axis=1)]
+
+    def points(self) -> List[Point]:
+        return [tuple(row) for row in self._points.tolist()]
+
+
+class ParetoArchive:
+    """
+    Non-dominated plans, deduplicated by fingerprint. Distinct plans with equal scores are all kept. With a max_size,
+    the archive evicts plans with duplicate scores first, then the plan with the smallest crowding distance.
+    """
+
+    def __init__(self, objective_count: int, max_size: Optional[int] = None):
+        self.objective_count = objective_count
+        self.max_size = max_size
+        self._index = _SortedFront() if objective_count == 2 else _NondominatedList(objective_count)
+        self._plans: Dict[Point, List[ArchivedPlan]] = {}
+        self._fingerprints = set()
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def __contains__(self, fingerprint: int):
+        return fingerprint in self._fingerprints
+
+    def add(self, fingerprint: int, scores: Sequence[float], assignment: Sequence[int]) -> Optional[ArchivedPlan]:
+        """Offer a plan. Returns the archived plan, or None if it wasn't archived; plans it dominates are dropped."""
+        if fingerprint in self._fingerprints:
+            return None
+
+        point = tuple(float(score) for score in scores)
+        dominated = self._index.insert(point)
+        if dominated is None:
+            return None
+
+        for other in dominated:
+            for plan in self._plans.pop(other):
+                self._fingerprints.discard(plan.fingerprint)
+
+        plan = ArchivedPlan(fingerprint, point, np.array(assignment))
+        self._plans.setdefault(point, []).append(plan)
+        self._fingerprints.add(fingerprint)
+
+        if self.max_size is not None and len(self) > self.max_size:
+            self._evict()
+        return plan if fingerprint in self._fingerprints else None
+
+    def update(self, population: List[Candidate]) -> List[ArchivedPlan]:
+        """
+        Offer every candidate of a population. Returns the plans archived, including any that later members of the
+        population displaced, so that replaying them rebuilds the same archive.
+        """
+        archived = []
+        for candidate in population:
+            chromosome = candidate.chromosome
+            plan = self.add(chromosome.get_fingerprint(), chromosome.get_scores(), chromosome.assignment_array())
+            if plan is not None:
+                archived.append(plan)
+
+        return archived
+
+    def _evict(self) -> None:
+        point = max(self._plans, key=lambda p: len(self._plans[p]))
+        if len(self._plans[point]) == 1:
+            points = self._index.points()
+            scores = np.array(points)
+            distances = crowding_distances(scores, scores.min(axis=0), scores.max(axis=0))
+            point = points[int(np.argmin(distances))]
+
+        plans = self._plans[point]
+        self._fingerprints.discard(plans.pop().fingerprint)
+        if not plans:
+            del self._plans[point]
+            self._index.remove(point)
+
+    def plans(self) -> List[ArchivedPlan]:
+        """Archived plans, sorted by score."""
+        return [plan for point in sorted(self._plans) for plan in self._plans[point]]
+
+    def scores(self) -> np.ndarray:
+        return np.array([plan.scores for plan in self.plans()]).reshape(-1, self.objective_count)
+
+    def candidates(self, master_graph) -> List[Candidate]:
+        """Archived plans as candidates on a master graph (Chromosome.objectives must be set)."""
+        return [Candidate(Chromosome(master_graph, plan.assignment.copy())) for plan in self.plans()]
+
+
+def write_vertices(log: MetricsLog, master_graph) -> None:
+    """Stream the names of a master graph's vertices, in index order: the vertices archived assignments are over."""
+    order = vertex_order(master_graph)
+    log.write(0, vertices=[str(vertex) for vertex in sorted(order, key=order.get)])
+
+
+def read_vertices(path: str) -> Optional[List[str]]:
+    """The vertex names an archive's plans are over, or None if it doesn't record them."""
+    with open(path) as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'vertices' in record:
+                return record['vertices']
+
+    return None
+
+
+def write_plans(log: MetricsLog, generation: int, plans: List[ArchivedPlan]) -> None:
+    """Stream newly archived plans to a log, one line per plan."""
+    for plan in plans:
+        log.write(generation, fingerprint=plan.fingerprint, scores=plan.scores, assignment=plan.assignment)
+
+
+def read_archive(path: str, objective_count: int, max_size: Optional[int] = None) -> ParetoArchive:
+    """
+    Rebuild an archive from a stream of archived plans by offering them again in order. A partly-written last line
+    is skipped. With a max_size, evictions happen as they did during the run.
+    """
+    archive = ParetoArchive(objective_count, max_size=max_size)
+    with open(path) as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'fingerprint' in record:
+                archive.add(record['fingerprint'], record['scores'], record['assignment'])
+
+    return archive
@@ -0,0 +1,72 @@
+"""Population arena.
+
+A generation's parents and children live in one contiguous 2D assignment array, one row per candidate, next to
+matrices of their scores, ranks and crowding distances. Chromosomes in the arena are views of their rows, so a
+population costs a predictable N x |V| block of small integers instead of N Python lists. With shared set, the
+arrays are in shared memory: worker processes forked after the arena was made read parents straight from it, and
+only row numbers cross the process boundary.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.engine import process_context
+
+
+class PopulationArena:
+    """Rows [0, pop_size) hold the parents, and rows [pop_size, 2 * pop_size) the children of a generation."""
+
+    def __init__(self, vertex_count: int, pop_size: int, objective_count: int, shared: bool = False):
+        self.pop_size = pop_size
+        self.shared = shared
+        capacity = 2 * pop_size
+
+        # districts are labeled 1..|V| at most
+        dtype = np.min_scalar_type(vertex_count)
+        self.assignments = self._allocate((capacity, vertex_count), dtype, shared)
+        self.scores = self._allocate((capacity, objective_count), np.float64, shared)
+        self.ranks = self._allocate((capacity,), np.int64, shared)
+        self.distances = self._allocate((capacity,), np.float64, shared)
+
+    @staticmethod
+    def _allocate(shape: tuple, dtype, shared: bool) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        if not shared:
+            return np.zeros(shape, dtype=dtype)
+
+        buffer = process_context().RawArray('b', int(np.prod(shape)) * dtype.itemsize)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.assignments, self.scores, self.ranks, self.distances))
+
+    def store(self, population: list, start: int = 0) -> None:
+        """
+        Copy a population into consecutive rows from start, and make its chromosomes views of their new rows.
+        Rows are gathered first, so the population may already live anywhere in the arena.
+        """
+        end = start + len(population)
+        self.assignments[start:end] = np.array([p.chromosome.assignment_array() for p in population])
+        self.scores[start:end] = [p.chromosome.get_scores() for p in population]
+        self.ranks[start:end] = [p.rank for p in population]
+        self.distances[start:end] = [p.distance for p in population]
+
+        for row, candidate in enumerate(population, start=start):
+            candidate.chromosome.bind(self.assignments[row])
+            candidate.row = row
+
+    def candidate(self, master_graph, row: int, component_scores: Optional[dict] = None) -> Candidate:
+        """A new candidate viewing an arena row, e.g. one a worker wrote a child into."""
+        candidate = Candidate(Chromosome(master_graph, self.assignments[row], component_scores=component_scores))
+        candidate.row = row
+        return candidate
+
+    def parents(self) -> np.ndarray:
+        return self.assignments[:self.pop_size]
+
+    def children(self) -> np.ndarray:
+        return self.assignments[self.pop_size:]
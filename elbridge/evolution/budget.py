@@ -0,0 +1,89 @@
+"""Wall-clock budgets.
+
+A run with a time budget stops before starting a generation it can't finish, and hands local search a deadline, so
+hill-climbing in progress stops when the budget runs out. SIGTERM and SIGINT ask the run to stop after the
+generation in progress, so it returns (and checkpoints) the frontier so far; a second signal interrupts right away.
+Engine workers ignore SIGINT and die of SIGTERM, so SIGTERM should go to the run's process alone, not its group.
+"""
+
+import signal
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# the reason a run stopped, by signal
+SIGNAL_REASONS = {signal.SIGINT: 'interrupted', signal.SIGTERM: 'terminated'}
+
+
+class Budget:
+    """The deadline of a run (if it has one), where its time went, and whether a signal asked it to stop."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.started = time.time()
+        self.deadline = None if seconds is None else self.started + seconds
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.stop_reason: Optional[str] = None
+        # seconds per step of local search, per child, measured in the run
+        self._step_seconds: Optional[float] = None
+
+    def remaining(self) -> float:
+        return float('inf') if self.deadline is None else max(self.deadline - time.time(), 0.0)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the block to a phase."""
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.time() - started
+
+    def record_search(self, seconds: float, steps: int, children: int) -> None:
+        """Measure local search: seconds it took to run up to steps steps on children children."""
+        if steps and children:
+            self._step_seconds = seconds / (steps * children)
+
+    def steps(self, steps: int, children: int) -> int:
+        """Scale down a number of local search steps for children children to what the remaining time affords."""
+        if self.deadline is None or self._step_seconds is None:
+            return steps
+        return max(1, min(steps, int(self.remaining() / (self._step_seconds * max(children, 1)))))
+
+    def should_stop(self, generation_seconds: float = 0.0) -> Optional[str]:
+        """Why the run should stop before another generation taking generation_seconds, if it should."""
+        if self.stop_reason is None and self.deadline is not None and self.remaining() <= generation_seconds:
+            self.stop_reason = 'time_budget'
+        return self.stop_reason
+
+    def stats(self) -> dict:
+        return {
+            'elapsed': time.time() - self.started,
+            'remaining': None if self.deadline is None else self.remaining(),
+            'phases': dict(self.phases),
+        }
+
+
+@contextmanager
+def stop_on_signals(budget: Budget):
+    """
+    Within the block, SIGTERM and SIGINT set the budget's stop reason instead of ending the process; a second one
+    raises KeyboardInterrupt. Signal handlers can only be set from the main thread; elsewhere, this does nothing.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle(signum, _frame):
+        if budget.stop_reason is not None:
+            raise KeyboardInterrupt
+        budget.stop_reason = SIGNAL_REASONS[signum]
+        print("stopping after this generation ({}); signal again to stop now".format(budget.stop_reason))
+
+    previous = {signum: signal.signal(signum, handle) for signum in SIGNAL_REASONS}
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
@@ -0,0 +1,105 @@
+"""Process-wide memoization of chromosome scores, keyed by plan fingerprint."""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CachedScores(NamedTuple):
+    scores: Tuple[float, ...]
+    # district hash -> component scores; district hashes don't depend on district labels
+    component_scores: Dict[int, Dict[str, float]]
+
+
+def _entry_size(value: CachedScores) -> int:
+    """Approximate footprint of one cache entry in bytes."""
+    size = sys.getsizeof(value) + sys.getsizeof(value.scores) + sys.getsizeof(value.component_scores)
+    for district_scores in value.component_scores.values():
+        size += sys.getsizeof(district_scores) + 2 * sys.getsizeof(0.0) * len(district_scores)
+
+    return size
+
+
+class ScoreCache:
+    """LRU cache of scored plans, bounded by an approximate memory budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+
+        self._entries: 'OrderedDict[int, Tuple[CachedScores, int]]' = OrderedDict()
+        self._bytes = 0
+        # scores are only valid for the objective functions that produced them
+        self._objectives: Tuple[int, ...] = ()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bind(self, objectives: Sequence) -> None:
+        token = tuple(id(fn) for fn in objectives)
+        if token != self._objectives:
+            self.clear()
+            self._objectives = token
+
+    def get(self, objectives: Sequence, key: int) -> Optional[CachedScores]:
+        self._bind(objectives)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, objectives: Sequence, key: int) -> Optional[CachedScores]:
+        """Like get, but doesn't count towards hit/miss statistics or touch the LRU order."""
+        self._bind(objectives)
+
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def put(self, objectives: Sequence, key: int, value: CachedScores) -> None:
+        self._bind(objectives)
+        if self.max_bytes <= 0 or key in self._entries:
+            return
+
+        size = _entry_size(value)
+        self._entries[key] = (value, size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def resize(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self, reset: bool = False) -> Dict[str, int]:
+        """Hit/miss counts since the last reset, plus the current size of the cache."""
+        out = {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self._bytes}
+        if reset:
+            self.hits = self.misses = 0
+
+        return out
+
+
+SCORE_CACHE = ScoreCache()
+
+
+def cached_scores(objectives: Sequence, key: int) -> Optional[List[float]]:
+    """Scores of an already-evaluated plan, if the cache still has them."""
+    entry = SCORE_CACHE.peek(objectives, key)
+    return list(entry.scores) if entry else None
@@ -1,8 +1,8 @@
 """Encapsulates a candidate solution."""
 
-from random import random
-from typing import List, Set
+from typing import List, Optional
 
+import numpy as np
 from shapely.ops import cascaded_union
 
 from elbridge.evolution import search
@@ -17,14 +17,15 @@ class Candidate:
     def __init__(self, chromosome: Chromosome):
         self.chromosome = chromosome
 
-        # set of candidates this candidate dominates
-        self.dominated_set: Set[int] = set()
-        # number of candidates this candidate is dominated by
-        self.domination_count: int = 0
         # this candidate's front
         self.rank: int = 0
         # distance to other candidates on front
         self.distance: int = 0
+        # row in a PopulationArena, if the chromosome is one of its views
+        self.row: Optional[int] = None
+        # MinHash sketch of the plan (see evolution.sketch), and how unlike the rest of its population it is
+        self.sketch: Optional[np.ndarray] = None
+        self.novelty: float = 1.0
 
         self.name = Candidate.i
         Candidate.i += 1
@@ -40,36 +41,36 @@ class Candidate:
 
     def refresh(self):
         """Clear out NSGA stuff."""
-        self.dominated_set = set()
-        self.domination_count = 0
         self.rank = 0
         self.distance = 0
+        self.novelty = 1.0
 
     def dominates(self, other: 'Candidate') -> bool:
         return self.chromosome.dominates(other.chromosome)
 
     def crossover_and_mutate(self, other: 'Candidate', mutation_probability: float) -> List['Candidate']:
-        new_candidates = self.chromosome.crossover(other.chromosome)
+        new_candidates = self.chromosome.crossover(other.chromosome, mutation_probability=mutation_probability)
 
         out = []
         for child in new_candidates:
-            if random() < mutation_probability:
-                child.mutate()
             child.normalize()
             out.append(Candidate(child))
 
         return out
 
-    def optimize(self, pos=0):
+    def optimize(self, pos=0, multiprocess=True, steps=20, sample_size=50, deadline=None):
         """Convert a candidate into a state, optimize, and convert back."""
-        state = search.optimize(self.chromosome, pos=pos, steps=20, sample_size=50)
+        state = search.optimize(
+            self.chromosome, pos=pos, steps=steps, sample_size=sample_size, multiprocess=multiprocess,
+            deadline=deadline
+        )
         state.normalize()
 
         return Candidate(state)
 
     def export(self):
         with cd('out/chromosome_{}/'.format(self.name)):
-            with open('elements.csv') as outfile:
+            with open('elements.csv', 'w') as outfile:
                 outfile.write(','.join(['element', 'population', 'component']) + '\n')
                 graph = self.chromosome.get_master_graph()
                 for vertex in graph:
@@ -77,7 +78,7 @@ class Candidate:
                     component_idx = self.chromosome.get_component(vertex)
                     outfile.write(','.join([str(vertex), str(data.get('pop', 0)), str(component_idx)]) + '\n')
 
-            with open('components.csv') as outfile:
+            with open('components.csv', 'w') as outfile:
                 component_scores = self.chromosome.get_component_scores()
                 outfile.write(','.join(['component'] + Chromosome.__scores__) + "\n")
 
@@ -0,0 +1,130 @@
+"""Checkpoints of long evolution runs.
+
+A checkpoint holds everything run_nsga2 needs to continue exactly where it left off: the parents' assignments,
+ranks and distances, the generation counter, the current mutation probability, the state of both random number
+generators, the hypervolume of every generation so far (for convergence checks) and the state of the run's
+MemeticScheduler, if it has one. Checkpoints are compressed .npz files, written atomically so a run killed mid-write
+(Condor sends SIGKILL) still leaves the previous checkpoint intact.
+"""
+
+import json
+import os
+import random
+import tempfile
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.engine import compact
+from elbridge.utilities.xceptions import CheckpointMismatchException
+
+
+class Checkpoint(NamedTuple):
+    generation: int
+    mutation_probability: float
+    # one row per parent, in population order
+    assignments: np.ndarray
+    ranks: np.ndarray
+    distances: np.ndarray
+    python_state: tuple
+    numpy_state: tuple
+    hypervolumes: np.ndarray = np.zeros(0)
+    # see MemeticScheduler.get_state
+    scheduler_state: Optional[dict] = None
+
+
+def capture(parents: List[Candidate], generation: int, mutation_probability: float,
+            hypervolumes: Sequence[float] = (), scheduler_state: Optional[dict] = None) -> Checkpoint:
+    """Snapshot the state of a run at the end of a generation."""
+    return Checkpoint(
+        generation=generation,
+        mutation_probability=mutation_probability,
+        assignments=compact([p.chromosome.get_assignment() for p in parents]),
+        ranks=np.array([p.rank for p in parents], dtype=np.int64),
+        distances=np.array([p.distance for p in parents], dtype=float),
+        python_state=random.getstate(),
+        numpy_state=np.random.get_state(),
+        hypervolumes=np.array(hypervolumes, dtype=float),
+        scheduler_state=scheduler_state,
+    )
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint next to its destination, then atomically move it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    version, python_keys, python_gauss = checkpoint.python_state
+    _, numpy_keys, numpy_pos, numpy_has_gauss, numpy_gauss = checkpoint.numpy_state
+
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as outfile:
+            np.savez_compressed(
+                outfile,
+                generation=checkpoint.generation,
+                mutation_probability=checkpoint.mutation_probability,
+                assignments=checkpoint.assignments,
+                ranks=checkpoint.ranks,
+                distances=checkpoint.distances,
+                python_version=version,
+                python_keys=np.array(python_keys, dtype=np.uint32),
+                python_gauss=np.nan if python_gauss is None else python_gauss,
+                numpy_keys=numpy_keys,
+                numpy_pos=numpy_pos,
+                numpy_has_gauss=numpy_has_gauss,
+                numpy_gauss=numpy_gauss,
+                hypervolumes=checkpoint.hypervolumes,
+                scheduler_state=json.dumps(checkpoint.scheduler_state),
+            )
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    with np.load(path) as data:
+        python_gauss = data['python_gauss'].item()
+        return Checkpoint(
+            generation=data['generation'].item(),
+            mutation_probability=data['mutation_probability'].item(),
+            assignments=data['assignments'],
+            ranks=data['ranks'],
+            distances=data['distances'],
+            python_state=(
+                data['python_version'].item(), tuple(data['python_keys'].tolist()),
+                None if np.isnan(python_gauss) else python_gauss
+            ),
+            numpy_state=(
+                'MT19937', data['numpy_keys'], data['numpy_pos'].item(), data['numpy_has_gauss'].item(),
+                data['numpy_gauss'].item()
+            ),
+            # checkpoints written before these were kept hold neither
+            hypervolumes=data['hypervolumes'] if 'hypervolumes' in data else np.zeros(0),
+            scheduler_state=json.loads(data['scheduler_state'].item()) if 'scheduler_state' in data else None,
+        )
+
+
+def restore(master_graph: Graph, checkpoint: Checkpoint) -> List[Candidate]:
+    """Rebuild the parent population of a checkpoint and restore the random number generators."""
+    if checkpoint.assignments.shape[1] != len(master_graph):
+        raise CheckpointMismatchException(checkpoint.assignments.shape[1], len(master_graph))
+
+    parents = []
+    for assignment, rank, distance in zip(checkpoint.assignments, checkpoint.ranks, checkpoint.distances):
+        parent = Candidate(Chromosome(master_graph, assignment.tolist()))
+        parent.rank, parent.distance = rank.item(), distance.item()
+        parents.append(parent)
+
+    random.setstate(checkpoint.python_state)
+    np.random.set_state(checkpoint.numpy_state)
+
+    return parents
@@ -1,30 +1,40 @@
 from collections import defaultdict
-from random import randint, randrange
-from typing import List, Dict, Optional, DefaultDict, TYPE_CHECKING, Set
+from random import randint, random, randrange
+from typing import List, Dict, Optional, DefaultDict, TYPE_CHECKING, Union
 
-from networkx import Graph, is_frozen, freeze, nx, connected_component_subgraphs
+import numpy as np
+from networkx import Graph, is_frozen, freeze, connected_component_subgraphs
 
+from elbridge.evolution import contiguity, fingerprint
+from elbridge.evolution.cache import SCORE_CACHE, CachedScores
 from elbridge.evolution.hypotheticals import HypotheticalSet
 from elbridge.readers.plot import plot_shapes
-from elbridge.utilities.types import Node, Component, FatNode, Edge
-from elbridge.utilities.utils import dominates, gradient, number_connected_components
+from elbridge.readers.table import get_table
+from elbridge.utilities.types import Component, FatNode, Edge
+from elbridge.utilities.utils import dominates, gradient, vertex_order
 from elbridge.utilities.xceptions import SameComponentException, ClassNotInitializedException
 
 if TYPE_CHECKING:
     from elbridge.evolution.objectives import ObjectiveFunction
 
+Assignment = Union[List[int], np.ndarray]
+
 
 class Chromosome:
     """
     Chromosome. Stores an (immutable) master graph.
+
+    The assignment is either a list or a numpy array; in a PopulationArena, it's a view of one of the arena's rows.
     """
     objectives = []  # type: List[ObjectiveFunction]
 
     __scores__ = ['total_pop', 'components']
 
     @profile
-    def __init__(self, graph: Graph, assignment: List[int], components: Optional[DefaultDict[int, Component]] = None,
-                 component_scores: Optional[Dict[int, Dict[str, float]]] = None):
+    def __init__(self, graph: Graph, assignment: Assignment, components: Optional[DefaultDict[int, Component]] = None,
+                 component_scores: Optional[Dict[int, Dict[str, float]]] = None,
+                 district_hashes: Optional[Dict[int, int]] = None, plan_fingerprint: Optional[int] = None,
+                 scores: Optional[List[float]] = None):
         if not Chromosome.objectives:
             raise ClassNotInitializedException(Chromosome)
 
@@ -33,27 +43,58 @@ class Chromosome:
         else:
             self._graph = graph
 
-        if 'order' not in graph.graph:
-            # require an order on the graph for consistency
-            # order[i] = j implies that vertex i is located at index j in vertex_set
-            self._graph.graph['order'] = {vertex: idx for idx, vertex in enumerate(self._graph)}
+        # require an order on the graph for consistency
+        vertex_order(self._graph)
 
-        self._assignment: List[int] = assignment
-        self._components: Dict[int, Component] = defaultdict(set)
+        self._assignment: Assignment = assignment
+        # built on demand, see get_components
+        self._components: Optional[Dict[int, Component]] = components or None
         self._component_scores: Dict[int, Dict[str, float]] = {}
         self._scores: List[float] = None
 
-        if components:
-            self._components = components
-        else:
-            self._rebuild_components()
+        # relabeling-invariant plan fingerprint, see evolution.fingerprint
+        self._district_hashes: Dict[int, int] = district_hashes
+        self._fingerprint: int = plan_fingerprint
+
+        if district_hashes is None:
+            self._district_hashes = fingerprint.district_hashes(self._graph, self._assignment)
+        if plan_fingerprint is None:
+            self._fingerprint = fingerprint.fingerprint(self._district_hashes)
+
+        self._score(component_scores, scores)
+
+    def _score(self, component_scores: Optional[Dict[int, Dict[str, float]]] = None,
+               scores: Optional[List[float]] = None) -> None:
+        """
+        Fill in component scores and objective scores, reusing cached scores for plans we've seen before. Objective
+        scores computed elsewhere (e.g. in a batch) are only used along with their component scores.
+        """
+        cached = SCORE_CACHE.get(Chromosome.objectives, self._fingerprint)
+        if cached is not None:
+            self._component_scores = {
+                idx: cached.component_scores[district_hash] for idx, district_hash in self._district_hashes.items()
+            }
+            self._scores = list(cached.scores)
+            return
 
         if component_scores:
             self._component_scores = component_scores
         else:
+            self._component_scores = {}
             self._compute_component_scores()
 
-        self._compute_scores()
+        if component_scores and scores is not None:
+            self._scores = list(scores)
+        else:
+            self._compute_scores()
+        self.cache_scores()
+
+    def cache_scores(self) -> None:
+        """Remember this chromosome's scores in the process-wide score cache."""
+        SCORE_CACHE.put(Chromosome.objectives, self._fingerprint, CachedScores(
+            tuple(self._scores),
+            {self._district_hashes[idx]: scores for idx, scores in self._component_scores.items()}
+        ))
 
     def _rebuild_components(self) -> None:
         """
@@ -68,14 +109,14 @@ class Chromosome:
         self._components = components
 
     def _compute_component_scores(self):
-        components = self._components.items()
+        fragments = contiguity.fragment_counts(self._graph, self._assignment)
+        populations = get_table(self._graph).district_totals('pop', self._assignment)
 
         # for each component, compute all necessary scores
-        for idx, _component in components:
-            component_graph = nx.subgraph(self._graph, _component)
+        for idx in np.unique(self._assignment).tolist():
             component_score = {
-                'total_pop': sum(self._graph.nodes[node]['pop'] for node in _component),
-                'components': nx.number_connected_components(component_graph),
+                'total_pop': populations[idx].item(),
+                'components': int(fragments[idx]),
             }
 
             self._component_scores[idx] = component_score
@@ -84,13 +125,14 @@ class Chromosome:
         self._scores = [fn(self) for fn in Chromosome.objectives]
 
     def copy(self) -> 'Chromosome':
-        return Chromosome(self._graph, self._assignment[:])
+        return Chromosome(self._graph, self.get_assignment()[:], district_hashes=self._district_hashes,
+                          plan_fingerprint=self._fingerprint)
 
     def __eq__(self, other):
-        return self.get_assignment() == other.get_assignment()
+        return isinstance(other, Chromosome) and self._fingerprint == other._fingerprint
 
     def __hash__(self):
-        return tuple(self._assignment).__hash__()
+        return self._fingerprint
 
     def __repr__(self):
         return repr(self._assignment)
@@ -126,8 +168,8 @@ class Chromosome:
         ind = 1
 
         normalized_assignment = []
-        normalized_components: Dict[int, Component] = defaultdict(set)
         normalized_component_scores: Dict[int, Dict[str, float]] = {}
+        normalized_district_hashes: Dict[int, int] = {}
 
         changed = False
         for current_component in self._assignment:
@@ -144,19 +186,34 @@ class Chromosome:
         for current_component in self._assignment:
             normalized_component = mapping[current_component]
             normalized_assignment.append(normalized_component)
-            normalized_components[normalized_component] = self._components[current_component]
             normalized_component_scores[normalized_component] = self._component_scores[current_component]
+            normalized_district_hashes[normalized_component] = self._district_hashes[current_component]
 
-        self._assignment = normalized_assignment
-        self._components = normalized_components
+        if isinstance(self._assignment, np.ndarray):
+            # keep views pointing at their arena rows
+            self._assignment[:] = normalized_assignment
+        else:
+            self._assignment = normalized_assignment
+        self._components = None
         self._component_scores = normalized_component_scores
+        self._district_hashes = normalized_district_hashes
 
     def get_master_graph(self) -> Graph:
         return self._graph
 
     def get_assignment(self) -> List[int]:
+        if isinstance(self._assignment, np.ndarray):
+            return self._assignment.tolist()
         return self._assignment
 
+    def assignment_array(self) -> np.ndarray:
+        """The assignment as an array, without copying it if it already is one."""
+        return np.asarray(self._assignment)
+
+    def bind(self, assignment: np.ndarray) -> None:
+        """Point this chromosome at another copy of its assignment, e.g. after an arena moved its row."""
+        self._assignment = assignment
+
     def get_index(self, vertex: FatNode) -> int:
         """
         Get the index of a given vertex into the vertex set.
@@ -172,12 +229,14 @@ class Chromosome:
         :return:
         """
         vertex_index = self.get_index(vertex)
-        return self._assignment[vertex_index]
+        return int(self._assignment[vertex_index])
 
     def in_same_component(self, i: FatNode, j: FatNode) -> bool:
         return self.get_component(i) == self.get_component(j)
 
     def get_components(self) -> Dict[int, Component]:
+        if self._components is None:
+            self._rebuild_components()
         return self._components
 
     def get_component_scores(self) -> Dict[int, Dict[str, float]]:
@@ -186,6 +245,20 @@ class Chromosome:
     def get_scores(self) -> List[float]:
         return self._scores
 
+    def get_fingerprint(self) -> int:
+        return self._fingerprint
+
+    def neighbor_fingerprint(self, edge: Edge) -> int:
+        """Fingerprint of the chromosome connect_vertices(edge) would return, without building it."""
+        i, j = edge
+        j_index = self.get_index(j)
+        _, plan_fingerprint = fingerprint.move_vertex(
+            self._district_hashes, self._fingerprint, int(fingerprint.vertex_keys(self._graph)[j_index]),
+            self.get_component(j), self.get_component(i)
+        )
+
+        return plan_fingerprint
+
     def dominates(self, other: 'Chromosome'):
         """Returns true if we dominate another chromosome."""
         return dominates(self._scores, other._scores)
@@ -207,25 +280,27 @@ class Chromosome:
         i_cmp = self.get_component(i)
         j_cmp = self.get_component(j)
 
-        new_assignment = self._assignment[:]
+        new_assignment = self.get_assignment()[:]
         new_assignment[j_index] = i_cmp
 
-        components: DefaultDict[int, Set[Node]] = defaultdict(
-            set, {c: set(self._components[c]) for c in self._components}
-        )
-        components[j_cmp].remove(j)
-        components[i_cmp].add(j)
-
+        j_pop = get_table(self._graph).pop[j_index].item()
         component_scores = {c: {score: value for score, value in d.items()} for c, d in self._component_scores.items()}
-        component_scores[j_cmp]['total_pop'] -= self._graph.nodes[j].get('pop')
-        component_scores[i_cmp]['total_pop'] += self._graph.nodes[j].get('pop')
-        if components[j_cmp]:
-            component_scores[j_cmp]['components'] = number_connected_components(self._graph, components[j_cmp])
+        component_scores[j_cmp]['total_pop'] -= j_pop
+        component_scores[i_cmp]['total_pop'] += j_pop
+        # j can join pieces of i's district as well as split j's
+        component_scores[i_cmp]['components'] = contiguity.district_fragments(self._graph, new_assignment, i_cmp)
+        if j_cmp in new_assignment:
+            component_scores[j_cmp]['components'] = contiguity.district_fragments(self._graph, new_assignment, j_cmp)
         else:
-            components.pop(j_cmp)
             component_scores.pop(j_cmp)
 
-        return Chromosome(self._graph, new_assignment, components=components, component_scores=component_scores)
+        key = int(fingerprint.vertex_keys(self._graph)[j_index])
+        district_hashes, plan_fingerprint = fingerprint.move_vertex(
+            self._district_hashes, self._fingerprint, key, j_cmp, i_cmp
+        )
+
+        return Chromosome(self._graph, new_assignment, component_scores=component_scores,
+                          district_hashes=district_hashes, plan_fingerprint=plan_fingerprint)
 
     def get_hypotheticals(self) -> HypotheticalSet:
         """
@@ -240,15 +315,52 @@ class Chromosome:
 
         return hypotheticals
 
-    def crossover(self, other: 'Chromosome') -> List['Chromosome']:
-        split_point = randrange(len(self._assignment))
-
-        chromosome_a = self._assignment[:split_point] + other._assignment[split_point:]
-        chromosome_b = other._assignment[:split_point] + self._assignment[split_point:]
-
-        return [Chromosome(self._graph, chromosome_a), Chromosome(self._graph, chromosome_b)]
+    def crossover(self, other: 'Chromosome', mutation_probability: float = 0.0) -> List['Chromosome']:
+        """Single-point crossover. Children are mutated before they're built, so each one is only scored once."""
+        return [
+            Chromosome(self._graph, assignment)
+            for assignment in crossover_assignments(
+                self.get_assignment(), other.get_assignment(), mutation_probability
+            )
+        ]
 
     def mutate(self):
         element = randrange(len(self._assignment))
-        self._assignment[element] = randint(1, max(self._assignment))
-        self._rebuild_components()
+        old_component = self._assignment[element]
+        new_component = randint(1, max(self._assignment))
+
+        self._assignment[element] = new_component
+        self._district_hashes, self._fingerprint = fingerprint.move_vertex(
+            self._district_hashes, self._fingerprint, int(fingerprint.vertex_keys(self._graph)[element]),
+            old_component, new_component
+        )
+        self._components = None
+        self._score()
+
+
+def crossover_assignments(assignment_a: List[int], assignment_b: List[int],
+                          mutation_probability: float = 0.0) -> List[List[int]]:
+    """Single-point crossover of two assignments, with each child mutated with the given probability."""
+    split_point = randrange(len(assignment_a))
+
+    chromosome_a = assignment_a[:split_point] + assignment_b[split_point:]
+    chromosome_b = assignment_b[:split_point] + assignment_a[split_point:]
+
+    for assignment in (chromosome_a, chromosome_b):
+        if random() < mutation_probability:
+            assignment[randrange(len(assignment))] = randint(1, max(assignment))
+
+    return [chromosome_a, chromosome_b]
+
+
+def prepare_master_graph(graph: Graph) -> Graph:
+    """Freeze a master graph and build its vertex-indexed data up front, e.g. before forking worker processes."""
+    if not is_frozen(graph):
+        graph = freeze(graph)
+
+    vertex_order(graph)
+    fingerprint.vertex_keys(graph)
+    get_table(graph)
+    contiguity.adjacency(graph)
+
+    return graph
@@ -0,0 +1,131 @@
+"""Bulk contiguity checks.
+
+Rather than walking each district's subgraph in Python, keep only the edges of the master graph whose endpoints are
+in the same district and label the connected components of what's left in one compiled sparse-graph call. Every
+component is a fragment of exactly one district.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from networkx import Graph
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from elbridge.utilities.utils import vertex_order
+
+
+def adjacency(graph: Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the upper triangle of the master graph's CSR adjacency matrix as (row, column) index arrays, one entry
+    per edge. Built once per graph.
+    """
+    if 'adjacency' not in graph.graph:
+        order = vertex_order(graph)
+        edges = np.array([sorted((order[i], order[j])) for i, j in graph.edges()], dtype=np.int64).reshape(-1, 2)
+
+        matrix = csr_matrix(
+            (np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])), shape=(len(graph), len(graph))
+        )
+        matrix.sum_duplicates()
+        rows = np.repeat(np.arange(len(graph)), np.diff(matrix.indptr))
+        graph.graph['adjacency'] = (rows, matrix.indices.astype(np.int64))
+
+    return graph.graph['adjacency']
+
+
+def neighbor_lists(graph: Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The master graph's adjacency lists in CSR form, (indptr, indices): the neighbors of vertex v are
+    indices[indptr[v]:indptr[v + 1]]. Built once per graph.
+    """
+    if 'neighbor_lists' not in graph.graph:
+        rows, cols = adjacency(graph)
+        matrix = csr_matrix(
+            (np.ones(2 * len(rows), dtype=np.int8), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(len(graph), len(graph))
+        )
+        graph.graph['neighbor_lists'] = (matrix.indptr.astype(np.int64), matrix.indices.astype(np.int64))
+
+    return graph.graph['neighbor_lists']
+
+
+def fragment_labels(graph: Graph, assignments: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Label the district fragments of a batch of assignments (one assignment per row).
+    Returns the number of fragments and a fragment label for every (row, vertex), flattened row-major.
+    """
+    assignments = np.atleast_2d(assignments)
+    batch_size, vertex_count = assignments.shape
+    rows, cols = adjacency(graph)
+
+    # keep intra-district edges only; row b of the batch lives at vertex offset b * |V|
+    intra = assignments[:, rows] == assignments[:, cols]
+    offsets = (np.arange(batch_size) * vertex_count)[:, np.newaxis]
+    sources = (rows[np.newaxis, :] + offsets)[intra]
+    targets = (cols[np.newaxis, :] + offsets)[intra]
+
+    size = batch_size * vertex_count
+    masked = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(size, size))
+
+    return connected_components(masked, directed=False)
+
+
+def fragment_counts(graph: Graph, assignments: np.ndarray) -> np.ndarray:
+    """
+    Count the fragments of every district, i.e. the number of connected components it induces.
+    For a single assignment, returns counts indexed by district label; for a 2D batch, one such row per assignment.
+    """
+    assignments = np.asarray(assignments)
+    batch = np.atleast_2d(assignments)
+    labels = batch.ravel()
+    district_count = int(labels.max()) + 1 if labels.size else 1
+
+    _, fragments = fragment_labels(graph, batch)
+
+    # one representative vertex per fragment tells us its row and district
+    _, representatives = np.unique(fragments, return_index=True)
+    bins = (representatives // batch.shape[1]) * district_count + labels[representatives]
+    counts = np.bincount(bins, minlength=batch.shape[0] * district_count).reshape(batch.shape[0], district_count)
+
+    return counts if assignments.ndim > 1 else counts[0]
+
+
+def largest_fragments(graph: Graph, assignments: np.ndarray, fragments: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    A mask of the vertices in the largest fragment of their district (ties go to the lowest fragment label), in the
+    shape of the assignment or batch of assignments. fragments, if given, are the batch's fragment_labels.
+    """
+    assignments = np.asarray(assignments)
+    batch = np.atleast_2d(assignments)
+    labels = batch.ravel().astype(np.int64)
+    district_count = int(labels.max()) + 1 if labels.size else 1
+
+    if fragments is None:
+        _, fragments = fragment_labels(graph, batch)
+    sizes = np.bincount(fragments)
+    districts = (np.arange(labels.size) // batch.shape[1]) * district_count + labels
+
+    # sort by (row and) district, then fragment size; the last vertex of every district is in its largest fragment
+    ranked = np.lexsort((-fragments, sizes[fragments], districts))
+    last = np.append(districts[ranked][1:] != districts[ranked][:-1], True)
+    largest = np.zeros(batch.shape[0] * district_count, dtype=np.int64)
+    largest[districts[ranked][last]] = fragments[ranked][last]
+
+    return (fragments == largest[districts]).reshape(assignments.shape)
+
+
+def district_fragments(graph: Graph, assignment: np.ndarray, district: int) -> int:
+    """Count the fragments of a single district."""
+    assignment = np.asarray(assignment)
+    rows, cols = adjacency(graph)
+
+    members = assignment == district
+    intra = members[rows] & members[cols]
+    masked = coo_matrix(
+        (np.ones(intra.sum(), dtype=np.int8), (rows[intra], cols[intra])), shape=(len(assignment), len(assignment))
+    )
+
+    # every vertex outside the district is a component of its own
+    count, _ = connected_components(masked, directed=False)
+    return count - int(len(assignment) - members.sum())
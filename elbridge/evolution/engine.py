@@ -0,0 +1,209 @@
+"""Process-parallel generation engine.
+
+Worker processes are started once per run and receive the frozen master graph once, when they start (with the fork
+start method it's simply inherited, copy-on-write). For each generation, the parent process selects parent pairs
+and the workers do crossover, mutation, scoring and local search. Only compact assignment arrays and per-district
+scores travel between processes; with a shared PopulationArena, parents and children don't travel at all: workers
+read parents from the arena and write children into it.
+"""
+
+import multiprocessing
+import random
+import signal
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution import variation
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome, crossover_assignments, prepare_master_graph
+from elbridge.evolution.repair import REPAIRS, repair_fragments
+from elbridge.evolution.seeding import SeedTask, seeded_plan
+
+# (assignment, component scores) of a normalized child
+PackedChild = Tuple[np.ndarray, Dict[int, Dict[str, float]]]
+# (parent assignment or arena row, parent assignment or arena row, mutation probability, optimize?, seed,
+#  arena rows to write the children to, if any)
+BreedTask = Tuple[Union[np.ndarray, int], Union[np.ndarray, int], float, bool, int, Optional[Tuple[int, int]]]
+# (assignment, steps, sample size, seed, deadline)
+ImproveTask = Tuple[np.ndarray, int, int, int, Optional[float]]
+
+# worker process state, set once by _initialize
+_GRAPH: Optional[Graph] = None
+_ARENA = None
+_CROSSOVER = 'point'
+_REPAIR = False
+
+
+def compact(assignment: Sequence[int]) -> np.ndarray:
+    """Pack an assignment into the smallest integer array that holds it."""
+    assignment = np.asarray(assignment)
+    return assignment.astype(np.min_scalar_type(assignment.max()))
+
+
+def pack(chromosome: Chromosome) -> PackedChild:
+    return compact(chromosome.get_assignment()), chromosome.get_component_scores()
+
+
+def unpack(master_graph: Graph, child: PackedChild) -> Candidate:
+    assignment, component_scores = child
+    return Candidate(Chromosome(master_graph, assignment.tolist(), component_scores=component_scores))
+
+
+def process_context():
+    """Prefer fork, so workers inherit the master graph without pickling it."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+
+def _initialize(master_graph: Graph, objectives: list, arena=None, crossover: str = 'point',
+                repair: bool = False) -> None:
+    global _GRAPH, _ARENA, _CROSSOVER, _REPAIR  # pylint: disable=global-statement
+    _GRAPH, _ARENA, _CROSSOVER, _REPAIR = master_graph, arena, crossover, repair
+    Chromosome.objectives = objectives
+
+    # forked workers inherit the run's stop handlers (see evolution.budget); stopping is the parent's business. A
+    # Ctrl-C reaches the whole process group, so workers ignore SIGINT, but SIGTERM is how the pool terminates them
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _parent_assignment(parent: Union[np.ndarray, int]) -> List[int]:
+    if isinstance(parent, int):
+        return _ARENA.assignments[parent].tolist()
+    return parent.tolist()
+
+
+def breed(task: BreedTask) -> Tuple[List[PackedChild], List[int]]:
+    """
+    Produce, repair (if the engine repairs), score and optionally optimize the two children of a pair of parents.
+    Returns the children and the number of fragments repaired in each. Runs in a worker.
+    """
+    parent_a, parent_b, mutation_probability, optimize, seed, child_rows = task
+    # seeded by the parent process, so results don't depend on which worker picks up the task
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if _CROSSOVER == 'graph':
+        pair = [np.array([_parent_assignment(parent)]) for parent in (parent_a, parent_b)]
+        assignments = variation.mutate(variation.graph_crossover(_GRAPH, *pair), mutation_probability).tolist()
+    else:
+        assignments = crossover_assignments(_parent_assignment(parent_a), _parent_assignment(parent_b),
+                                            mutation_probability)
+
+    repaired = [0, 0]
+    if _REPAIR:
+        assignments, repaired = repair_fragments(_GRAPH, assignments)
+        assignments, repaired = assignments.tolist(), repaired.tolist()
+
+    children = []
+    for idx, assignment in enumerate(assignments):
+        child = Chromosome(_GRAPH, assignment)
+        if optimize:
+            child = Candidate(child).optimize(multiprocess=False).chromosome
+        child.normalize()
+
+        if child_rows is None:
+            children.append(pack(child))
+        else:
+            _ARENA.assignments[child_rows[idx]] = child.get_assignment()
+            children.append((child_rows[idx], child.get_component_scores()))
+
+    return children, repaired
+
+
+def improve(task: ImproveTask) -> PackedChild:
+    """Hill-climb a child. Runs in a worker."""
+    assignment, steps, sample_size, seed, deadline = task
+    random.seed(seed)
+    np.random.seed(seed)
+
+    child = Candidate(Chromosome(_GRAPH, assignment.tolist()))
+    return pack(child.optimize(multiprocess=False, steps=steps, sample_size=sample_size, deadline=deadline).chromosome)
+
+
+def seed_plan(task: SeedTask) -> np.ndarray:
+    """Make an initial plan with a seeding strategy. Runs in a worker."""
+    return compact(seeded_plan(_GRAPH, task))
+
+
+class ProcessEngine:
+    """Runs the variation, scoring and local search of a generation's children in a pool of worker processes."""
+
+    def __init__(self, master_graph: Graph, objectives: list, processes: Optional[int] = None, arena=None,
+                 crossover: str = 'point', repair: bool = False):
+        self.master_graph = master_graph
+        self.objectives = objectives
+        self.crossover = crossover
+        self.repair = repair
+        self.processes = processes or multiprocessing.cpu_count()
+        # only a shared arena is any use to the workers
+        self.arena = arena if arena is not None and arena.shared else None
+        self._pool = None
+
+    def __enter__(self):
+        self.master_graph = prepare_master_graph(self.master_graph)
+        self._pool = process_context().Pool(
+            self.processes, initializer=_initialize,
+            initargs=(self.master_graph, self.objectives, self.arena, self.crossover, self.repair)
+        )
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        if etype is None:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+
+    def map(self, fn, tasks: list) -> list:
+        """Run fn over tasks in the workers, preserving task order."""
+        chunksize = max(1, len(tasks) // (4 * self.processes))
+        return self._pool.map(fn, tasks, chunksize=chunksize)
+
+    def submit(self, fn, task, callback, error_callback=None) -> None:
+        """Run fn on a task in a worker, without waiting for it; callback gets its result."""
+        self._pool.apply_async(fn, (task,), callback=callback, error_callback=error_callback)
+
+    def make_children(self, pairs: List[Tuple[Candidate, Candidate]], mutation_probability: float,
+                      optimize: bool = False) -> List[Candidate]:
+        """
+        Breed every pair of parents in parallel. Returns two children per pair, in order. With a shared arena,
+        parents in the arena are passed by row, and children are written to the arena's child rows. If the engine
+        repairs children, REPAIRS counts the repairs.
+        """
+        tasks = []
+        for idx, (parent_a, parent_b) in enumerate(pairs):
+            if self.arena is not None and parent_a.row is not None and parent_b.row is not None:
+                rows = self.arena.pop_size + 2 * idx
+                tasks.append((parent_a.row, parent_b.row, mutation_probability, optimize, random.getrandbits(32),
+                              (rows, rows + 1)))
+            else:
+                tasks.append((compact(parent_a.chromosome.get_assignment()),
+                              compact(parent_b.chromosome.get_assignment()),
+                              mutation_probability, optimize, random.getrandbits(32), None))
+
+        children = []
+        results = self.map(breed, tasks)
+        if self.repair:
+            REPAIRS.record([count for _, repaired in results for count in repaired])
+
+        for child in (child for batch, _ in results for child in batch):
+            if isinstance(child[0], int):
+                children.append(self.arena.candidate(self.master_graph, *child))
+            else:
+                children.append(unpack(self.master_graph, child))
+
+        return children
+
+    def optimize_children(self, children: List[Candidate], steps: int, sample_size: int,
+                          deadline: Optional[float] = None) -> List[Candidate]:
+        """Hill-climb children in parallel, in order, taking no step after the deadline (if any)."""
+        tasks = [
+            (compact(child.chromosome.get_assignment()), steps, sample_size, random.getrandbits(32), deadline)
+            for child in children
+        ]
+
+        return [unpack(self.master_graph, child) for child in self.map(improve, tasks)]
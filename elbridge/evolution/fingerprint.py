@@ -0,0 +1,76 @@
+"""Plan fingerprints.
+
+Every vertex gets a random 64-bit key. A district is hashed by XOR-ing the keys of its vertices, and a plan is
+fingerprinted by XOR-ing a mixed version of each district hash. Since the district labels never enter the
+computation, two plans that only differ by a relabeling (see Chromosome.normalize) share a fingerprint.
+
+Moving a vertex between districts only touches two district hashes, so fingerprints can be maintained in O(1).
+"""
+
+import os
+from functools import reduce
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from networkx import Graph
+
+MASK = (1 << 64) - 1
+
+
+def vertex_keys(graph: Graph) -> np.ndarray:
+    """Return the per-vertex keys of a master graph, in vertex index order. Generated once per graph."""
+    keys = graph.graph.get('vertex_keys')
+    if keys is None or len(keys) != len(graph):
+        keys = np.frombuffer(os.urandom(8 * len(graph)), dtype=np.uint64)
+        graph.graph['vertex_keys'] = keys
+
+    return keys
+
+
+def mix(value: int) -> int:
+    """splitmix64 finalizer. Maps 0 to 0, so empty districts drop out of the fingerprint."""
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & MASK
+    return value ^ (value >> 31)
+
+
+def district_hashes(graph: Graph, assignment: Sequence[int]) -> Dict[int, int]:
+    """Hash every district of an assignment in one vectorized pass."""
+    labels = np.asarray(assignment)
+    if not labels.size:
+        return {}
+
+    order = np.argsort(labels, kind='mergesort')
+    sorted_labels = labels[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_labels[1:] != sorted_labels[:-1])))
+    hashes = np.bitwise_xor.reduceat(vertex_keys(graph)[order], starts)
+
+    return dict(zip(sorted_labels[starts].tolist(), hashes.tolist()))
+
+
+def fingerprint(hashes: Dict[int, int]) -> int:
+    """Combine district hashes into a plan fingerprint."""
+    return reduce(lambda acc, value: acc ^ mix(value), hashes.values(), 0)
+
+
+def move_vertex(hashes: Dict[int, int], plan_fingerprint: int, key: int,
+                source: int, target: int) -> Tuple[Dict[int, int], int]:
+    """
+    Move a vertex with the given key from district source to district target.
+    Returns new district hashes and the new fingerprint; the inputs are not modified.
+    """
+    if source == target:
+        return hashes, plan_fingerprint
+
+    new_hashes = dict(hashes)
+    old_source, old_target = new_hashes.get(source, 0), new_hashes.get(target, 0)
+    new_source, new_target = old_source ^ key, old_target ^ key
+
+    if new_source:
+        new_hashes[source] = new_source
+    else:
+        new_hashes.pop(source, None)
+    new_hashes[target] = new_target
+
+    plan_fingerprint ^= mix(old_source) ^ mix(new_source) ^ mix(old_target) ^ mix(new_target)
+    return new_hashes, plan_fingerprint
@@ -1,16 +1,34 @@
 """Genetic algorithm stuff."""
 
 import functools
+import os
 import random
+import time
+from contextlib import ExitStack
 from multiprocessing.pool import ThreadPool as TPool
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 
 import networkx as nx
+import numpy as np
 from tqdm import tqdm
 
+from elbridge.evolution import contiguity, reference, sketch, sorting, variation
+from elbridge.evolution.archive import ParetoArchive, read_archive, write_plans, write_vertices
+from elbridge.evolution.arena import PopulationArena
+from elbridge.evolution.budget import Budget, stop_on_signals
+from elbridge.evolution.cache import DEFAULT_MAX_BYTES, SCORE_CACHE
 from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.checkpoint import Checkpoint, capture, load_checkpoint, restore, save_checkpoint
 from elbridge.evolution.chromosome import Chromosome
-from elbridge.evolution.objectives import ObjectiveFunction
+from elbridge.evolution.engine import ProcessEngine, process_context, seed_plan
+from elbridge.evolution.hypervolume import converged, hypervolume
+from elbridge.evolution.memetic import MemeticPlan, MemeticScheduler, promising
+from elbridge.evolution.metrics import MetricsLog, generation_record
+from elbridge.evolution.objectives import ObjectiveFunction, score_batch
+from elbridge.evolution.repair import REPAIRS, repair_fragments
+from elbridge.evolution.seeding import SEEDINGS, STRATEGIES, seeded_plan, warm_plans
+from elbridge.readers.plans import read_plans
+from elbridge.utilities.xceptions import UnknownOptionException
 
 # use this to mute tqdm
 # tqdm = lambda x, *y, **z: x
@@ -18,60 +36,40 @@ from elbridge.evolution.objectives import ObjectiveFunction
 Population = List[Candidate]
 Frontier = List[Candidate]
 
+# survival selection: NSGA-II's crowding distance, or NSGA-III's reference directions
+SELECTIONS = ('crowding', 'reference')
+
+
+def score_matrix(population: Population) -> np.ndarray:
+    """Stack the scores of a population into an N x M matrix."""
+    return np.array([p.chromosome.get_scores() for p in population], dtype=float).reshape(len(population), -1)
+
 
 def fast_non_dominated_sort(population: Population) -> List[Frontier]:
     """Take a population P and sort it into fronts F1, F2, ..., Fn."""
-    fronts: List[Frontier] = [[]]
-
     for p in population:
         p.refresh()
 
-    for p in population:
-        for i, q in enumerate(population):
-            if p == q:
-                continue
-
-            if p.dominates(q):
-                p.dominated_set.add(i)
-            elif q.dominates(p):
-                p.domination_count += 1
-
-        if p.domination_count == 0:
-            p.rank = 1
-            fronts[0].append(p)
-
-    i = 0
-    while fronts[i]:
-        next_front = []
-        for p in fronts[i]:
-            for idx in p.dominated_set:
-                q = population[idx]
-                q.domination_count -= 1
-                if q.domination_count == 0:
-                    q.rank = i + 1
-                    next_front.append(q)
+    ranks = sorting.non_dominated_ranks(score_matrix(population))
+    fronts: List[Frontier] = []
+    for rank, front in enumerate(sorting.fronts_from_ranks(ranks), start=1):
+        fronts.append([population[idx] for idx in front])
+        for p in fronts[-1]:
+            p.rank = rank
 
-        i += 1
-        fronts.append(next_front)
-
-    # return everything but the last element, which is always empty
-    return fronts[:-1]
+    return fronts
 
 
 def crowding_distance_assignment(frontier: Frontier):
     """Take a Pareto frontier and calculate distances between candidates."""
-    for idx, obj_fn in enumerate(Chromosome.objectives):
-        # sort by each objective function
-        frontier.sort(key=lambda p, index=idx: p.chromosome.get_scores()[index])
-
-        # the boundary points for each objective should always be preserved
-        frontier[0].distance = float('inf')
-        frontier[-1].distance = float('inf')
+    distances = sorting.crowding_distances(
+        score_matrix(frontier),
+        [obj_fn.min_value for obj_fn in Chromosome.objectives],
+        [obj_fn.max_value for obj_fn in Chromosome.objectives]
+    )
 
-        objective_range = obj_fn.max_value - obj_fn.min_value
-        for i, elem in enumerate(frontier[1:-1]):
-            score_range = abs((frontier[i+1].chromosome.get_scores()[idx] - frontier[i-1].chromosome.get_scores()[idx]))
-            elem.distance += score_range / objective_range
+    for elem, distance in zip(frontier, distances.tolist()):
+        elem.distance = distance
 
 
 def crowding_operator(p: Candidate, q: Candidate) -> int:
@@ -79,7 +77,8 @@ def crowding_operator(p: Candidate, q: Candidate) -> int:
     if (p.rank < q.rank) or ((p.rank == q.rank) and (p.distance > q.distance)):
         return -1
     elif (p.rank == q.rank) and (p.distance == q.distance):
-        return 0
+        # ties go to the plan less like the rest of the population; novelty is only set with diversity on
+        return (q.novelty > p.novelty) - (p.novelty > q.novelty)
     return 1
 
 
@@ -87,19 +86,105 @@ def select_parent(population: Population, k: int = 3) -> Candidate:
     return min(random.sample(population, k), key=functools.cmp_to_key(crowding_operator))
 
 
-def make_children(parents: Population, mutation_probability: float) -> Population:
-    """Take a parent population and return an equally-sized child population."""
-    children = []  # type: Population
-    for _ in range(len(parents) // 2):
-        parent_a, parent_b = (select_parent(parents), select_parent(parents))
-        offspring = parent_a.crossover_and_mutate(parent_b, mutation_probability)
-        children += offspring
+def select_pairs(parents: Population) -> List[Tuple[Candidate, Candidate]]:
+    """Select enough pairs of parents to produce an equally-sized child population."""
+    winners = variation.tournament(
+        [p.rank for p in parents], [p.distance for p in parents], 2 * (len(parents) // 2)
+    ).tolist()
+    return [(parents[a], parents[b]) for a, b in zip(winners[0::2], winners[1::2])]
 
-    return children
 
+def make_children(parents: Population, mutation_probability: float, arena: Optional[PopulationArena] = None,
+                  crossover: str = 'point', repair: bool = False) -> Population:
+    """
+    Take a parent population and return an equally-sized child population. Tournaments, crossover (one of
+    variation.CROSSOVERS), mutation, fragment repair (with repair set; counted in REPAIRS) and the children's
+    district scores are each done for the whole generation at once. With an arena holding the parents, children are
+    built in its child rows.
+    """
+    master_graph = parents[0].chromosome.get_master_graph()
+    if arena is not None and [p.row for p in parents] == list(range(len(parents))):
+        assignments = arena.parents()
+    else:
+        assignments = np.array([p.chromosome.assignment_array() for p in parents])
+        arena = None
+
+    winners = variation.tournament(
+        [p.rank for p in parents], [p.distance for p in parents], 2 * (len(parents) // 2)
+    )
+    if crossover == 'graph':
+        children = variation.graph_crossover(master_graph, assignments[winners[0::2]], assignments[winners[1::2]])
+    else:
+        children = variation.crossover(assignments[winners[0::2]], assignments[winners[1::2]])
+    children = variation.mutate(children, mutation_probability)
+    if repair:
+        children, repaired = repair_fragments(master_graph, children)
+        REPAIRS.record(repaired)
+    children = variation.normalize(children)
+
+    if arena is None:
+        return build_population(master_graph, children)
 
-def optimize_children(raw_children: Population, multiprocess: bool = True) -> Population:
-    _optimize = lambda idx_child: idx_child[1].optimize(pos=idx_child[0])
+    arena.children()[:len(children)] = children
+    return build_population(master_graph, arena.children()[:len(children)], first_row=arena.pop_size)
+
+
+def build_population(master_graph: nx.Graph, assignments: np.ndarray, first_row: Optional[int] = None) -> Population:
+    """
+    Build candidates from the rows of a 2D assignment array, scoring them all in one batch when every objective
+    can. With a first_row, the assignments are arena rows starting there, and the candidates are views of them.
+    """
+    fragments = contiguity.fragment_counts(master_graph, assignments)
+    component_scores = variation.component_scores(master_graph, assignments, fragments)
+    scores = score_batch(Chromosome.objectives, assignments, fragments)
+
+    population = []
+    for idx, assignment in enumerate(assignments):
+        candidate = Candidate(Chromosome(
+            master_graph, assignment, component_scores=component_scores[idx],
+            scores=None if scores is None else scores[idx].tolist()
+        ))
+        if first_row is not None:
+            candidate.row = first_row + idx
+        population.append(candidate)
+
+    return population
+
+
+def generate_population(master_graph: nx.Graph, pop_size: int, seeding: str = 'random',
+                        engine: Optional[ProcessEngine] = None, plans: Optional[np.ndarray] = None,
+                        warm_fraction: float = 0.5) -> Population:
+    """
+    Initial plans, normalized and scored as one batch. 'random' plans are drawn as Chromosome.generate draws them;
+    other seedings (see evolution.seeding) make contiguous, balanced plans, on the engine if there is one. Every
+    seeded plan gets its own random seed, so the plans don't depend on the engine. With plans (assignment rows, see
+    readers.plans), warm_fraction of the population is those plans and perturbed copies of them.
+    """
+    warm = np.zeros((0, len(master_graph)), dtype=np.int64)
+    if plans is not None and len(plans):
+        warm = warm_plans(master_graph, plans, min(pop_size, int(round(warm_fraction * pop_size))))
+    pop_size -= len(warm)
+
+    if seeding == 'random':
+        districts = master_graph.graph['districts']
+        assignments = [[random.randint(1, districts) for _ in master_graph] for _ in range(pop_size)]
+    else:
+        strategies = STRATEGIES if seeding == 'mixed' else (seeding,)
+        tasks = [(strategies[idx % len(strategies)], random.getrandbits(32)) for idx in range(pop_size)]
+        if engine is not None:
+            assignments = engine.map(seed_plan, tasks)
+        else:
+            assignments = [seeded_plan(master_graph, task) for task in tasks]
+
+    assignments = np.concatenate([warm, np.array(assignments, dtype=np.int64).reshape(pop_size, len(master_graph))])
+    return build_population(master_graph, variation.normalize(assignments))
+
+
+def optimize_children(raw_children: Population, multiprocess: bool = True, steps: int = 20,
+                      sample_size: int = 50, deadline: Optional[float] = None) -> Population:
+    _optimize = lambda idx_child: idx_child[1].optimize(
+        pos=idx_child[0], multiprocess=multiprocess, steps=steps, sample_size=sample_size, deadline=deadline
+    )
 
     if multiprocess:
         with TPool() as p:
@@ -114,60 +199,388 @@ def optimize_children(raw_children: Population, multiprocess: bool = True) -> Po
     return children
 
 
-def evaluate_generation(parents: Population, children: Population) -> Tuple[Population, Frontier]:
+def sketch_population(population: Population) -> np.ndarray:
+    """Stack the sketches of a population into an N x SKETCH_SIZE matrix, sketching the unsketched in one batch."""
+    missing = [p for p in population if p.sketch is None]
+    if missing:
+        master_graph = missing[0].chromosome.get_master_graph()
+        sketched = sketch.sketches(master_graph, [p.chromosome.assignment_array() for p in missing])
+        for candidate, row in zip(missing, sketched):
+            candidate.sketch = row
+
+    return np.array([p.sketch for p in population], dtype=np.uint32).reshape(len(population), -1)
+
+
+def reference_survivors(population: Population, count: int, directions: np.ndarray) -> Population:
+    """
+    Pick survivors of a sorted population by reference directions (see evolution.reference). A survivor's distance
+    is the negated number of survivors sharing its direction, so tournaments favor members of sparse niches.
+    """
+    survivors, niche_counts = reference.select(
+        score_matrix(population), [p.rank for p in population], count, directions
+    )
+
+    next_parents = [population[idx] for idx in survivors.tolist()]
+    for candidate, niche_count in zip(next_parents, niche_counts.tolist()):
+        candidate.distance = float(-niche_count)
+
+    return next_parents
+
+
+def evaluate_generation(parents: Population, children: Population, arena: Optional[PopulationArena] = None,
+                        directions: Optional[np.ndarray] = None,
+                        diversity: bool = False) -> Tuple[Population, Frontier]:
+    """
+    Select the next generation's parents from parents and children; with an arena, move them to its parent rows.
+    Survivors are picked by crowding distance, or with reference directions, by reference_survivors. With diversity
+    set, ties between candidates are broken in favor of plans with fewer near-duplicates (see evolution.sketch).
+    """
     combined_population: Population = parents + children
     frontiers: List[Frontier] = fast_non_dominated_sort(combined_population)
+    if diversity:
+        for candidate, value in zip(combined_population, sketch.novelty(sketch_population(combined_population))):
+            candidate.novelty = float(value)
 
-    next_parents: Population = []
-    remaining_slots = len(parents)
+    if directions is not None:
+        next_parents = reference_survivors(combined_population, len(parents), directions)
+    else:
+        next_parents: Population = []
+        remaining_slots = len(parents)
 
-    for frontier in frontiers:
-        crowding_distance_assignment(frontier)
-        next_parents += frontier
+        for frontier in frontiers:
+            crowding_distance_assignment(frontier)
+            next_parents += frontier
 
-        remaining_slots -= len(frontier)
-        if remaining_slots <= 0:
-            break
+            remaining_slots -= len(frontier)
+            if remaining_slots <= 0:
+                break
 
     next_parents.sort(key=functools.cmp_to_key(crowding_operator))
-    return next_parents[:len(parents)], frontiers[0]
+    next_parents = next_parents[:len(parents)]
+    if arena is not None:
+        # frontier members that didn't make the cut would see their rows overwritten; give them their own copies
+        survivors = set(map(id, next_parents))
+        for candidate in frontiers[0]:
+            if id(candidate) not in survivors and candidate.row is not None:
+                candidate.chromosome.bind(candidate.chromosome.assignment_array().copy())
+                candidate.row = None
 
+        arena.store(next_parents)
 
-@profile
-def run_nsga2(master_graph: nx.Graph, objective_fns: List[ObjectiveFunction],
-              max_generations: int = 500, pop_size: int = 300, multiprocess: bool = True,
-              optimize: bool = True, optimization_interval: int = 20,
-              mutation_probability: float = 0.7, mutation_degradation_rate: float = 0.9) -> Tuple[Frontier, dict]:
+    return next_parents, frontiers[0]
+
+
+def breed_children(parents: Population, mutation_probability: float, optimize: bool = False,
+                   engine: Optional[ProcessEngine] = None, arena: Optional[PopulationArena] = None,
+                   crossover: str = 'point', repair: bool = False) -> Population:
     """
-    Run NSGA-II on a graph.
+    Breed (and optionally optimize) a generation's children, on the engine if there is one. The engine uses the
+    crossover and repair setting it was started with.
     """
-    Chromosome.objectives = objective_fns
+    if engine is not None:
+        return engine.make_children(select_pairs(parents), mutation_probability, optimize=optimize)
 
-    parents = [Candidate(Chromosome.generate(master_graph)) for _ in range(pop_size)]
-    pareto_frontier: Frontier = None
-    data_output = {}
+    children = make_children(parents, mutation_probability, arena, crossover, repair)
+    if optimize:
+        children = optimize_children(children, multiprocess=False)
 
-    for gen in tqdm(range(1, max_generations + 1), desc="Evolving..."):
-        try:
-            raw_children = make_children(parents, mutation_probability)
+    return children
 
-            children = raw_children
-            if optimize and gen % optimization_interval == 0:
-                children = optimize_children(raw_children, multiprocess=multiprocess)
 
-            parents, pareto_frontier = evaluate_generation(parents, children)
+def optimize_promising(children: Population, plan: MemeticPlan, engine: Optional[ProcessEngine] = None,
+                       deadline: Optional[float] = None) -> Population:
+    """
+    Optimize the most promising fraction of children, as planned by a MemeticScheduler, taking no local search
+    step after the deadline (if any).
+    """
+    selected = promising(
+        score_matrix(children), plan.fraction,
+        [obj_fn.min_value for obj_fn in Chromosome.objectives], [obj_fn.max_value for obj_fn in Chromosome.objectives]
+    )
+
+    chosen = [children[idx] for idx in selected]
+    if engine is not None:
+        optimized = engine.optimize_children(chosen, plan.steps, plan.sample_size, deadline)
+    else:
+        optimized = optimize_children(
+            chosen, multiprocess=False, steps=plan.steps, sample_size=plan.sample_size, deadline=deadline
+        )
+
+    children = list(children)
+    for idx, child in zip(selected, optimized):
+        children[idx] = child
+
+    return children
 
-            print("pareto frontier {}/{} (score {})".format(
-                len(pareto_frontier), 2 * len(parents), pareto_frontier[0].chromosome.get_scores())
-            )
 
-            data_output[gen] = {
-                'pareto_frontier': pareto_frontier,
-                'unique_parents': len(set(parents))
-            }
+def next_generation(parents: Population, mutation_probability: float, optimize: bool = False,
+                    engine: Optional[ProcessEngine] = None) -> Tuple[Population, Frontier]:
+    """Breed children (on the engine, if there is one) and select the next generation's parents."""
+    return evaluate_generation(parents, breed_children(parents, mutation_probability, optimize, engine))
+
+
+class RunOptions(NamedTuple):
+    """Settings of an NSGA-II run."""
+    max_generations: int = 500
+    pop_size: int = 300
+    # breed, score and optimize children on a ProcessEngine with this many processes (default: one per core)
+    multiprocess: bool = True
+    processes: Optional[int] = None
+    # hill-climb children every optimization_interval generations, or as a MemeticScheduler decides (see memetic)
+    optimize: bool = True
+    optimization_interval: int = 20
+    adaptive_memetic: bool = False
+    mutation_probability: float = 0.7
+    mutation_degradation_rate: float = 0.9
+    score_cache_bytes: int = DEFAULT_MAX_BYTES
+    # one of SEEDINGS; warm_fraction of the population comes from warm_start plan files (see readers.plans)
+    seeding: str = 'random'
+    warm_start: Sequence[str] = ()
+    warm_fraction: float = 0.5
+    # one of variation.CROSSOVERS; repair mends children's stray district fragments (see evolution.repair)
+    crossover: str = 'point'
+    repair: bool = False
+    # one of SELECTIONS; diversity breaks ties in favor of plans with fewer near-duplicates (see evolution.sketch)
+    selection: str = 'crowding'
+    reference_divisions: Optional[int] = None
+    diversity: bool = False
+    # stop once the hypervolume has improved by less than convergence_epsilon over convergence_window generations,
+    # or before a generation that wouldn't finish within time_budget seconds (see evolution.budget)
+    convergence_window: Optional[int] = None
+    convergence_epsilon: float = 1e-6
+    time_budget: Optional[float] = None
+    # save the run every checkpoint_interval generations or checkpoint_seconds seconds, and when it stops
+    checkpoint_path: Optional[str] = None
+    checkpoint_interval: int = 10
+    checkpoint_seconds: Optional[float] = None
+    resume: bool = False
+    # log every generation to a MetricsLog, and every non-dominated plan seen to a ParetoArchive
+    metrics_path: Optional[str] = None
+    archive_path: Optional[str] = None
+    archive_size: Optional[int] = None
+
+
+def _start(master_graph: nx.Graph, options: RunOptions) -> Tuple[Optional[Population], Optional[Checkpoint]]:
+    """The parents a run resumes with and the checkpoint they come from, if it resumes from one."""
+    if options.resume and options.checkpoint_path and os.path.exists(options.checkpoint_path):
+        checkpoint = load_checkpoint(options.checkpoint_path)
+        print("resuming from generation {} ({})".format(checkpoint.generation, options.checkpoint_path))
+        return restore(master_graph, checkpoint), checkpoint
+
+    # seeded once the engine is up, so that seeding runs in its workers
+    return None, None
+
+
+def _archive(options: RunOptions, objective_count: int, resumed: bool) -> Optional[ParetoArchive]:
+    """The run's ParetoArchive, if it keeps one. A resumed run's is rebuilt from its file."""
+    if not options.archive_path:
+        return None
+    if resumed and os.path.exists(options.archive_path):
+        return read_archive(options.archive_path, objective_count, max_size=options.archive_size)
+
+    return ParetoArchive(objective_count, max_size=options.archive_size)
+
+
+def _generation_stats(parents: Population, frontier: Frontier, frontier_hypervolume: float,
+                      archive: Optional[ParetoArchive], options: RunOptions) -> dict:
+    """A generation's statistics, printed as they're gathered."""
+    cache_stats = SCORE_CACHE.stats(reset=True)
+    print("pareto frontier {}/{} (score {}, hypervolume {:.6f}, cache {} hits/{} misses)".format(
+        len(frontier), 2 * len(parents), frontier[0].chromosome.get_scores(), frontier_hypervolume,
+        cache_stats['hits'], cache_stats['misses']
+    ))
+
+    stats = {
+        'unique_parents': len(set(parents)),
+        'score_cache': cache_stats,
+        'hypervolume': frontier_hypervolume,
+    }
+    if archive is not None:
+        stats['archive_size'] = len(archive)
+    if options.repair:
+        stats['repair'] = REPAIRS.stats(reset=True)
+    if options.diversity:
+        stats['near_duplicates'] = len(sketch.near_duplicates(sketch_population(parents)))
+
+    return stats
+
+
+def _stop_reason(generation: int, hypervolumes: List[float], budget: Budget, generation_seconds: float,
+                 options: RunOptions) -> Optional[str]:
+    """Why a run should stop after a generation (that took generation_seconds), if it should."""
+    if options.convergence_window and converged(hypervolumes, options.convergence_window, options.convergence_epsilon):
+        return 'converged'
+
+    return budget.should_stop(generation_seconds) or (
+        'max_generations' if generation >= options.max_generations else None
+    )
+
+
+def _checkpoint_due(generation: int, last_checkpoint: float, stop_reason: Optional[str], options: RunOptions) -> bool:
+    """Whether a run should save a checkpoint after a generation: every run saves one when it stops."""
+    if not options.checkpoint_path:
+        return False
+
+    return stop_reason is not None or generation % options.checkpoint_interval == 0 or (
+        options.checkpoint_seconds is not None and time.time() - last_checkpoint >= options.checkpoint_seconds
+    )
 
-            mutation_probability *= mutation_degradation_rate
-        except KeyboardInterrupt:
-            break
+
+@profile
+def run_nsga2(master_graph: nx.Graph, objective_fns: List[ObjectiveFunction], options: Optional[RunOptions] = None,
+              **overrides) -> Tuple[Frontier, dict]:
+    """
+    Run NSGA-II on a graph. Keyword arguments override fields of options (RunOptions). The generation a run stops
+    at records why: 'converged', 'time_budget', 'interrupted', 'terminated' or 'max_generations'.
+    """
+    options = (options or RunOptions())._replace(**overrides)
+    if options.selection not in SELECTIONS:
+        raise UnknownOptionException('selection', options.selection, SELECTIONS)
+    if options.seeding not in SEEDINGS:
+        raise UnknownOptionException('seeding', options.seeding, SEEDINGS)
+    if options.crossover not in variation.CROSSOVERS:
+        raise UnknownOptionException('crossover', options.crossover, variation.CROSSOVERS)
+
+    Chromosome.objectives = objective_fns
+    SCORE_CACHE.resize(options.score_cache_bytes)
+    SCORE_CACHE.clear()
+    REPAIRS.stats(reset=True)
+
+    parents, checkpoint = _start(master_graph, options)
+    first_generation = checkpoint.generation + 1 if checkpoint else 1
+    mutation_probability = checkpoint.mutation_probability if checkpoint else options.mutation_probability
+    pareto_frontier: Frontier = [p for p in parents if p.rank == 1] if parents else None
+    # a resumed run ignores warm start plans
+    plans = read_plans(master_graph, options.warm_start) if parents is None and options.warm_start else None
+
+    shared = options.multiprocess and process_context().get_start_method() == 'fork'
+    pop_size = len(parents) if parents else options.pop_size
+    arena = PopulationArena(len(master_graph), pop_size, len(objective_fns), shared=shared)
+
+    data_output = {}
+    last_checkpoint = time.time()
+
+    min_values = [fn.min_value for fn in objective_fns]
+    max_values = [fn.max_value for fn in objective_fns]
+    hypervolumes = checkpoint.hypervolumes.tolist() if checkpoint else []
+    stop_reason = None
+    scheduler = None
+    if options.optimize and options.adaptive_memetic:
+        scheduler = MemeticScheduler(interval=options.optimization_interval)
+        if checkpoint and checkpoint.scheduler_state:
+            scheduler.set_state(checkpoint.scheduler_state)
+
+    directions = None
+    if options.selection == 'reference':
+        divisions = options.reference_divisions or reference.default_divisions(len(objective_fns), arena.pop_size)
+        directions = reference.reference_directions(len(objective_fns), divisions)
+
+    archive = _archive(options, len(objective_fns), resumed=first_generation > 1)
+    budget = Budget(options.time_budget)
+    with ExitStack() as stack:
+        # before the engine starts, so that forked workers don't die of a SIGINT meant for the run
+        stack.enter_context(stop_on_signals(budget))
+        engine = None
+        if options.multiprocess:
+            engine = stack.enter_context(
+                ProcessEngine(
+                    master_graph, objective_fns, processes=options.processes, arena=arena,
+                    crossover=options.crossover, repair=options.repair
+                )
+            )
+        if parents is None:
+            with budget.phase('seeding'):
+                parents = generate_population(
+                    master_graph, options.pop_size, options.seeding, engine, plans, options.warm_fraction
+                )
+        arena.store(parents)
+
+        log = stack.enter_context(MetricsLog(options.metrics_path)) if options.metrics_path else None
+        archive_log = stack.enter_context(MetricsLog(options.archive_path)) if options.archive_path else None
+        if archive is not None and first_generation == 1:
+            write_vertices(archive_log, master_graph)
+            write_plans(archive_log, 0, archive.update(parents))
+
+        for gen in tqdm(range(first_generation, options.max_generations + 1), desc="Evolving..."):
+            try:
+                started = time.time()
+                plan, search_seconds = scheduler.plan(gen) if scheduler else None, 0.0
+                optimize_now = scheduler is None and options.optimize and gen % options.optimization_interval == 0
+                if optimize_now and budget.deadline is not None:
+                    # hill-climb after breeding instead, where local search can be scaled to the remaining time
+                    search_plan, optimize_now = MemeticPlan(1.0, 20, 50), False
+                else:
+                    search_plan = plan
+
+                with budget.phase('breeding'):
+                    children = breed_children(
+                        parents, mutation_probability, optimize_now, engine, arena, options.crossover, options.repair
+                    )
+                if search_plan is not None:
+                    searched = int(np.ceil(search_plan.fraction * len(children)))
+                    search_plan = search_plan._replace(steps=budget.steps(search_plan.steps, searched))
+                    search_started = time.time()
+                    with budget.phase('search'):
+                        children = optimize_promising(children, search_plan, engine, budget.deadline)
+                    search_seconds = time.time() - search_started
+                    budget.record_search(search_seconds, search_plan.steps, searched)
+
+                with budget.phase('selection'):
+                    if archive is not None:
+                        # before selection, which may overwrite the arena rows of children that don't survive
+                        write_plans(archive_log, gen, archive.update(children))
+
+                    parents, pareto_frontier = evaluate_generation(
+                        parents, children, arena, directions, options.diversity
+                    )
+                seconds = time.time() - started
+
+                scores = score_matrix(pareto_frontier)
+                hypervolumes.append(hypervolume(scores, min_values, max_values))
+                stats = _generation_stats(parents, pareto_frontier, hypervolumes[-1], archive, options)
+                if scheduler is not None and len(hypervolumes) > 1:
+                    decision = scheduler.record(plan, hypervolumes[-1] - hypervolumes[-2], seconds, search_seconds)
+                    stats['memetic'] = decision
+                    if plan is not None:
+                        print("local search {} (search {:.3g}/s, evolution {:.3g}/s): {}, next in {}".format(
+                            plan, decision['search_rate'], decision['evolution_rate'] or 0.0, decision['decision'],
+                            decision['next_interval']
+                        ))
+                record = generation_record(
+                    scores, [p.rank for p in parents], stats['unique_parents'], seconds, mutation_probability
+                )
+
+                mutation_probability *= options.mutation_degradation_rate
+
+                # stop before a generation that wouldn't finish in time; only local search can be cut short
+                stop_reason = _stop_reason(gen, hypervolumes, budget, seconds - search_seconds, options)
+                if _checkpoint_due(gen, last_checkpoint, stop_reason, options):
+                    save_checkpoint(options.checkpoint_path, capture(
+                        parents, gen, mutation_probability, hypervolumes, scheduler.get_state() if scheduler else None
+                    ))
+                    last_checkpoint = time.time()
+                budget.phases['bookkeeping'] += time.time() - started - seconds
+
+                if options.time_budget is not None or stop_reason is not None:
+                    stats['budget'] = budget.stats()
+                if stop_reason is not None:
+                    stats['stop_reason'] = stop_reason
+                data_output[gen] = stats
+                if log is not None:
+                    record.update(stats)
+                    log.write(gen, **record)
+
+                if stop_reason is not None:
+                    break
+            except KeyboardInterrupt:
+                stop_reason = 'interrupted'
+                break
+
+        if data_output:
+            stop_generation = max(data_output)
+            # a second signal stops the run mid-generation, so its log ends without a stop_reason
+            data_output[stop_generation].setdefault('stop_reason', stop_reason)
+            data_output[stop_generation].setdefault('budget', budget.stats())
+            print("stopped at generation {} ({})".format(stop_generation, data_output[stop_generation]['stop_reason']))
 
     return pareto_frontier, data_output
@@ -0,0 +1,72 @@
+"""Hypervolume of Pareto frontiers.
+
+The hypervolume of a frontier is the volume of objective space it dominates, measured from a reference point. Scores
+are normalized by their objective's [min_value, max_value] range first, so every objective weighs the same and the
+reference point is the origin; scores outside the range are clipped to it. Higher scores are better.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from elbridge.evolution.sorting import non_dominated_ranks
+
+
+def normalize(scores: np.ndarray, min_values: Sequence[float], max_values: Sequence[float]) -> np.ndarray:
+    low = np.asarray(min_values, dtype=float)
+    span = np.asarray(max_values, dtype=float) - low
+    span = np.where(span > 0, span, 1)
+    return np.clip((np.asarray(scores, dtype=float) - low) / span, 0, 1)
+
+
+def _area(points: np.ndarray) -> float:
+    """Exact 2D hypervolume: sweep by decreasing first objective, adding the strip each point adds on top."""
+    area = 0.0
+    height = 0.0
+    for x, y in points[np.lexsort((-points[:, 1], -points[:, 0]))]:
+        if y > height:
+            area += x * (y - height)
+            height = y
+
+    return area
+
+
+def _volume(points: np.ndarray) -> float:
+    """
+    Hypervolume by slicing objectives (HSO): sweep the last objective from the top down; between two consecutive
+    values, the dominated region is a slab whose cross-section is the hypervolume of the points above it in the
+    remaining objectives.
+    """
+    if points.shape[1] == 1:
+        return points.max()
+    if points.shape[1] == 2:
+        return _area(points)
+
+    points = points[np.argsort(-points[:, -1], kind='mergesort')]
+    levels = np.append(points[:, -1], 0)
+
+    volume = 0.0
+    for idx in range(len(points)):
+        depth = levels[idx] - levels[idx + 1]
+        if depth > 0:
+            above = points[:idx + 1, :-1]
+            volume += depth * _volume(above[non_dominated_ranks(above) == 0])
+
+    return volume
+
+
+def hypervolume(scores: np.ndarray, min_values: Sequence[float], max_values: Sequence[float]) -> float:
+    """Normalized hypervolume (between 0 and 1) of an N x M score matrix."""
+    points = normalize(scores, min_values, max_values)
+    if not len(points):
+        return 0.0
+
+    return float(_volume(points[non_dominated_ranks(points) == 0]))
+
+
+def converged(history: Sequence[float], window: int, epsilon: float) -> bool:
+    """
+    Whether the hypervolume improved by less than epsilon over the last window generations. A hypervolume of 0
+    (a frontier outside the objectives' ranges) never counts as converged.
+    """
+    return len(history) > window and history[-1] > 0 and history[-1] - history[-1 - window] < epsilon
@@ -0,0 +1,265 @@
+"""Island-model NSGA-II.
+
+K subpopulations evolve independently, each in its own process, and every few generations send their best Pareto
+members to their neighbors in a migration topology. Islands never wait on each other: migrants are merged into an
+island's population whenever they've arrived. At the end, the islands' frontiers are merged into one.
+"""
+
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import List, Optional, Tuple
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome, prepare_master_graph
+from elbridge.evolution.engine import PackedChild, pack, process_context, unpack
+from elbridge.evolution.genetics import (Frontier, crowding_distance_assignment, evaluate_generation,
+                                         fast_non_dominated_sort, next_generation)
+from elbridge.utilities.xceptions import IslandFailedException, UnknownOptionException
+
+TOPOLOGIES = ('ring', 'full')
+
+
+def neighbors(island: int, islands: int, topology: str) -> List[int]:
+    """Islands that island sends its migrants to."""
+    if topology == 'ring':
+        return [(island + 1) % islands] if islands > 1 else []
+    elif topology == 'full':
+        return [other for other in range(islands) if other != island]
+
+    raise UnknownOptionException('topology', topology, TOPOLOGIES)
+
+
+class QueueTransport:
+    """Migration over one multiprocessing queue per island. Islands have to share a host."""
+
+    def __init__(self, islands: int):
+        self._inboxes = [process_context().Queue() for _ in range(islands)]
+
+    def open(self, island: int) -> None:
+        # migrants are best-effort: don't block an island's exit on migrants nobody will read
+        for inbox in self._inboxes:
+            inbox.cancel_join_thread()
+
+    def send(self, island: int, migrants: List[PackedChild]) -> None:
+        self._inboxes[island].put(migrants)
+
+    def receive(self, island: int) -> List[List[PackedChild]]:
+        batches = []
+        while True:
+            try:
+                batches.append(self._inboxes[island].get_nowait())
+            except queue.Empty:
+                return batches
+
+    def close(self) -> None:
+        pass
+
+
+class SocketTransport:
+    """
+    Migration over sockets. Every island listens on its own (host, port) address, so islands can run on different
+    hosts; with localhost addresses (see SocketTransport.local) it stands in for a cluster on one machine.
+
+    Connections carry pickles, which can run code on the receiving host, so every island must share a secret
+    authkey, and connections that don't know it are refused.
+    """
+
+    def __init__(self, addresses: List[Tuple[str, int]], authkey: bytes, timeout: float = 10.0):
+        self.addresses = addresses
+        self.authkey = authkey
+        self.timeout = timeout
+
+        self._listener: Optional[Listener] = None
+        self._inbox: Optional[queue.Queue] = None
+        # islands we've reached before; if they refuse a connection now, they're done
+        self._reached = set()
+
+    @classmethod
+    def local(cls, islands: int, authkey: Optional[bytes] = None, **kwargs) -> 'SocketTransport':
+        """
+        Pick a free localhost port for every island. Without an authkey, a random one is generated; the islands get
+        it with the transport.
+        """
+        addresses = []
+        for _ in range(islands):
+            with socket.socket() as sock:
+                sock.bind(('localhost', 0))
+                addresses.append(sock.getsockname())
+
+        return cls(addresses, authkey or os.urandom(32), **kwargs)
+
+    def open(self, island: int) -> None:
+        self._inbox = queue.Queue()
+        self._listener = Listener(self.addresses[island], authkey=self.authkey)
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection = self._listener.accept()
+            except (AuthenticationError, EOFError):
+                # a wrong authkey, or a client that hung up mid-handshake
+                continue
+            except OSError:
+                # listener closed
+                return
+
+            with connection:
+                try:
+                    while True:
+                        self._inbox.put(connection.recv())
+                except EOFError:
+                    pass
+
+    def send(self, island: int, migrants: List[PackedChild]) -> None:
+        # the other island may not be listening yet; if it never shows up, its migrants are dropped
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                connection = Client(self.addresses[island], authkey=self.authkey)
+                self._reached.add(island)
+                break
+            except ConnectionRefusedError:
+                if island in self._reached or time.time() > deadline:
+                    return
+                time.sleep(0.05)
+            except (ConnectionError, EOFError):
+                # the other island closed its listener mid-handshake: it's done
+                return
+
+        with connection:
+            try:
+                connection.send(migrants)
+            except ConnectionError:
+                pass
+
+    def receive(self, island: int) -> List[List[PackedChild]]:
+        batches = []
+        while True:
+            try:
+                batches.append(self._inbox.get_nowait())
+            except queue.Empty:
+                return batches
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+
+
+def _run_island(island: int, master_graph: Graph, objective_fns: list, transport, results, config: dict) -> None:
+    """Evolve one island, exchanging migrants with its neighbors. Runs in its own process."""
+    Chromosome.objectives = objective_fns
+    random.seed(config['seed'] + island)
+    np.random.seed((config['seed'] + island) % 2 ** 32)
+
+    mutation_probability = config['mutation_probability']
+    stats = {'generations': 0, 'migrants_sent': 0, 'migrants_received': 0}
+    transport.open(island)
+
+    try:
+        parents = [Candidate(Chromosome.generate(master_graph)) for _ in range(config['pop_size'])]
+        frontier: Frontier = []
+
+        for gen in range(1, config['max_generations'] + 1):
+            optimize_now = config['optimize'] and gen % config['optimization_interval'] == 0
+            parents, frontier = next_generation(parents, mutation_probability, optimize_now)
+            mutation_probability *= config['mutation_degradation_rate']
+            stats['generations'] = gen
+
+            if gen % config['migration_interval'] == 0:
+                # the least crowded members of the frontier are the most useful elsewhere
+                migrants = [pack(p.chromosome) for p in sorted(frontier, key=lambda p: -p.distance)]
+                migrants = migrants[:config['migration_size']]
+                for other in neighbors(island, config['islands'], config['topology']):
+                    transport.send(other, migrants)
+                    stats['migrants_sent'] += len(migrants)
+
+            incoming = [unpack(master_graph, child) for batch in transport.receive(island) for child in batch]
+            if incoming:
+                stats['migrants_received'] += len(incoming)
+                parents, frontier = evaluate_generation(parents, incoming)
+
+        results.put((island, [pack(p.chromosome) for p in frontier], stats))
+    finally:
+        transport.close()
+
+
+def _collect(processes: list, results) -> list:
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=1))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                try:
+                    collected.append(results.get(timeout=5))
+                except queue.Empty:
+                    done = {island for island, _, _ in collected}
+                    raise IslandFailedException([i for i in range(len(processes)) if i not in done])
+
+    return collected
+
+
+def run_islands(master_graph: Graph, objective_fns: list, islands: int = 4, topology: str = 'ring',
+                migration_interval: int = 10, migration_size: int = 2, transport=None,
+                max_generations: int = 500, pop_size: int = 300, optimize: bool = True,
+                optimization_interval: int = 20, mutation_probability: float = 0.7,
+                mutation_degradation_rate: float = 0.9, seed: Optional[int] = None) -> Tuple[Frontier, dict]:
+    """
+    Run island-model NSGA-II: `islands` processes with pop_size parents each, migrating their migration_size best
+    frontier members to their neighbors every migration_interval generations. The transport defaults to a
+    QueueTransport. Returns the merged frontier and per-island statistics.
+    """
+    if topology not in TOPOLOGIES:
+        raise UnknownOptionException('topology', topology, TOPOLOGIES)
+
+    Chromosome.objectives = objective_fns
+    master_graph = prepare_master_graph(master_graph)
+    transport = transport or QueueTransport(islands)
+
+    config = {
+        'islands': islands, 'topology': topology, 'migration_interval': migration_interval,
+        'migration_size': migration_size, 'max_generations': max_generations, 'pop_size': pop_size,
+        'optimize': optimize, 'optimization_interval': optimization_interval,
+        'mutation_probability': mutation_probability, 'mutation_degradation_rate': mutation_degradation_rate,
+        'seed': random.getrandbits(32) if seed is None else seed,
+    }
+
+    context = process_context()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_run_island, args=(island, master_graph, objective_fns, transport, results, config))
+        for island in range(islands)
+    ]
+
+    for process in processes:
+        process.start()
+
+    try:
+        collected = _collect(processes, results)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    # merge the islands' frontiers, dropping plans found by more than one island
+    candidates = {}
+    for _, frontier, _ in sorted(collected, key=lambda result: result[0]):
+        for child in frontier:
+            candidate = unpack(master_graph, child)
+            candidates.setdefault(candidate.chromosome.get_fingerprint(), candidate)
+
+    pareto_frontier = fast_non_dominated_sort(list(candidates.values()))[0]
+    crowding_distance_assignment(pareto_frontier)
+
+    return pareto_frontier, {island: stats for island, _, stats in collected}
@@ -0,0 +1,124 @@
+"""Adaptive local search budget.
+
+Hill-climbing children is expensive, and whether it pays off changes over a run. The scheduler compares the
+hypervolume gained per second of local search with the hypervolume gained per second of plain evolution, and grows
+or shrinks the local search budget (how many children are optimized, with how many steps and samples, and how
+often) towards whichever is currently the better use of time.
+"""
+
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from elbridge.evolution.sorting import crowding_distances, non_dominated_ranks
+
+
+class MemeticPlan(NamedTuple):
+    # fraction of children to optimize, most promising first
+    fraction: float
+    steps: int
+    sample_size: int
+
+
+def promising(scores: np.ndarray, fraction: float, min_values: List[float], max_values: List[float]) -> List[int]:
+    """
+    Indices of the most promising fraction of a set of children: by non-dominated front among the children, then
+    by crowding distance within a front.
+    """
+    count = int(np.ceil(fraction * len(scores)))
+    if count >= len(scores):
+        return list(range(len(scores)))
+
+    ranks = non_dominated_ranks(scores)
+    distances = np.empty(len(scores))
+    for rank in np.unique(ranks):
+        front = np.flatnonzero(ranks == rank)
+        distances[front] = crowding_distances(scores[front], min_values, max_values)
+
+    return sorted(np.lexsort((-distances, ranks))[:count].tolist())
+
+
+class MemeticScheduler:
+    """
+    Decides which generations get local search, and how much. After every generation, record() takes the
+    generation's hypervolume gain and timing; the rates are exponential moving averages, so they follow the run.
+    """
+
+    # the attributes record() and plan() change
+    STATE = ('interval', 'fraction', 'steps', 'sample_size', 'evolution_rate', 'search_rate', '_last_search')
+
+    def __init__(self, interval: int = 20, fraction: float = 1.0, steps: int = 20, sample_size: int = 50,
+                 min_interval: int = 1, max_interval: int = 200, min_fraction: float = 0.05, min_steps: int = 2,
+                 max_steps: int = 100, max_sample_size: int = 500, smoothing: float = 0.3, growth: float = 1.5):
+        self.interval = interval
+        self.fraction = fraction
+        self.steps = steps
+        self.sample_size = sample_size
+
+        self.min_interval, self.max_interval = min_interval, max_interval
+        self.min_fraction = min_fraction
+        self.min_steps, self.max_steps = min_steps, max_steps
+        self.max_sample_size = max_sample_size
+        self.smoothing = smoothing
+        self.growth = growth
+
+        # hypervolume gained per second of evolution and per second of local search
+        self.evolution_rate: Optional[float] = None
+        self.search_rate: Optional[float] = None
+        self._last_search = 0
+
+    def get_state(self) -> dict:
+        """Everything the scheduler has learned, for checkpoints."""
+        return {key: getattr(self, key) for key in self.STATE}
+
+    def set_state(self, state: dict) -> None:
+        for key in self.STATE:
+            setattr(self, key, state[key])
+
+    def plan(self, generation: int) -> Optional[MemeticPlan]:
+        """The local search to run on this generation's children, if any."""
+        if generation - self._last_search < self.interval:
+            return None
+
+        self._last_search = generation
+        return MemeticPlan(self.fraction, int(round(self.steps)), int(round(self.sample_size)))
+
+    def _average(self, average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return (1 - self.smoothing) * average + self.smoothing * value
+
+    def record(self, plan: Optional[MemeticPlan], gain: float, seconds: float, search_seconds: float = 0.0) -> dict:
+        """
+        Update the rates with a generation's hypervolume gain, total time and time spent on local search, and
+        adapt the budget after generations with local search. Returns the decision, for logging.
+        """
+        evolution_seconds = max(seconds - search_seconds, 1e-9)
+        if plan is None:
+            self.evolution_rate = self._average(self.evolution_rate, gain / evolution_seconds)
+            return {'searched': False, 'evolution_rate': self.evolution_rate}
+
+        # credit local search with whatever the generation gained beyond what evolution alone would have
+        baseline = (self.evolution_rate or 0.0) * evolution_seconds
+        self.search_rate = self._average(self.search_rate, (gain - baseline) / max(search_seconds, 1e-9))
+
+        if self.evolution_rate is None:
+            decision = 'hold'
+        elif self.search_rate > self.evolution_rate:
+            decision = 'grow'
+            self.fraction = min(1.0, self.fraction * self.growth)
+            self.steps = min(self.max_steps, self.steps * self.growth)
+            self.sample_size = min(self.max_sample_size, self.sample_size * self.growth)
+            self.interval = max(self.min_interval, int(self.interval / self.growth))
+        else:
+            decision = 'shrink'
+            self.fraction = max(self.min_fraction, self.fraction / self.growth)
+            self.steps = max(self.min_steps, self.steps / self.growth)
+            self.sample_size = max(1.0, self.sample_size / self.growth)
+            self.interval = min(self.max_interval, int(np.ceil(self.interval * self.growth)))
+
+        return {
+            'searched': True, 'plan': plan._asdict(), 'gain': gain, 'search_seconds': search_seconds,
+            'evolution_rate': self.evolution_rate, 'search_rate': self.search_rate, 'decision': decision,
+            'next_interval': self.interval,
+        }
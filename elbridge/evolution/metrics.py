@@ -0,0 +1,91 @@
+"""Per-generation run metrics, streamed to an append-only JSON Lines log.
+
+Every line is one generation's record: the frontier's score vectors, the sizes of the parents' fronts, the number of
+unique parents, the generation's wall time and mutation probability, plus whatever else the run reports. Records are
+flushed as they're written, so a killed run's log is complete up to its last generation.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class MetricsLog:
+    """Appends generation records to a log file. Use as a context manager."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a')
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self._file.close()
+        self._file = None
+
+    def write(self, generation: int, **record) -> None:
+        record['generation'] = generation
+        self._file.write(json.dumps(record, default=_to_json, sort_keys=True) + '\n')
+        self._file.flush()
+
+
+def _to_json(value):
+    """Serialize numpy values, which json doesn't know about."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError("{} is not JSON serializable".format(type(value).__name__))
+
+
+def generation_record(frontier_scores: np.ndarray, ranks: Sequence[int], unique_parents: int, seconds: float,
+                      mutation_probability: float) -> dict:
+    """The fields every generation records. ranks are the parents' (1-based) fronts."""
+    return {
+        'frontier': np.asarray(frontier_scores).tolist(),
+        'front_sizes': np.bincount(np.asarray(ranks, dtype=np.int64))[1:].tolist(),
+        'unique_parents': unique_parents,
+        'seconds': seconds,
+        'mutation_probability': mutation_probability,
+    }
+
+
+def read_metrics(path: str) -> List[dict]:
+    """
+    Read a log's records in generation order. A resumed run repeats the generations after its checkpoint; the later
+    record of a generation wins. A partly-written last line (from a run killed mid-write) is skipped.
+    """
+    records: Dict[int, dict] = {}
+    with open(path) as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record['generation']] = record
+
+    return [records[generation] for generation in sorted(records)]
+
+
+def best_scores(records: List[dict], objective: int = 0) -> List[Optional[float]]:
+    """The best frontier score of an objective in every generation."""
+    return [max(scores[objective] for scores in record['frontier']) if record['frontier'] else None
+            for record in records]
+
+
+def time_to_target(records: List[dict], target: float, objective: int = 0) -> Optional[float]:
+    """Seconds until the best frontier score of an objective first reached target, or None if it never did."""
+    elapsed = 0.0
+    for record, best in zip(records, best_scores(records, objective)):
+        elapsed += record['seconds']
+        if best is not None and best >= target:
+            return elapsed
+
+    return None
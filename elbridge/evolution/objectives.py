@@ -1,9 +1,13 @@
 """Objective functions. These functions take a chromosome and return a value, such that better 
 chromosomes have higher values."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.contiguity import fragment_counts
+from elbridge.readers.table import get_table
 
 
 class ObjectiveFunction:
@@ -11,20 +15,39 @@ class ObjectiveFunction:
     min_value = None
     max_value = None
     goal_value = None
+    # objectives that set this define score_batch(assignments, fragments=None), which scores a 2D batch of
+    # assignments (one per row) at once; fragments, if given, are the batch's contiguity.fragment_counts
+    batched = False
 
     def __call__(self, chromosome: Chromosome) -> float:
         pass
 
 
+def score_batch(objectives: List[ObjectiveFunction], assignments: np.ndarray,
+                fragments: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """Score a batch with every objective: an N x M score matrix, or None if some objective can't score batches."""
+    if not all(objective.batched for objective in objectives):
+        return None
+
+    return np.stack([objective.score_batch(assignments, fragments) for objective in objectives], axis=1)
+
+
 class PopulationEquality(ObjectiveFunction):
     """Test population equality."""
+    batched = True
 
     def __init__(self, master_graph, key='pop'):
         self.key = key
+        self.master_graph = master_graph
         self.districts = master_graph.graph['districts']
 
-        self.total_pop = sum([data.get(self.key, 0) for _, data in master_graph.nodes(data=True)])
-        self.min_value = -1 * (self.total_pop - self.districts)
+        self.total_pop = get_table(master_graph).column(self.key).sum().item()
+        # the worst score __call__ can give: every vertex a district of its own, or every district in pieces
+        vertices = len(master_graph)
+        self.min_value = -1 * (
+            self.total_pop + 100 * max(vertices - self.districts, 0) +
+            1000 * max(self.districts - 1, vertices - self.districts, 0)
+        )
         self.max_value = 0
 
         self.goal_value = self.max_value
@@ -38,8 +61,17 @@ class PopulationEquality(ObjectiveFunction):
         """
         component_scores: List[Dict[str, float]] = chromosome.get_component_scores().values()
 
-        min_pop: float = min(score['total_pop'] for score in component_scores)
-        max_pop: float = max(score['total_pop'] for score in component_scores)
+        if self.key == 'pop':
+            min_pop: float = min(score['total_pop'] for score in component_scores)
+            max_pop: float = max(score['total_pop'] for score in component_scores)
+        else:
+            # component scores only track 'pop'; total up other keys from the node table
+            totals = get_table(chromosome.get_master_graph()).district_totals(
+                self.key, chromosome.assignment_array()
+            )
+            totals = totals[list(chromosome.get_component_scores())]
+            min_pop, max_pop = totals.min().item(), totals.max().item()
+
         num_components: int = sum(score['components'] for score in component_scores)
 
         _mp_score: float = max_pop - min_pop
@@ -47,3 +79,20 @@ class PopulationEquality(ObjectiveFunction):
         _dc_score: int = abs(len(component_scores) - self.districts)
 
         return -1 * (_mp_score + 100 * _sd_score + 1000 * _dc_score)
+
+    def score_batch(self, assignments: np.ndarray, fragments: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score every row of a batch as __call__ would, with one bincount and one contiguity pass for all rows."""
+        assignments = np.asarray(assignments)
+        if fragments is None:
+            fragments = fragment_counts(self.master_graph, assignments)
+
+        totals = get_table(self.master_graph).district_totals(self.key, assignments, minlength=fragments.shape[1])
+        totals = totals[:, :fragments.shape[1]].astype(float)
+        present = np.zeros(totals.shape, dtype=bool)
+        present[np.arange(len(assignments))[:, np.newaxis], assignments] = True
+
+        _mp_score = np.where(present, totals, -np.inf).max(axis=1) - np.where(present, totals, np.inf).min(axis=1)
+        _sd_score = fragments.sum(axis=1) - self.districts
+        _dc_score = np.abs(present.sum(axis=1) - self.districts)
+
+        return -1 * (_mp_score + 100 * _sd_score + 1000 * _dc_score)
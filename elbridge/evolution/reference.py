@@ -0,0 +1,124 @@
+"""Reference-direction survival selection (NSGA-III).
+
+With many objectives, almost every candidate is non-dominated and crowding distance stops telling them apart. Here
+the last front that doesn't fit is instead thinned against a fixed, evenly spread set of reference directions: every
+candidate is associated with the direction nearest to it in normalized objective space, and survivors are picked
+from the least populated directions first, so the population stays spread across the whole frontier.
+
+Scores are maximized elsewhere; this module works on costs (negated scores), as NSGA-III is usually stated.
+"""
+
+from itertools import combinations
+from math import factorial
+from typing import Tuple
+
+import numpy as np
+
+
+def direction_count(objective_count: int, divisions: int) -> int:
+    """Number of Das-Dennis directions with the given number of divisions per objective."""
+    return factorial(divisions + objective_count - 1) // (factorial(divisions) * factorial(objective_count - 1))
+
+
+def default_divisions(objective_count: int, pop_size: int) -> int:
+    """The most divisions whose directions don't outnumber the population (at least one)."""
+    divisions = 1
+    while objective_count > 1 and direction_count(objective_count, divisions + 1) <= pop_size:
+        divisions += 1
+
+    return divisions
+
+
+def reference_directions(objective_count: int, divisions: int) -> np.ndarray:
+    """
+    Das-Dennis directions: every point of the unit simplex whose coordinates are multiples of 1 / divisions, one
+    per row. They're the ways of cutting `divisions` into objective_count parts, i.e. of placing objective_count - 1
+    bars among divisions + objective_count - 1 slots.
+    """
+    slots = divisions + objective_count - 1
+    cuts = list(combinations(range(slots), objective_count - 1))
+    bars = np.array(cuts, dtype=np.int64).reshape(len(cuts), objective_count - 1)
+
+    edges = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), slots)])
+    return (np.diff(edges, axis=1) - 1) / divisions
+
+
+def normalize(costs: np.ndarray) -> np.ndarray:
+    """
+    Translate costs so the ideal point is the origin, and scale every objective by the intercept of the hyperplane
+    through the extreme points (those closest to each objective axis). Falls back to the worst cost of each
+    objective when the extreme points don't span a hyperplane with positive intercepts.
+    """
+    translated = costs - costs.min(axis=0)
+    objective_count = costs.shape[1]
+
+    # extreme point of each axis: the minimizer of the achievement scalarizing function with weights (eps, .., 1, ..)
+    weights = np.full((objective_count, objective_count), 1e-6) + (1 - 1e-6) * np.eye(objective_count)
+    asf = np.max(translated[np.newaxis, :, :] / weights[:, np.newaxis, :], axis=2)
+    extremes = translated[np.argmin(asf, axis=1)]
+
+    intercepts = None
+    try:
+        plane = np.linalg.solve(extremes, np.ones(objective_count))
+        if np.all(plane > 0):
+            intercepts = 1 / plane
+    except np.linalg.LinAlgError:
+        pass
+
+    if intercepts is None or not np.all(np.isfinite(intercepts)) or np.any(intercepts <= 1e-10):
+        intercepts = translated.max(axis=0)
+
+    return translated / np.where(intercepts > 1e-10, intercepts, 1.0)
+
+
+def associate(normalized: np.ndarray, directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The nearest reference direction of every point, and the point's perpendicular distance to it."""
+    units = directions / np.linalg.norm(directions, axis=1)[:, np.newaxis]
+    projections = normalized @ units.T
+    # N x R x M residuals of every point off every direction
+    residuals = normalized[:, np.newaxis, :] - projections[:, :, np.newaxis] * units[np.newaxis, :, :]
+    distances = np.linalg.norm(residuals, axis=2)
+
+    nearest = np.argmin(distances, axis=1)
+    return nearest, distances[np.arange(len(normalized)), nearest]
+
+
+def select(scores: np.ndarray, ranks: np.ndarray, count: int, directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick count survivors from candidates with the given scores and (1-based) fronts: whole fronts while they fit,
+    then members of the next front by niching. Returns the survivors' indices, and for each survivor the number of
+    survivors associated with its direction. Ties are broken with numpy's global random generator.
+    """
+    scores = np.asarray(scores, dtype=float)
+    ranks = np.asarray(ranks)
+
+    order = np.argsort(ranks, kind='mergesort')
+    sorted_ranks = ranks[order]
+    last_rank = sorted_ranks[min(count, len(ranks)) - 1]
+    considered = order[sorted_ranks <= last_rank]
+    chosen = considered[ranks[considered] < last_rank]
+
+    # positions in considered: the fronts that fit come first, then the last front
+    nearest, distances = associate(normalize(-scores[considered]), directions)
+    niche_counts = np.bincount(nearest[:len(chosen)], minlength=len(directions))
+
+    remaining = np.arange(len(chosen), len(considered))
+    picked = list(range(len(chosen)))
+    while len(picked) < count:
+        available = np.zeros(len(directions), dtype=bool)
+        available[nearest[remaining]] = True
+        sparsest = np.flatnonzero(available & (niche_counts == niche_counts[available].min()))
+        niche = np.random.choice(sparsest)
+
+        members = remaining[nearest[remaining] == niche]
+        if niche_counts[niche] == 0:
+            member = members[np.argmin(distances[members])]
+        else:
+            member = np.random.choice(members)
+
+        picked.append(member)
+        remaining = remaining[remaining != member]
+        niche_counts[niche] += 1
+
+    picked = np.array(picked, dtype=np.int64)
+    return considered[picked], niche_counts[nearest[picked]]
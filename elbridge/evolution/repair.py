@@ -0,0 +1,104 @@
+"""Fragment repair.
+
+Crossover and mutation leave many children with districts in several pieces, and fragmented children are scored only
+to be dominated and discarded. Repair runs on children before they're scored: every piece of a district but its
+largest joins an adjacent district, the least populated one it touches, so repairs also even out populations.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution.contiguity import fragment_labels, largest_fragments, neighbor_lists
+from elbridge.readers.table import get_table
+
+
+class RepairStats:
+    """Children checked, children repaired and fragments repaired since the last reset."""
+
+    def __init__(self):
+        self.children = self.repaired_children = self.fragments = 0
+
+    def record(self, fragments: Sequence[int]) -> None:
+        """Count a batch of children, given the number of fragments repaired in each."""
+        self.children += len(fragments)
+        self.repaired_children += int(np.count_nonzero(fragments))
+        self.fragments += int(np.sum(fragments))
+
+    def stats(self, reset: bool = False) -> Dict[str, int]:
+        out = {'children': self.children, 'repaired_children': self.repaired_children, 'fragments': self.fragments}
+        if reset:
+            self.children = self.repaired_children = self.fragments = 0
+
+        return out
+
+
+REPAIRS = RepairStats()
+
+
+def repair_fragments(graph: Graph, assignments: np.ndarray, rounds: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Repair a batch of assignments (one per row): each fragment that isn't the largest of its district moves to the
+    least populated district it borders. A fragment that only borders other fragments being moved waits for a later
+    round; fragments that border no other district (e.g. islands) stay. Returns the repaired assignments and the
+    number of fragments moved in each row.
+
+    Finding the fragments takes one contiguity pass over the batch; after that, every round only looks at the edges
+    of the fragments still waiting to move.
+    """
+    assignments = np.array(assignments, dtype=np.int64, ndmin=2)
+    batch_size, vertex_count = assignments.shape
+    repaired = np.zeros(batch_size, dtype=np.int64)
+
+    fragment_count, fragments = fragment_labels(graph, assignments)
+    stray = np.flatnonzero(~largest_fragments(graph, assignments, fragments).ravel())
+    if not len(stray):
+        return assignments, repaired
+
+    # every edge out of a stray vertex, as flat (row * |V| + vertex) indices
+    indptr, indices = neighbor_lists(graph)
+    vertices = stray % vertex_count
+    degrees = indptr[vertices + 1] - indptr[vertices]
+    starts = np.repeat(indptr[vertices] - np.cumsum(degrees) + degrees, degrees) + np.arange(degrees.sum())
+    sources = np.repeat(stray, degrees)
+    targets = indices[starts] + np.repeat(stray - vertices, degrees)
+
+    flat = assignments.ravel()
+    table = get_table(graph)
+    pops = table.column('pop')
+    totals = table.district_totals('pop', assignments)
+    waiting = np.zeros(fragment_count, dtype=bool)
+    waiting[fragments[stray]] = True
+
+    for _ in range(rounds):
+        while True:
+            # edges from a waiting fragment into the kept part of a district
+            edges = np.flatnonzero(waiting[fragments[sources]] & ~waiting[fragments[targets]])
+            # fragments that earlier moves connected to the rest of their district are no longer stray
+            joined = fragments[sources[edges[flat[sources[edges]] == flat[targets[edges]]]]]
+            if not len(joined):
+                break
+            waiting[joined] = False
+
+        if not len(edges):
+            break
+
+        # every stray fragment picks the least populated district across its edges
+        moved = fragments[sources[edges]]
+        destinations = flat[targets[edges]]
+        batch = sources[edges] // vertex_count
+        order = np.lexsort((totals[batch, destinations], moved))
+        first = np.append(True, moved[order][1:] != moved[order][:-1])
+
+        destination = np.zeros(fragment_count, dtype=np.int64)
+        destination[moved[order][first]] = destinations[order][first]
+        repaired += np.bincount(batch[order][first], minlength=batch_size)
+        waiting[moved[order][first]] = False
+
+        moving = stray[destination[fragments[stray]] > 0]
+        np.subtract.at(totals, (moving // vertex_count, flat[moving]), pops[moving % vertex_count])
+        flat[moving] = destination[fragments[moving]]
+        np.add.at(totals, (moving // vertex_count, flat[moving]), pops[moving % vertex_count])
+
+    return assignments, repaired
@@ -1,19 +1,43 @@
 """Local search."""
 import random
+import time
 from multiprocessing.pool import Pool
-from typing import Optional
+from typing import List, Optional
 
 from tqdm import tqdm
 
+from elbridge.evolution.cache import cached_scores
 from elbridge.evolution.chromosome import Chromosome
+from elbridge.utilities.types import Edge
+from elbridge.utilities.utils import dominates, vertex_order
 
 # use this to mute tqdm
 tqdm = lambda x, *y, **z: x
 
 
+def _sample_moves(state: Chromosome, sample_size: int) -> List[Edge]:
+    """
+    Sample boundary moves of a state. Moves are put in vertex index order first: set order depends on (randomized)
+    string hashing, and seeded runs have to be reproducible.
+    """
+    order = vertex_order(state.get_master_graph())
+    moves = sorted(state.get_hypotheticals().edges, key=lambda edge: (order[edge[0]], order[edge[1]]))
+    return random.sample(moves, min(len(moves), sample_size))
+
+
+def _skip_known_moves(state: Chromosome, moves: List[Edge]) -> List[Edge]:
+    """Drop moves leading to plans we've already scored and that don't dominate state."""
+    unknown = []
+    for move in moves:
+        scores = cached_scores(Chromosome.objectives, state.neighbor_fingerprint(move))
+        if scores is None or dominates(scores, state.get_scores()):
+            unknown.append(move)
+
+    return unknown
+
+
 def find_best_neighbor_simple(state: Chromosome, sample_size: int = 100) -> Optional[Chromosome]:
-    moves = state.get_hypotheticals().edges
-    samples = random.sample(moves, min(len(moves), sample_size))
+    samples = _skip_known_moves(state, _sample_moves(state, sample_size))
 
     best_state = None
     best_gradient = float('-inf')
@@ -31,23 +55,35 @@ def find_best_neighbor_simple(state: Chromosome, sample_size: int = 100) -> Opti
 
 def find_best_neighbor(state: Chromosome, sample_size: int = 100) -> Optional[Chromosome]:
     """Find the best neighbors of this state."""
-    moves = state.get_hypotheticals().edges
-    samples = random.sample(moves, min(len(moves), sample_size))
+    samples = _skip_known_moves(state, _sample_moves(state, sample_size))
 
     with Pool(processes=4) as p:
         new_states = p.map(state.connect_vertices, samples)
+
+        # neighbors were scored in the worker processes; keep their scores here
+        for new_state in new_states:
+            new_state.cache_scores()
+
         try:
             return max(filter(lambda ns: ns.dominates(state), new_states), key=lambda ns: state.gradient(ns))
         except ValueError:
             return None
 
 
-def optimize(chromosome: Chromosome, pos: int = 0, steps: int = 100, sample_size: int = 100) -> Chromosome:
-    """Take a solution and return a nearby local maximum."""
+def optimize(chromosome: Chromosome, pos: int = 0, steps: int = 100, sample_size: int = 100,
+             multiprocess: bool = True, deadline: Optional[float] = None) -> Chromosome:
+    """
+    Take a solution and return a nearby local maximum. Set multiprocess to False inside worker processes, which
+    can't start a pool of their own. With a deadline (a time.time() value), no step starts after it.
+    """
     state = chromosome
+    neighbor_fn = find_best_neighbor if multiprocess else find_best_neighbor_simple
 
     for _ in tqdm(range(steps), "Taking steps", position=pos):
-        new_state = find_best_neighbor(state, sample_size=sample_size)
+        if deadline is not None and time.time() >= deadline:
+            return state
+
+        new_state = neighbor_fn(state, sample_size=sample_size)
         if new_state is None:
             return state
 
@@ -0,0 +1,279 @@
+"""Initial plan seeding.
+
+Chromosome.generate gives every vertex a uniformly random district, so first-generation plans are hundreds of
+fragments, and early generations are spent gluing them together. These strategies start from contiguous plans with
+nearly equal district populations instead:
+
+- 'bfs' grows all districts at once from spread out seed vertices, always extending the least populated district.
+  It's the least balanced: a district its neighbors enclose early stays small.
+- 'tree' cuts a random spanning tree at the edge that best balances the two sides, recursively.
+- 'spectral' splits at the population-weighted quantile of the Fiedler vector of a randomly weighted Laplacian,
+  recursively.
+
+'mixed' cycles through all three, and 'random' is Chromosome.generate's. Randomness comes from numpy's global
+generator, which worker processes seed.
+
+Runs can also start warm, from existing plans and perturbed copies of them (see warm_plans).
+"""
+
+import heapq
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+from networkx import Graph
+from scipy.sparse import csr_matrix, triu
+from scipy.sparse.csgraph import (breadth_first_order, connected_components, laplacian, minimum_spanning_tree,
+                                  shortest_path)
+from scipy.sparse.linalg import eigsh
+
+from elbridge.evolution.contiguity import adjacency
+from elbridge.evolution.repair import repair_fragments
+from elbridge.readers.table import get_table
+from elbridge.utilities.xceptions import UnknownOptionException
+
+STRATEGIES = ('bfs', 'tree', 'spectral')
+SEEDINGS = ('random', 'mixed') + STRATEGIES
+
+# (strategy, random seed) of one seeded plan
+SeedTask = Tuple[str, int]
+
+# above this many vertices, Fiedler vectors come from ARPACK rather than a dense eigendecomposition
+DENSE_LIMIT = 400
+
+
+def neighbors(graph: Graph) -> csr_matrix:
+    """Symmetric CSR adjacency matrix of a master graph, in vertex index order."""
+    rows, cols = adjacency(graph)
+    size = len(graph)
+    return csr_matrix(
+        (np.ones(2 * len(rows)), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))), shape=(size, size)
+    )
+
+
+def _populations(graph: Graph) -> np.ndarray:
+    return get_table(graph).column('pop').astype(float)
+
+
+def spread_seeds(matrix: csr_matrix, count: int) -> List[int]:
+    """
+    Pick count seed vertices, k-means++ style: after a uniformly random first seed, every seed is drawn with
+    probability proportional to the squared hop distance to the nearest seed so far.
+    """
+    seeds = [int(np.random.randint(matrix.shape[0]))]
+    nearest = np.full(matrix.shape[0], np.inf)
+    while len(seeds) < count:
+        nearest = np.minimum(nearest, shortest_path(matrix, indices=seeds[-1], unweighted=True))
+        # unreachable vertices count as far away as the farthest reachable one
+        weights = np.where(np.isfinite(nearest), nearest, nearest[np.isfinite(nearest)].max()) ** 2
+        if not weights.sum():
+            weights = np.ones(len(weights))
+            weights[seeds] = 0
+        seeds.append(int(np.random.choice(len(weights), p=weights / weights.sum())))
+
+    return seeds
+
+
+def _grow_regions(matrix: csr_matrix, populations: np.ndarray, districts: int) -> np.ndarray:
+    assignment = np.zeros(len(populations), dtype=np.int64)
+    totals = np.zeros(districts + 1)
+
+    frontiers = {}
+    heap: List[Tuple[float, int]] = []
+    for district, seed in enumerate(spread_seeds(matrix, districts), start=1):
+        assignment[seed] = district
+        totals[district] = populations[seed]
+        frontiers[district] = deque(matrix.indices[matrix.indptr[seed]:matrix.indptr[seed + 1]].tolist())
+        heap.append((totals[district], district))
+    heapq.heapify(heap)
+
+    while heap:
+        _, district = heapq.heappop(heap)
+        frontier = frontiers[district]
+        while frontier and assignment[frontier[0]]:
+            frontier.popleft()
+        if not frontier:
+            # enclosed by other districts; it stops growing
+            continue
+
+        vertex = frontier.popleft()
+        assignment[vertex] = district
+        totals[district] += populations[vertex]
+        adjacent = matrix.indices[matrix.indptr[vertex]:matrix.indptr[vertex + 1]]
+        frontier.extend(adjacent[assignment[adjacent] == 0].tolist())
+        heapq.heappush(heap, (totals[district], district))
+
+    # vertices in connected components no seed landed in
+    assignment[assignment == 0] = 1 + int(np.argmin(totals[1:]))
+    return assignment
+
+
+def grow_regions(graph: Graph, districts: int, attempts: int = 3) -> np.ndarray:
+    """
+    Multi-source BFS region growing from spread out seeds: the least populated district claims the next vertex on
+    its frontier. A district that gets enclosed early stays small, so this grows attempts plans and keeps the one
+    with the smallest spread of district populations.
+    """
+    matrix, populations = neighbors(graph), _populations(graph)
+
+    best_spread, best = np.inf, None
+    for _ in range(attempts):
+        assignment = _grow_regions(matrix, populations, districts)
+        totals = np.bincount(assignment, weights=populations)[1:]
+        if totals.max() - totals.min() < best_spread:
+            best_spread, best = totals.max() - totals.min(), assignment
+
+    return best
+
+
+def _connect(matrix: csr_matrix) -> csr_matrix:
+    """Add one edge between consecutive connected components of a graph, so spanning trees span all of it."""
+    count, labels = connected_components(matrix, directed=False)
+    if count == 1:
+        return matrix
+
+    representatives = np.unique(labels, return_index=True)[1]
+    bridges = csr_matrix(
+        (np.ones(count - 1), (representatives[:-1], representatives[1:])), shape=matrix.shape
+    )
+    return (matrix + bridges).tocsr()
+
+
+def _split_tree(matrix: csr_matrix, populations: np.ndarray, ratio: float,
+                attempts: int = 10, tolerance: float = 0.01) -> np.ndarray:
+    """
+    Cut a random spanning tree of a graph at the edge that leaves the first side with the share of the population
+    closest to ratio, drawing up to attempts trees until the share is within tolerance. Returns a mask of the first
+    side; both sides are connected.
+    """
+    edges = triu(_connect(matrix), k=1).tocsr()
+    target = ratio * populations.sum()
+    best_gap, best = np.inf, None
+
+    for _ in range(attempts):
+        edges.data = np.random.random_sample(len(edges.data)) + 1e-3
+        tree = minimum_spanning_tree(edges)
+        order, predecessors = breadth_first_order(tree, int(np.random.randint(len(populations))), directed=False)
+
+        # population below every vertex, accumulated from the leaves up
+        subtree = populations.copy()
+        for vertex in order[:0:-1].tolist():
+            subtree[predecessors[vertex]] += subtree[vertex]
+
+        # either the subtree below a cut edge or the rest of the tree can be the first side
+        below = np.abs(subtree[order[1:]] - target)
+        above = np.abs(subtree[order[0]] - subtree[order[1:]] - target)
+        idx = int(np.argmin(np.minimum(below, above)))
+        gap = min(below[idx], above[idx])
+        if gap < best_gap:
+            best_gap, best = gap, (order, predecessors, order[1 + idx], below[idx] <= above[idx])
+        if best_gap <= tolerance * target:
+            break
+
+    order, predecessors, cut, first_below = best
+    inside = np.zeros(len(populations), dtype=bool)
+    inside[cut] = True
+    for vertex in order.tolist():
+        if vertex != cut and predecessors[vertex] >= 0 and inside[predecessors[vertex]]:
+            inside[vertex] = True
+
+    return inside if first_below else ~inside
+
+
+def _split_spectral(matrix: csr_matrix, populations: np.ndarray, ratio: float) -> np.ndarray:
+    """
+    Split a graph at the population-weighted quantile ratio of the Fiedler vector of its Laplacian, with random
+    edge weights so that repeated splits differ. Returns a mask of the first side.
+    """
+    edges = triu(matrix, k=1).tocsr()
+    edges.data = np.random.uniform(0.5, 1.5, size=len(edges.data))
+    lap = laplacian((edges + edges.T).tocsr())
+
+    if len(populations) <= DENSE_LIMIT:
+        _, vectors = np.linalg.eigh(lap.toarray())
+        fiedler = vectors[:, 1]
+    else:
+        # shift-invert around a point just below the spectrum finds the smallest eigenvalues quickly
+        values, vectors = eigsh(lap.tocsc(), k=2, sigma=-1e-3, which='LM')
+        fiedler = vectors[:, np.argsort(values)[1]]
+
+    order = np.argsort(fiedler, kind='mergesort')
+    shares = np.cumsum(populations[order])[:-1]
+    cut = 1 + int(np.argmin(np.abs(shares - ratio * populations.sum())))
+
+    first = np.zeros(len(populations), dtype=bool)
+    first[order[:cut]] = True
+    return first
+
+
+def bisect(graph: Graph, districts: int, split) -> np.ndarray:
+    """Recursively split the graph in two with split(matrix, populations, ratio) until there are enough districts."""
+    matrix, populations = neighbors(graph), _populations(graph)
+    assignment = np.zeros(len(graph), dtype=np.int64)
+
+    pending = [(np.arange(len(graph)), districts, 1)]
+    while pending:
+        vertices, count, label = pending.pop()
+        if count == 1 or len(vertices) < 2:
+            assignment[vertices] = label
+            continue
+
+        half = count // 2
+        first = split(matrix[vertices][:, vertices], populations[vertices], half / count)
+        pending.append((vertices[first], half, label))
+        pending.append((vertices[~first], count - half, label + half))
+
+    return assignment
+
+
+def seed_plan(graph: Graph, seeding: str) -> np.ndarray:
+    """One plan, as an assignment array in vertex index order, made with one of the STRATEGIES."""
+    districts = min(graph.graph['districts'], len(graph))
+    if seeding == 'bfs':
+        return grow_regions(graph, districts)
+    if seeding == 'tree':
+        return bisect(graph, districts, _split_tree)
+    if seeding == 'spectral':
+        # quantile cuts can leave a side in pieces
+        return repair_fragments(graph, bisect(graph, districts, _split_spectral))[0][0]
+
+    raise UnknownOptionException('seeding', seeding, STRATEGIES)
+
+
+def seeded_plan(graph: Graph, task: SeedTask) -> np.ndarray:
+    """seed_plan with the task's strategy, drawing from numpy's generator seeded with the task's seed."""
+    strategy, seed = task
+    state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        return seed_plan(graph, strategy)
+    finally:
+        np.random.set_state(state)
+
+
+def perturb(graph: Graph, assignments: np.ndarray, fraction: float = 0.02) -> np.ndarray:
+    """
+    Move about fraction of the vertices of every plan (at least one) across district boundaries, one boundary edge
+    at a time, then repair whatever fragments that leaves. Returns new assignments.
+    """
+    assignments = np.array(assignments, dtype=np.int64, ndmin=2)
+    rows, cols = adjacency(graph)
+    sources, targets = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+    moves = max(1, int(fraction * assignments.shape[1]))
+
+    for assignment in assignments:
+        for _ in range(moves):
+            boundary = np.flatnonzero(assignment[sources] != assignment[targets])
+            if not len(boundary):
+                break
+            edge = boundary[np.random.randint(len(boundary))]
+            assignment[sources[edge]] = assignment[targets[edge]]
+
+    return repair_fragments(graph, assignments)[0]
+
+
+def warm_plans(graph: Graph, plans: np.ndarray, count: int) -> np.ndarray:
+    """count plans from existing ones (rows of plans): each of them once, then perturbed copies, in turn."""
+    plans = np.asarray(plans, dtype=np.int64)
+    copies = plans[np.arange(max(count - len(plans), 0)) % len(plans)]
+    return np.concatenate([plans[:count], perturb(graph, copies)]) if len(copies) else plans[:count]
@@ -0,0 +1,105 @@
+"""Plan sketches.
+
+Crowding distance only measures spread in objective space, so a population can fill up with near-identical plans
+that happen to score differently. A sketch is a MinHash signature of the set of edges a plan cuts (edges whose
+endpoints are in different districts): two plans' sketches agree in about the same fraction of positions as the
+Jaccard similarity of their cut edges. The cut edges don't depend on district labels, so relabeled plans share a
+sketch.
+
+Near-duplicates are found by locality-sensitive hashing: sketches are split into bands, and only plans that agree
+on every position of some band are compared, so populations in the thousands aren't compared pairwise.
+"""
+
+from itertools import combinations
+from typing import List, Tuple
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution.contiguity import adjacency
+
+SKETCH_SIZE = 64
+BANDS = 16
+
+# the hash of the empty set; no edge key takes it
+EMPTY = np.iinfo(np.uint32).max
+# edge keys don't depend on the global generators, so sketching never changes a run's trajectory
+KEY_SEED = 1812
+
+
+def sketch_keys(graph: Graph, size: int = SKETCH_SIZE) -> np.ndarray:
+    """size random 32-bit keys per edge of a master graph, in adjacency order. Generated once per graph."""
+    edge_count = len(adjacency(graph)[0])
+    keys = graph.graph.get('sketch_keys')
+    if keys is None or keys.shape != (size, edge_count):
+        keys = np.random.RandomState(KEY_SEED).randint(0, EMPTY, size=(size, edge_count), dtype=np.int64)
+        keys = keys.astype(np.uint32)
+        graph.graph['sketch_keys'] = keys
+
+    return keys
+
+
+def sketches(graph: Graph, assignments: np.ndarray, size: int = SKETCH_SIZE) -> np.ndarray:
+    """Sketch a batch of assignments (one per row). Returns a batch x size array."""
+    assignments = np.array(assignments, ndmin=2)
+    rows, cols = adjacency(graph)
+    out = np.full((len(assignments), size), EMPTY, dtype=np.uint32)
+    if not len(rows):
+        return out
+
+    cut = assignments[:, rows] != assignments[:, cols]
+    for idx, keys in enumerate(sketch_keys(graph, size)):
+        out[:, idx] = np.where(cut, keys, EMPTY).min(axis=1)
+
+    return out
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of the cut edges of sketched plans (broadcasting over leading axes)."""
+    return np.mean(np.asarray(first) == np.asarray(second), axis=-1)
+
+
+def candidate_pairs(sketched: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """
+    Index pairs (i < j) of sketches that agree on every position of at least one band, as a K x 2 array. Plans
+    with similarity s become candidates with probability 1 - (1 - s^r)^bands, for r positions per band.
+    """
+    width = sketched.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(sketched[:, band * width:(band + 1) * width])
+        # one opaque value per row, so that rows can be grouped with a 1D unique
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * width))).ravel()
+        _, labels = np.unique(keys, return_inverse=True)
+
+        order = np.argsort(labels, kind='mergesort')
+        starts = np.flatnonzero(np.concatenate(([True], labels[order][1:] != labels[order][:-1])))
+        for bucket in np.split(order, starts[1:]):
+            if len(bucket) > 1:
+                pairs.update(combinations(sorted(bucket.tolist()), 2))
+
+    return np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+
+
+def near_duplicates(sketched: np.ndarray, threshold: float = 0.8,
+                    bands: int = BANDS) -> List[Tuple[int, int]]:
+    """Index pairs of sketches whose estimated similarity is at least threshold."""
+    pairs = candidate_pairs(sketched, bands)
+    close = similarity(sketched[pairs[:, 0]], sketched[pairs[:, 1]]) >= threshold
+    return [tuple(pair) for pair in pairs[close].tolist()]
+
+
+def novelty(sketched: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """
+    One minus every sketch's estimated similarity to its most similar LSH candidate: 1 for plans with no
+    near-duplicate, 0 for plans with an identical twin.
+    """
+    pairs = candidate_pairs(sketched, bands)
+    closest = np.zeros(len(sketched))
+    if len(pairs):
+        similarities = similarity(sketched[pairs[:, 0]], sketched[pairs[:, 1]])
+        np.maximum.at(closest, pairs[:, 0], similarities)
+        np.maximum.at(closest, pairs[:, 1], similarities)
+
+    return 1 - closest
+
@@ -0,0 +1,117 @@
+"""Non-dominated sorting on score matrices.
+
+Scores are an N x M array (N candidates, M objectives), and higher is better for every objective.
+"""
+
+from bisect import bisect_right
+from typing import Sequence
+
+import numpy as np
+
+# rows of the domination matrix computed at once, to bound memory on large populations
+CHUNK_SIZE = 1024
+
+
+def domination_matrix(scores: np.ndarray) -> np.ndarray:
+    """Return an N x N boolean matrix D such that D[i, j] iff candidate i dominates candidate j."""
+    dominated = np.empty((len(scores), len(scores)), dtype=bool)
+
+    for start in range(0, len(scores), CHUNK_SIZE):
+        block = scores[start:start + CHUNK_SIZE, np.newaxis, :]
+        dominated[start:start + CHUNK_SIZE] = (
+            np.all(block >= scores[np.newaxis, :, :], axis=2) & np.any(block > scores[np.newaxis, :, :], axis=2)
+        )
+
+    return dominated
+
+
+def _pairwise_ranks(scores: np.ndarray) -> np.ndarray:
+    dominated = domination_matrix(scores)
+    counts = dominated.sum(axis=0)
+    ranks = np.full(len(scores), -1, dtype=np.int64)
+
+    rank = 0
+    front = np.flatnonzero(counts == 0)
+    while front.size:
+        ranks[front] = rank
+        counts -= dominated[front].sum(axis=0)
+        counts[front] = -1
+
+        front = np.flatnonzero(counts == 0)
+        rank += 1
+
+    return ranks
+
+
+def _two_objective_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    O(N log N) sweep for two objectives. Visit distinct points by decreasing first objective; a point is dominated
+    by a front iff that front already holds a point with an equal or higher second objective, so the point's front
+    is the first one whose best second objective is lower than its own.
+    """
+    points, inverse = np.unique(scores, axis=0, return_inverse=True)
+    point_ranks = np.empty(len(points), dtype=np.int64)
+
+    # negated best second objective of every front so far; non-decreasing, so it can be bisected
+    fronts = []
+    for idx in np.lexsort((-points[:, 1], -points[:, 0])):
+        value = -points[idx, 1]
+        rank = bisect_right(fronts, value)
+        if rank == len(fronts):
+            fronts.append(value)
+        else:
+            fronts[rank] = value
+
+        point_ranks[idx] = rank
+
+    return point_ranks[inverse.ravel()]
+
+
+def non_dominated_ranks(scores: np.ndarray) -> np.ndarray:
+    """Return the (0-based) front of every candidate."""
+    scores = np.asarray(scores, dtype=float)
+    if not len(scores):
+        return np.zeros(0, dtype=np.int64)
+
+    if scores.shape[1] == 2:
+        return _two_objective_ranks(scores)
+
+    return _pairwise_ranks(scores)
+
+
+def fronts_from_ranks(ranks: np.ndarray) -> list:
+    """Group candidate indices by front, keeping their original order within each front."""
+    if not len(ranks):
+        return []
+
+    order = np.argsort(ranks, kind='mergesort')
+    boundaries = np.flatnonzero(np.diff(ranks[order])) + 1
+    return [front.tolist() for front in np.split(order, boundaries)]
+
+
+def crowding_distances(scores: np.ndarray, min_values: Sequence[float], max_values: Sequence[float]) -> np.ndarray:
+    """
+    Crowding distance of every candidate on one front: for each objective, the gap between its two neighbors when
+    the front is sorted by that objective, normalized by the objective's range, summed over objectives. The
+    boundary candidates of every objective get an infinite distance.
+    """
+    scores = np.asarray(scores, dtype=float)
+    count, objectives = scores.shape
+    if count <= 2:
+        return np.full(count, float('inf'))
+
+    span = np.asarray(max_values, dtype=float) - np.asarray(min_values, dtype=float)
+    span = np.where(span > 0, span, np.inf)
+
+    order = np.argsort(scores, axis=0, kind='mergesort')
+    ordered = np.take_along_axis(scores, order, axis=0)
+
+    gaps = np.empty_like(ordered)
+    gaps[1:-1] = (ordered[2:] - ordered[:-2]) / span
+    gaps[[0, -1]] = float('inf')
+
+    # scatter the gaps back to the candidates they belong to
+    contributions = np.empty_like(gaps)
+    contributions[order, np.arange(objectives)] = gaps
+
+    return contributions.sum(axis=1)
@@ -0,0 +1,226 @@
+"""Steady-state NSGA-II.
+
+There is no generation barrier: the coordinator keeps every worker busy breeding pairs of parents, and inserts each
+child into the population as soon as it arrives, keeping the population's non-dominated fronts up to date
+incrementally and dropping the most crowded member of the last front. Slow, hill-climbed children hold up nothing
+but their own worker.
+
+Children arrive in whatever order the workers finish them, so steady-state runs aren't reproducible.
+"""
+
+import queue
+import random
+import time
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
+
+import networkx as nx
+
+from elbridge.evolution.archive import ParetoArchive, write_plans, write_vertices
+from elbridge.evolution.cache import DEFAULT_MAX_BYTES, SCORE_CACHE
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.engine import ProcessEngine, breed, compact, unpack
+from elbridge.evolution.genetics import (Frontier, Population, crowding_distance_assignment, fast_non_dominated_sort,
+                                         generate_population, score_matrix, select_parent)
+from elbridge.evolution.hypervolume import converged, hypervolume
+from elbridge.evolution.metrics import MetricsLog, generation_record
+from elbridge.evolution.objectives import ObjectiveFunction
+from elbridge.evolution.repair import REPAIRS
+
+
+class SteadyStatePopulation:
+    """A population kept sorted into non-dominated fronts as members come and go."""
+
+    def __init__(self, population: Population):
+        self.fronts: List[Frontier] = fast_non_dominated_sort(population)
+        self._members = set(population)
+        for front in self.fronts:
+            crowding_distance_assignment(front)
+
+    def __len__(self):
+        return len(self._members)
+
+    def members(self) -> Population:
+        return [p for front in self.fronts for p in front]
+
+    def insert(self, candidate: Candidate) -> bool:
+        """
+        Add a candidate to the first front none of whose members dominate it. Members it dominates there are pushed
+        down a front, which may push down members of the next front, and so on. Returns False (and leaves the
+        population alone) if the plan is already in it.
+        """
+        if candidate in self._members:
+            return False
+        self._members.add(candidate)
+
+        rank = 0
+        while rank < len(self.fronts) and any(p.dominates(candidate) for p in self.fronts[rank]):
+            rank += 1
+
+        moved = [candidate]
+        while moved:
+            if rank == len(self.fronts):
+                self.fronts.append([])
+
+            front = self.fronts[rank]
+            demoted = [p for p in front if any(q.dominates(p) for q in moved)]
+            front[:] = [p for p in front if p not in demoted] + moved
+
+            for p in front:
+                p.rank = rank + 1
+            crowding_distance_assignment(front)
+
+            moved = demoted
+            rank += 1
+
+        return True
+
+    def remove_worst(self) -> Candidate:
+        """
+        Drop the most crowded member of the last front. Nobody is dominated by a last-front member, so no other
+        member changes fronts.
+        """
+        front = self.fronts[-1]
+        worst = min(front, key=lambda p: p.distance)
+        front.remove(worst)
+        self._members.remove(worst)
+
+        if front:
+            crowding_distance_assignment(front)
+        else:
+            self.fronts.pop()
+
+        return worst
+
+
+def run_steady_state(master_graph: nx.Graph, objective_fns: List[ObjectiveFunction],
+                     max_generations: int = 500, pop_size: int = 300, processes: Optional[int] = None,
+                     optimize: bool = True, optimization_interval: int = 20, mutation_probability: float = 0.7,
+                     mutation_degradation_rate: float = 0.9, score_cache_bytes: int = DEFAULT_MAX_BYTES,
+                     convergence_window: Optional[int] = None,
+                     convergence_epsilon: float = 1e-6, metrics_path: Optional[str] = None,
+                     archive_path: Optional[str] = None, archive_size: Optional[int] = None,
+                     seeding: str = 'random', crossover: str = 'point', repair: bool = False) -> Tuple[Frontier, dict]:
+    """
+    Run steady-state NSGA-II on a ProcessEngine. A "generation" here is pop_size children: statistics are recorded,
+    the mutation probability decays and convergence is checked once per generation, so options mean the same as
+    they do for run_nsga2. Every optimization_interval-th pair's children are hill-climbed, which optimizes as many
+    children as run_nsga2 does. With a metrics_path, generations are logged to a MetricsLog, and with an
+    archive_path, every child is offered to a ParetoArchive streamed there, as in run_nsga2. The initial population
+    is seeded as run_nsga2 seeds it, before the engine starts, and children are bred with the given crossover (and
+    repaired, with repair set).
+    """
+    Chromosome.objectives = objective_fns
+    SCORE_CACHE.resize(score_cache_bytes)
+    SCORE_CACHE.clear()
+    REPAIRS.stats(reset=True)
+
+    population = SteadyStatePopulation(generate_population(master_graph, pop_size, seeding))
+    min_values = [fn.min_value for fn in objective_fns]
+    max_values = [fn.max_value for fn in objective_fns]
+
+    data_output = {}
+    hypervolumes = []
+    stop_reason = None
+    archive = ParetoArchive(len(objective_fns), max_size=archive_size) if archive_path else None
+
+    with ExitStack() as stack:
+        engine = stack.enter_context(
+            ProcessEngine(master_graph, objective_fns, processes=processes, crossover=crossover, repair=repair)
+        )
+        log = stack.enter_context(MetricsLog(metrics_path)) if metrics_path else None
+        archive_log = stack.enter_context(MetricsLog(archive_path)) if archive_path else None
+        if archive is not None:
+            write_vertices(archive_log, master_graph)
+            write_plans(archive_log, 0, archive.update(population.members()))
+        results = queue.Queue()
+        submitted = 0
+
+        def submit():
+            nonlocal submitted
+            parents = population.members()
+            task = (
+                compact(select_parent(parents).chromosome.get_assignment()),
+                compact(select_parent(parents).chromosome.get_assignment()),
+                mutation_probability, optimize and submitted % optimization_interval == 0, random.getrandbits(32),
+                None
+            )
+            engine.submit(breed, task, results.put, results.put)
+            submitted += 1
+
+        # two tasks per worker, so workers never wait for the coordinator
+        for _ in range(2 * engine.processes):
+            submit()
+
+        gen, children, inserted = 1, 0, 0
+        started = time.time()
+        try:
+            while gen <= max_generations:
+                result = results.get()
+                if isinstance(result, BaseException):
+                    raise result
+                submit()
+
+                packed, repaired = result
+                if repair:
+                    REPAIRS.record(repaired)
+                for packed_child in packed:
+                    child = unpack(engine.master_graph, packed_child)
+                    if archive is not None:
+                        write_plans(archive_log, gen, archive.update([child]))
+                    if population.insert(child) and population.remove_worst() is not child:
+                        inserted += 1
+                    children += 1
+
+                if children < pop_size:
+                    continue
+
+                pareto_frontier = list(population.fronts[0])
+                cache_stats = SCORE_CACHE.stats(reset=True)
+                hypervolumes.append(hypervolume(score_matrix(pareto_frontier), min_values, max_values))
+                print("pareto frontier {}/{} (score {}, hypervolume {:.6f}, {} new, {:.1f} children/s)".format(
+                    len(pareto_frontier), len(population), pareto_frontier[0].chromosome.get_scores(),
+                    hypervolumes[-1], inserted, children / (time.time() - started)
+                ))
+
+                data_output[gen] = {
+                    'unique_parents': len(set(population.members())),
+                    'surviving_children': inserted,
+                    'score_cache': cache_stats,
+                    'hypervolume': hypervolumes[-1],
+                }
+                if repair:
+                    data_output[gen]['repair'] = REPAIRS.stats(reset=True)
+                if archive is not None:
+                    data_output[gen]['archive_size'] = len(archive)
+                if convergence_window and converged(hypervolumes, convergence_window, convergence_epsilon):
+                    stop_reason = 'converged'
+                elif gen == max_generations:
+                    stop_reason = 'max_generations'
+                if stop_reason is not None:
+                    data_output[gen]['stop_reason'] = stop_reason
+                if log is not None:
+                    record = generation_record(
+                        score_matrix(pareto_frontier), [p.rank for p in population.members()],
+                        data_output[gen]['unique_parents'],
+                        time.time() - started, mutation_probability
+                    )
+                    record.update(data_output[gen])
+                    log.write(gen, **record)
+
+                mutation_probability *= mutation_degradation_rate
+                if stop_reason is not None:
+                    break
+                gen, children, inserted = gen + 1, 0, 0
+                started = time.time()
+        except KeyboardInterrupt:
+            stop_reason = 'interrupted'
+
+        if data_output:
+            stop_generation = max(data_output)
+            # an interrupted run stops mid-generation, so its log ends without a stop_reason
+            data_output[stop_generation].setdefault('stop_reason', stop_reason)
+            print("stopped at generation {} ({})".format(stop_generation, data_output[stop_generation]['stop_reason']))
+
+    return list(population.fronts[0]), data_output
@@ -0,0 +1,168 @@
+"""Batched selection and variation.
+
+A generation's worth of tournaments, crossovers and mutations at once, on arrays: candidates are rows of a 2D
+assignment array, and every operator draws its random numbers for the whole batch in one call. Random numbers come
+from numpy's global generator, which worker processes and checkpoints seed and restore.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from networkx import Graph
+from scipy.optimize import linear_sum_assignment
+
+from elbridge.evolution.contiguity import adjacency, fragment_counts, largest_fragments
+from elbridge.readers.table import get_table
+
+# crossover operators: single-point, or graph_crossover
+CROSSOVERS = ('point', 'graph')
+
+
+def tournament(ranks: np.ndarray, distances: np.ndarray, count: int, k: int = 3) -> np.ndarray:
+    """
+    Run count k-way tournaments at once and return the winners' indices. The winner of a tournament is the entrant
+    on the lowest front, then the least crowded one; entrants are drawn with replacement.
+    """
+    # position of every candidate in crowded-comparison order; lower is better
+    order = np.lexsort((-np.asarray(distances, dtype=float), np.asarray(ranks)))
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+
+    entrants = np.random.randint(len(order), size=(count, k))
+    return entrants[np.arange(count), np.argmin(position[entrants], axis=1)]
+
+
+def crossover(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Single-point crossover of two stacks of parent assignments, one split point per pair. Returns both children of
+    every pair, interleaved: pair i's children are rows 2i and 2i + 1.
+    """
+    pairs, vertex_count = first.shape
+    split_points = np.random.randint(vertex_count, size=pairs)
+    head = np.arange(vertex_count)[np.newaxis, :] < split_points[:, np.newaxis]
+
+    children = np.empty((2 * pairs, vertex_count), dtype=first.dtype)
+    children[0::2] = np.where(head, first, second)
+    children[1::2] = np.where(head, second, first)
+    return children
+
+
+def align(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Relabel every row of second so that its districts take the labels of the districts of the same row of first
+    they overlap most: a maximum-overlap matching of the two plans' labels. Districts left unmatched (when second has
+    more) get labels after first's highest.
+    """
+    aligned = np.empty(second.shape, dtype=np.int64)
+    for idx, (labels_a, labels_b) in enumerate(zip(first.astype(np.int64), second.astype(np.int64))):
+        width_a, width_b = int(labels_a.max()) + 1, int(labels_b.max()) + 1
+        overlap = np.bincount(labels_b * width_a + labels_a, minlength=width_b * width_a).reshape(width_b, width_a)
+        rows, cols = linear_sum_assignment(-overlap[1:, 1:])
+
+        mapping = np.zeros(width_b, dtype=np.int64)
+        mapping[rows + 1] = cols + 1
+        unmatched = np.setdiff1d(np.arange(1, width_b), rows + 1)
+        mapping[unmatched] = width_a + np.arange(len(unmatched))
+        aligned[idx] = mapping[labels_b]
+
+    return aligned
+
+
+def fill(graph: Graph, assignments: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """
+    Give the unassigned (0) vertices of every row of a batch the district of an assigned neighbor, a breadth-first
+    layer at a time, in place. Vertices no assigned vertex reaches take their label from fallback.
+    """
+    rows, cols = adjacency(graph)
+    sources, targets = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+
+    while True:
+        empty = assignments == 0
+        reached = empty[:, sources] & ~empty[:, targets]
+        if not np.any(reached):
+            break
+
+        batch, edges = np.nonzero(reached)
+        assignments[batch, sources[edges]] = assignments[batch, targets[edges]]
+
+    empty = assignments == 0
+    assignments[empty] = fallback[empty]
+    return assignments
+
+
+def graph_crossover(graph: Graph, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    District-inheriting crossover of two stacks of parent assignments. Each pair's districts are matched up by
+    overlap (see align), then each of the first child's districts is inherited whole from a random parent, and the
+    second child inherits each from the other parent. Where districts inherited from different parents overlap, one
+    of them (chosen at random per pair of districts) keeps the overlap. Only the largest piece of every district is
+    kept, and the remaining vertices are filled in from their neighbors, so children are contiguous wherever the
+    graph is. Returns the children interleaved, as crossover does.
+    """
+    pairs, vertex_count = first.shape
+    first = first.astype(np.int64)
+    second = align(first, second)
+    labels = int(max(first.max(), second.max())) + 1
+    rows = np.arange(pairs)[:, np.newaxis]
+
+    from_first = np.random.random_sample((pairs, labels)) < 0.5
+    first_wins = np.random.random_sample((pairs, labels, labels)) < 0.5
+
+    children = np.empty((2 * pairs, vertex_count), dtype=np.int64)
+    for offset, inherit in ((0, from_first), (1, ~from_first)):
+        claimed_a = inherit[rows, first]
+        claimed_b = ~inherit[rows, second]
+        keep_a = claimed_a & ~(claimed_b & ~first_wins[rows, first, second])
+        children[offset::2] = np.where(keep_a, first, np.where(claimed_b, second, 0))
+
+    # overlaps can cut inherited districts apart; keep only each district's largest piece, and fill in the rest
+    children[~largest_fragments(graph, children)] = 0
+    return fill(graph, children, np.repeat(first, 2, axis=0))
+
+
+def mutate(children: np.ndarray, mutation_probability: float) -> np.ndarray:
+    """
+    Mutate each child with the given probability, in place: one random vertex moves to a random district between 1
+    and the child's highest label.
+    """
+    count, vertex_count = children.shape
+    mutated = np.flatnonzero(np.random.random_sample(count) < mutation_probability)
+
+    vertices = np.random.randint(vertex_count, size=len(mutated))
+    highest = children[mutated].max(axis=1)
+    children[mutated, vertices] = 1 + (np.random.random_sample(len(mutated)) * highest).astype(children.dtype)
+    return children
+
+
+def normalize(assignments: np.ndarray) -> np.ndarray:
+    """Relabel every row's districts 1, 2, ... in order of first appearance, as Chromosome.normalize does."""
+    count, vertex_count = assignments.shape
+    rows = np.arange(count)[:, np.newaxis]
+
+    first = np.full((count, int(assignments.max()) + 1), vertex_count, dtype=np.int64)
+    np.minimum.at(first, (np.broadcast_to(rows, assignments.shape), assignments), np.arange(vertex_count))
+
+    # labels sorted by first appearance; labels a row doesn't use sort last and are never looked up
+    mapping = np.empty_like(first)
+    mapping[rows, np.argsort(first, axis=1, kind='mergesort')] = np.arange(1, first.shape[1] + 1)
+    return mapping[rows, assignments].astype(assignments.dtype)
+
+
+def component_scores(graph: Graph, assignments: np.ndarray,
+                     fragments: Optional[np.ndarray] = None) -> List[Dict[int, Dict[str, float]]]:
+    """
+    Per-district scores (see Chromosome) of every row of a batch, from one contiguity pass (unless the batch's
+    fragment counts are given) and one bincount.
+    """
+    if fragments is None:
+        fragments = fragment_counts(graph, assignments)
+    populations = get_table(graph).district_totals('pop', assignments, minlength=fragments.shape[1])
+
+    batch = []
+    for assignment, row_fragments, row_populations in zip(assignments, fragments, populations):
+        batch.append({
+            district: {'total_pop': row_populations[district].item(), 'components': int(row_fragments[district])}
+            for district in np.unique(assignment).tolist()
+        })
+
+    return batch
@@ -0,0 +1,143 @@
+"""Existing district plans.
+
+Plans come as CSV files mapping vertex names (block group GEOIDs) to districts, with or without a header; a
+chromosome's exported elements.csv (element, population, component) reads the same way. A plan must have as many
+districts as the master graph. A previous run's archive
+(a JSON Lines file, see evolution.archive) contributes its non-dominated plans, by vertex name.
+
+Vertices the master graph doesn't have are dropped, and vertices a plan leaves out join the district most of their
+neighbors are in.
+"""
+
+import csv
+import json
+from typing import Dict, List, Sequence
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.evolution.archive import read_archive, read_vertices
+from elbridge.evolution.contiguity import adjacency
+from elbridge.readers.table import get_table
+from elbridge.utilities.utils import vertex_order
+from elbridge.utilities.xceptions import PlanMismatchException, UnmatchedPlanException
+
+NAME_COLUMNS = ('GEOID', 'GEOID10', 'geoid', 'element')
+DISTRICT_COLUMNS = ('district', 'District', 'DISTRICT', 'component')
+
+
+def read_plan_csv(path: str) -> Dict[str, str]:
+    """
+    Map vertex names to district labels, as strings. A first row naming one of NAME_COLUMNS or DISTRICT_COLUMNS is
+    a header; without one, the first column holds names and the last districts.
+    """
+    with open(path, newline='') as infile:
+        rows = [row for row in csv.reader(infile) if row]
+
+    name_column, district_column = 0, -1
+    if rows and any(column.strip() in NAME_COLUMNS + DISTRICT_COLUMNS for column in rows[0]):
+        header = [column.strip() for column in rows.pop(0)]
+        name_column = next((header.index(name) for name in NAME_COLUMNS if name in header), 0)
+        district_column = next((header.index(name) for name in DISTRICT_COLUMNS if name in header), len(header) - 1)
+
+    return {row[name_column].strip(): row[district_column].strip() for row in rows}
+
+
+def fill_missing(graph: Graph, assignment: np.ndarray) -> np.ndarray:
+    """
+    Give every unassigned (0) vertex the district most of its assigned neighbors are in, spreading inward until
+    nothing changes. Vertices no assigned vertex can reach join the least populated district.
+    """
+    assignment = np.array(assignment, dtype=np.int64)
+    rows, cols = adjacency(graph)
+    sources, targets = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+    width = int(assignment.max()) + 1
+
+    while np.any(assignment == 0):
+        edges = np.flatnonzero((assignment[sources] == 0) & (assignment[targets] > 0))
+        if not len(edges):
+            break
+
+        votes = np.zeros((len(assignment), width), dtype=np.int64)
+        np.add.at(votes, (sources[edges], assignment[targets[edges]]), 1)
+        voted = np.flatnonzero(votes.any(axis=1))
+        assignment[voted] = votes[voted].argmax(axis=1)
+
+    if np.any(assignment == 0):
+        totals = get_table(graph).district_totals('pop', assignment, minlength=width)
+        assignment[assignment == 0] = 1 + int(np.argmin(totals[1:]))
+
+    return assignment
+
+
+def check_districts(graph: Graph, districts: int, path: str = '') -> None:
+    """Raise if a plan's number of districts isn't the master graph's (when the graph has one)."""
+    if graph.graph.get('districts') is not None and districts != graph.graph['districts']:
+        raise PlanMismatchException(path, districts, graph.graph['districts'], 'districts')
+
+
+def plan_assignment(graph: Graph, plan: Dict[str, str], path: str = '') -> np.ndarray:
+    """
+    An assignment array (in vertex index order) from a map of vertex names to district labels. Districts are
+    numbered 1, 2, ... in order of label. Names the graph doesn't have are ignored; vertices the plan leaves out are
+    filled in by fill_missing.
+    """
+    order = vertex_order(graph)
+    indices = {str(vertex): idx for vertex, idx in order.items()}
+    known = {name: label for name, label in plan.items() if name in indices}
+    if not known:
+        raise UnmatchedPlanException(path)
+
+    labels = {label: district for district, label in enumerate(sorted(set(known.values())), start=1)}
+    check_districts(graph, len(labels), path)
+
+    assignment = np.zeros(len(graph), dtype=np.int64)
+    for name, label in known.items():
+        assignment[indices[name]] = labels[label]
+    unknown = len(plan) - len(known)
+
+    missing = int(np.count_nonzero(assignment == 0))
+    if unknown or missing:
+        print("plan {}: ignored {} unknown vertices, filled in {} missing ones".format(path, unknown, missing))
+
+    return fill_missing(graph, assignment)
+
+
+def read_archive_plans(graph: Graph, path: str) -> List[np.ndarray]:
+    """
+    The non-dominated plans of a previous run's archive. Archives record their vertices' names, so their plans map
+    onto the graph as CSV plans do; older archives, which don't, must have been on the same vertices. Either way,
+    the run must have had as many districts.
+    """
+    with open(path) as infile:
+        records = (json.loads(line) for line in infile)
+        objective_count = len(next(record for record in records if 'scores' in record)['scores'])
+
+    vertices = read_vertices(path)
+    plans = []
+    for archived in read_archive(path, objective_count).plans():
+        assignment = np.asarray(archived.assignment, dtype=np.int64)
+        if vertices is not None:
+            if len(assignment) != len(vertices):
+                raise PlanMismatchException(path, len(assignment), len(vertices))
+            plans.append(plan_assignment(graph, dict(zip(vertices, map(str, assignment.tolist()))), path))
+            continue
+
+        if len(assignment) != len(graph):
+            raise PlanMismatchException(path, len(assignment), len(graph))
+        check_districts(graph, len(np.unique(assignment)), path)
+        plans.append(assignment)
+
+    return plans
+
+
+def read_plans(graph: Graph, paths: Sequence[str]) -> np.ndarray:
+    """Read plan files (CSV files or .jsonl archives) into a 2D array of assignments, one plan per row."""
+    plans = []
+    for path in paths:
+        if path.endswith('.jsonl'):
+            plans += read_archive_plans(graph, path)
+        else:
+            plans.append(plan_assignment(graph, read_plan_csv(path), path))
+
+    return np.array(plans, dtype=np.int64).reshape(len(plans), len(graph))
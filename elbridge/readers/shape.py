@@ -17,6 +17,7 @@ from matplotlib import pyplot as plt
 from tqdm import tqdm
 
 # utilities
+from elbridge.readers import ordering
 from elbridge.readers.plot import plot_shapes
 from elbridge.utilities.utils import cd
 
@@ -57,6 +58,15 @@ def _connect_subgraph(G: nx.Graph, a_nodes: List[int], b_nodes: List[int], same=
             G.add_edge(n_name, closest, border=0.0)
 
 
+def _read_graph(path: str) -> nx.Graph:
+    """Read a cached graph. Graphs cached before vertices were spatially ordered get ordered now."""
+    G = nx.read_gpickle(path)
+    if 'order' not in G.graph:
+        ordering.reorder(G)
+
+    return G
+
+
 def _connect_graph(G):
     _connect_subgraph(G, list(G.nodes()), list(G.nodes()), same=True)
 
@@ -104,9 +114,9 @@ def create_county_graph(county_config) -> nx.Graph:
 
     if not reload_graph:
         if os.path.exists(os.path.join(indir, infile + ".annotated_graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".annotated_graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".annotated_graph.pickle"))
         elif os.path.exists(os.path.join(indir, infile + ".graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".graph.pickle"))
 
     G = nx.Graph()
     # map English name (e.g., King County) to GEOID (e.g., 53033)
@@ -140,6 +150,9 @@ def create_county_graph(county_config) -> nx.Graph:
 
     G.graph['name_map'] = name_to_geoid
 
+    # renumber vertices so that nearby units get nearby indices
+    ordering.reorder(G)
+
     if pickle:
         nx.write_gpickle(G, os.path.join(indir, infile + ".graph.pickle"))
 
@@ -161,9 +174,9 @@ def create_block_group_graph(block_group_config) -> nx.Graph:
 
     if not reload_graph:
         if os.path.exists(os.path.join(indir, infile + ".annotated_graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".annotated_graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".annotated_graph.pickle"))
         elif os.path.exists(os.path.join(indir, infile + ".graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".graph.pickle"))
 
     G = nx.Graph()
 
@@ -187,6 +200,9 @@ def create_block_group_graph(block_group_config) -> nx.Graph:
         nx.draw_networkx(G, pos=pos)
         plt.show()
 
+    # renumber vertices so that nearby units get nearby indices
+    ordering.reorder(G)
+
     if pickle:
         nx.write_gpickle(G, os.path.join(indir, infile + ".graph.pickle"))
 
@@ -208,9 +224,9 @@ def create_block_graph(block_config, block_groups: nx.Graph) -> nx.Graph:
 
     if not reload_graph:
         if os.path.exists(os.path.join(indir, infile + ".annotated_graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".annotated_graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".annotated_graph.pickle"))
         elif os.path.exists(os.path.join(indir, infile + ".graph.pickle")):
-            return nx.read_gpickle(os.path.join(indir, infile + ".graph.pickle"))
+            return _read_graph(os.path.join(indir, infile + ".graph.pickle"))
 
     G = nx.Graph()
     # block group --> list of vertices in that block group
@@ -242,6 +258,9 @@ def create_block_graph(block_config, block_groups: nx.Graph) -> nx.Graph:
         nx.draw_networkx(G, pos=pos)
         plt.show()
 
+    # renumber vertices so that nearby units get nearby indices
+    ordering.reorder(G)
+
     if pickle:
         nx.write_gpickle(G, os.path.join(indir, infile + ".graph.pickle"))
 
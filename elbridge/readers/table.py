@@ -0,0 +1,79 @@
+"""Columnar node attribute table.
+
+Hot code shouldn't go through networkx's per-node attribute dicts. A NodeTable holds NumPy copies of the node
+attributes of a master graph, in vertex index order (see utilities.utils.vertex_order), so that per-node lookups
+are array indexing and district totals are a single bincount.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+from networkx import Graph
+
+from elbridge.utilities.utils import vertex_order
+
+PARTIES = ('DEM', 'REP')
+
+
+class NodeTable:
+    """Node attributes of a master graph as NumPy arrays."""
+
+    def __init__(self, graph: Graph):
+        self.order = vertex_order(graph)
+        vertices = sorted(self.order, key=self.order.get)
+        self._data = [graph.nodes[vertex] for vertex in vertices]
+        self._columns: Dict[str, np.ndarray] = {}
+
+        self.pop = self.column('pop')
+        self.votes = {party: self.column(party) for party in PARTIES}
+
+        shapes = [data.get('shape') for data in self._data]
+        centroids = [shape.centroid if shape is not None else None for shape in shapes]
+        self.area = np.array([shape.area if shape is not None else 0.0 for shape in shapes])
+        self.perimeter = np.array([shape.length if shape is not None else 0.0 for shape in shapes])
+        self.centroid_x = np.array([centroid.x if centroid is not None else 0.0 for centroid in centroids])
+        self.centroid_y = np.array([centroid.y if centroid is not None else 0.0 for centroid in centroids])
+
+    def __len__(self):
+        return len(self._data)
+
+    def column(self, key: str) -> np.ndarray:
+        """A numeric node attribute as an array; missing values are 0."""
+        if key not in self._columns:
+            values = [data.get(key, 0) for data in self._data]
+            dtype = np.int64 if all(isinstance(value, (int, np.integer)) for value in values) else np.float64
+            self._columns[key] = np.array(values, dtype=dtype)
+
+        return self._columns[key]
+
+    def district_totals(self, key: str, assignment: Sequence[int], minlength: int = 0) -> np.ndarray:
+        """
+        Sum an attribute over every district of an assignment, indexed by district label. For a 2D batch of
+        assignments, returns one row of totals per assignment.
+        """
+        values = self.column(key)
+        assignment = np.asarray(assignment)
+        if assignment.ndim == 1:
+            return np.bincount(assignment, weights=values, minlength=minlength).astype(values.dtype)
+
+        # offset each row's labels so the whole batch is totaled in one bincount
+        count = len(assignment)
+        width = max(minlength, int(assignment.max()) + 1 if assignment.size else 0)
+        labels = (assignment + width * np.arange(count)[:, np.newaxis]).ravel()
+        totals = np.bincount(labels, weights=np.tile(values, count), minlength=width * count)
+        return totals.reshape(count, width).astype(values.dtype)
+
+
+def attach(graph: Graph) -> NodeTable:
+    """Build a node table for a master graph and store it on the graph."""
+    graph.graph['table'] = NodeTable(graph)
+    return graph.graph['table']
+
+
+def get_table(graph: Graph) -> NodeTable:
+    """Return the node table of a master graph, (re)building it if it's missing or the vertex order changed."""
+    node_table = graph.graph.get('table')
+    if node_table is None or node_table.order is not vertex_order(graph) or len(node_table) != len(graph):
+        node_table = attach(graph)
+
+    return node_table
@@ -1,6 +1,8 @@
 # pylint: disable=invalid-name
 """Suite of runtime evaluations. Used for research purposes."""
 
+import inspect
+import os
 import random
 import time
 from collections import defaultdict
@@ -9,7 +11,11 @@ import matplotlib.pyplot as plt
 import networkx as nx
 
 from elbridge.evolution import objectives
-from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.genetics import RunOptions, run_nsga2
+from elbridge.evolution.islands import run_islands
+from elbridge.evolution.metrics import best_scores, read_metrics, time_to_target
+from elbridge.evolution.steady import run_steady_state
+from elbridge.utilities.xceptions import UnsupportedOptionsException
 
 
 def generate_grid_test(n, m, weight_names, max_weight=50):
@@ -115,20 +121,103 @@ def grid_2f(n):
     plt.cla()
 
 
+def repair_benchmark(n, districts, target, generations=50, pop_size=50, runs=3):
+    """
+    Compare seconds to reach a target B-score on n x n grid graphs, with and without fragment repair. Prints the
+    mean over runs for each; runs that never reach the target count as their full duration.
+    """
+    stamp = int(time.time())
+    seconds = defaultdict(list)
+    for run in range(runs):
+        graph, _ = generate_grid_test(n, n, ['pop'])
+        graph.graph['districts'] = districts
+        obj_fns = [objectives.PopulationEquality(graph, key='pop')]
+
+        for repair in (False, True):
+            metrics_path = 'out/repair_{}x{}_{}_{}_{}.jsonl'.format(n, n, stamp, run, int(repair))
+            random.seed(run)
+            run_nsga2(graph, obj_fns, max_generations=generations, pop_size=pop_size, multiprocess=False,
+                      optimize=False, repair=repair, metrics_path=metrics_path)
+
+            records = read_metrics(metrics_path)
+            reached = time_to_target(records, target)
+            seconds[repair].append(sum(r['seconds'] for r in records) if reached is None else reached)
+
+    for repair in (False, True):
+        print('repair={}: {:.2f}s to reach {}'.format(repair, sum(seconds[repair]) / runs, target))
+
+    return seconds
+
+
+def nsga2_options(config):
+    """Translate the 'parameters' block of a config file into run_nsga2/run_islands keyword arguments."""
+    options = dict(config)
+    for key, option in (('generations', 'max_generations'), ('population_size', 'pop_size')):
+        if key in options:
+            options[option] = options.pop(key)
+
+    return options
+
+
+def supported_options(run, options, mode):
+    """Return options if run takes all of them; otherwise raise, naming the ones it doesn't."""
+    unsupported = sorted(set(options) - set(inspect.signature(run).parameters))
+    if unsupported:
+        raise UnsupportedOptionsException(mode, unsupported)
+
+    return options
+
+
+def log_paths(filename, options):
+    """
+    The metrics and archive paths of a run. A checkpointed run's sit next to its checkpoint, so that a resumed run
+    keeps appending to the logs of the run it continues; a fresh one starts them over, as it does the checkpoint.
+    """
+    checkpoint_path = options.get('checkpoint_path')
+    if not checkpoint_path:
+        return 'out/' + filename + '.jsonl', 'out/' + filename + '.archive.jsonl'
+
+    stem = os.path.splitext(checkpoint_path)[0]
+    paths = (stem + '.jsonl', stem + '.archive.jsonl')
+    if not (options.get('resume') and os.path.exists(checkpoint_path)):
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    return paths
+
+
 def evaluate_graph(graph, name, short_name, config):
     obj_fns = [objectives.PopulationEquality(graph, key='pop')]
     stamp = int(time.time())
     filename = '{}_{}'.format(short_name, stamp)
     title = 'Best $B$-Values in {}'.format(name)
 
-    final_frontier, data = run_nsga2(graph, obj_fns, **config)
-
-    fronts = data.get('pareto_per_gen', [])
-    gen_scores = []
-    for front in fronts:
-        elem = front[0]
-        gen_scores.append(elem.scores)
-    plt.plot(gen_scores, 'r-', label='w/ optimization')
+    options = nsga2_options(config)
+    islands = options.pop('islands', 0)
+    steady_state = options.pop('steady_state', False)
+    metrics_path, archive_path = log_paths(filename, options)
+    if islands:
+        # every island is a process of its own
+        options.pop('multiprocess', None)
+        final_frontier, _ = run_islands(
+            graph, obj_fns, islands=islands, **supported_options(run_islands, options, 'island')
+        )
+    elif steady_state:
+        options.pop('multiprocess', None)
+        final_frontier, _ = run_steady_state(
+            graph, obj_fns, metrics_path=metrics_path, archive_path=archive_path,
+            **supported_options(run_steady_state, options, 'steady state')
+        )
+    else:
+        final_frontier, _ = run_nsga2(
+            graph, obj_fns, metrics_path=metrics_path, archive_path=archive_path,
+            **supported_options(RunOptions, options, 'generational')
+        )
+
+    if not islands:
+        records = read_metrics(metrics_path)
+        plt.plot([record['generation'] for record in records], best_scores(records), 'r-', label='w/ optimization')
 
     final_frontier[0].plot(save=True)
 
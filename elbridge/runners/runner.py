@@ -1,6 +1,6 @@
 import networkx as nx
 
-from elbridge.readers import shape, annotater
+from elbridge.readers import shape, annotater, table
 from elbridge.runners import evaluation
 from elbridge.utilities.utils import cd
 
@@ -20,7 +20,9 @@ def create_graphs(data_dir, configs, districts):
 
         print("Finished reading in all graphs. Leaving data directory.")
 
-    county_graph['graph']['districts'] = block_group_graph['graph']['districts'] = districts
+    county_graph.graph['districts'] = block_group_graph.graph['districts'] = districts
+    table.attach(county_graph)
+    table.attach(block_group_graph)
 
     return nx.freeze(county_graph), nx.freeze(block_group_graph)
 
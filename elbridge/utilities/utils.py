@@ -1,7 +1,7 @@
 """Various utility classes and methods."""
 import os
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Set
 
 from networkx import Graph
 
@@ -27,6 +27,17 @@ class cd:
         os.chdir(self.saved_path)
 
 
+def vertex_order(graph: Graph) -> Dict[Node, int]:
+    """
+    Return the order of a master graph's vertices, creating it if necessary.
+    order[i] = j implies that vertex i is located at index j in vertex_set.
+    """
+    if 'order' not in graph.graph:
+        graph.graph['order'] = {vertex: idx for idx, vertex in enumerate(graph)}
+
+    return graph.graph['order']
+
+
 def dominates(a_scores: List[float], b_scores: List[float]) -> float:
     as_good = True
     better = False
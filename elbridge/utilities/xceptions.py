@@ -23,3 +23,37 @@ class SameComponentException(Exception):
 class IncompleteHypotheticalsException(Exception):
     def __init__(self, edge):
         super().__init__("Edge {} not in hypotheticals set for graph".format(edge))
+
+
+class UnknownOptionException(Exception):
+    def __init__(self, option, value, choices):
+        super().__init__("Unknown {} {} (expected one of {})".format(option, value, ", ".join(map(str, choices))))
+
+
+class IslandFailedException(Exception):
+    def __init__(self, islands):
+        super().__init__("Island(s) {} exited without returning a frontier".format(islands))
+
+
+class CheckpointMismatchException(Exception):
+    def __init__(self, checkpoint_vertices, graph_vertices):
+        super().__init__("Checkpoint has plans over {} vertices, but the master graph has {}".format(
+            checkpoint_vertices, graph_vertices
+        ))
+
+
+class PlanMismatchException(Exception):
+    def __init__(self, path, plan_count, graph_count, counted='vertices'):
+        super().__init__("Plan file {} has plans of {} {}, but the master graph has {}".format(
+            path, plan_count, counted, graph_count
+        ))
+
+
+class UnmatchedPlanException(Exception):
+    def __init__(self, path):
+        super().__init__("Plan file {} assigns none of the master graph's vertices".format(path))
+
+
+class UnsupportedOptionsException(Exception):
+    def __init__(self, mode, options):
+        super().__init__("Option(s) {} are not supported in {} mode".format(", ".join(options), mode))
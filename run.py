@@ -7,6 +7,12 @@ from datetime import datetime
 
 from elbridge.runners.runner import evaluate
 
+DEFAULT_PARAMETERS = {
+    "mutation_probability": 0.7,
+    "generations": 500,
+    "population_size": 300
+}
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Generate an optimal gerrymander.")
@@ -19,20 +25,37 @@ def parse_arguments():
     parser.add_argument(
         '--reload-only', dest='reload_only', action='store_true', default=False,
         help="Reload graphs only. Don't run evolution.")
+    parser.add_argument(
+        '--resume', dest='resume', action='store_true', default=False,
+        help="Continue evolution from the last checkpoint, if there is one.")
+    parser.add_argument(
+        '--time-budget', dest='time_budget', type=float, default=None,
+        help="Stop evolution after this many seconds, keeping the best frontier so far.")
+    parser.add_argument(
+        '--warm-start', dest='warm_start', nargs='+', default=None, metavar='PLAN',
+        help=("Seed part of the initial population with existing plans and perturbed copies of them: GEOID,district "
+              "CSV files or .jsonl archives of earlier runs."))
 
     args = parser.parse_args()
     with open(args.config_file) as config_file:
         config = json.load(config_file)
 
+    # every run checkpoints, so that a preempted job can be resumed (island and steady-state runs can't)
+    parameters = config.setdefault("parameters", dict(DEFAULT_PARAMETERS))
+    if not parameters.get("islands") and not parameters.get("steady_state"):
+        parameters.setdefault("checkpoint_path", "out/checkpoint.npz")
+    if args.resume:
+        parameters["resume"] = True
+    if args.time_budget is not None:
+        parameters["time_budget"] = args.time_budget
+    if args.warm_start:
+        parameters["warm_start"] = args.warm_start
+
     return config, args.reload_only
 
 
 def get_config_dicts(config):
-    parameter_configuration = config.get("parameters", {
-        "mutation_probability": 0.7,
-        "generations": 500,
-        "population_size": 300
-    })
+    parameter_configuration = config.get("parameters", DEFAULT_PARAMETERS)
 
     block_group_configuration = config.get("block_groups", {
         "directory": "wa-block-groups",
@@ -0,0 +1,98 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.archive import ParetoArchive, read_archive, write_plans
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.metrics import MetricsLog
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.evolution.sorting import non_dominated_ranks
+
+
+def non_dominated(points):
+    points = np.unique(np.asarray(points, dtype=float), axis=0)
+    return sorted(map(tuple, points[non_dominated_ranks(points) == 0].tolist()))
+
+
+class ParetoArchiveTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'archive.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_non_dominated(self):
+        for objectives in (1, 2, 3):
+            archive = ParetoArchive(objectives)
+            points = np.random.randint(0, 20, size=(300, objectives))
+            for fingerprint, point in enumerate(points):
+                archive.add(fingerprint, point, [fingerprint])
+
+            self.assertEqual(sorted(set(map(tuple, archive.scores().tolist()))), non_dominated(points))
+
+    def test_duplicates(self):
+        archive = ParetoArchive(2)
+        self.assertIsNotNone(archive.add(1, [1, 2], [1, 1]))
+        self.assertIsNone(archive.add(1, [1, 2], [1, 1]))
+        # a different plan with the same scores is kept too
+        self.assertIsNotNone(archive.add(2, [1, 2], [1, 2]))
+        self.assertIsNone(archive.add(3, [0, 2], [2, 1]))
+        self.assertEqual(len(archive), 2)
+
+        archive.add(4, [2, 2], [2, 2])
+        self.assertEqual([plan.fingerprint for plan in archive.plans()], [4])
+        self.assertNotIn(1, archive)
+
+    def test_max_size(self):
+        archive = ParetoArchive(2, max_size=3)
+        for fingerprint, x in enumerate([0, 1, 2, 3, 10]):
+            archive.add(fingerprint, [x, 10 - x], [x])
+
+        self.assertEqual(len(archive), 3)
+        # the extremes are kept; 1 goes first (tied with 2), then 2, which 10 leaves more crowded than 3
+        self.assertEqual([plan.scores for plan in archive.plans()], [(0.0, 10.0), (3.0, 7.0), (10.0, 0.0)])
+
+        archive.add(5, [1, 9], [5])
+        self.assertEqual(len(archive), 3)
+
+    def test_read_archive(self):
+        archive = ParetoArchive(2, max_size=4)
+        points = np.random.randint(0, 20, size=(100, 2))
+        with MetricsLog(self.path) as log:
+            for fingerprint, point in enumerate(points):
+                plan = archive.add(fingerprint, point, [fingerprint, 1])
+                write_plans(log, fingerprint, [plan] if plan else [])
+        with open(self.path, 'a') as outfile:
+            outfile.write('{"fingerprint": 100, "sco')
+
+        rebuilt = read_archive(self.path, 2, max_size=4)
+        self.assertEqual(
+            [(p.fingerprint, p.scores, p.assignment.tolist()) for p in rebuilt.plans()],
+            [(p.fingerprint, p.scores, p.assignment.tolist()) for p in archive.plans()]
+        )
+
+    def test_run(self):
+        master_graph = nx.grid_graph([4, 4])
+        master_graph.graph['districts'] = 2
+        nx.set_node_attributes(master_graph, {i: 1 + i[0] for i in master_graph}, name='pop')
+        nx.set_node_attributes(master_graph, {i: 1 + i[1] for i in master_graph}, name='area')
+        objectives = [PopulationEquality(master_graph), PopulationEquality(master_graph, key='area')]
+        Chromosome.objectives = objectives
+
+        frontier, data = run_nsga2(
+            master_graph, objectives, max_generations=5, pop_size=8, multiprocess=False, optimize=False,
+            archive_path=self.path
+        )
+
+        archive = read_archive(self.path, 2)
+        self.assertEqual(data[5]['archive_size'], len(archive))
+        for candidate in archive.candidates(master_graph):
+            self.assertFalse(any(p.dominates(candidate) for p in frontier))
+        for candidate in frontier:
+            self.assertFalse(any(p.dominates(candidate) for p in archive.candidates(master_graph)))
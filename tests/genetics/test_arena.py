@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import genetics
+from elbridge.evolution.arena import PopulationArena
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.engine import process_context
+from elbridge.evolution.objectives import PopulationEquality
+
+
+def _read_row(arena, row, stored, results):
+    stored.wait(timeout=10)
+    results.put(arena.assignments[row].tolist())
+
+
+class PopulationArenaTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([4, 4])
+        self.master_graph.graph['districts'] = 2
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+        self.population = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(6)]
+        self.arena = PopulationArena(len(self.master_graph), 6, 1)
+
+    def test_store_makes_views(self):
+        assignments = [p.chromosome.get_assignment() for p in self.population]
+        self.arena.store(self.population)
+
+        self.assertEqual(self.arena.parents().tolist(), assignments)
+        self.assertEqual(self.arena.scores[:6, 0].tolist(), [p.chromosome.get_scores()[0] for p in self.population])
+        for row, candidate in enumerate(self.population):
+            self.assertEqual(candidate.row, row)
+            self.assertTrue(np.shares_memory(candidate.chromosome.assignment_array(), self.arena.assignments))
+            self.assertEqual(candidate.chromosome.get_assignment(), assignments[row])
+
+        # storing a permutation gathers rows before writing them
+        self.arena.store(self.population[::-1])
+        self.assertEqual(self.arena.parents().tolist(), assignments[::-1])
+        self.assertEqual([p.chromosome.get_assignment() for p in self.population], assignments)
+
+    def test_views_behave_like_lists(self):
+        self.arena.store(self.population)
+        view = self.population[0].chromosome
+        copy = Chromosome(self.master_graph, view.get_assignment())
+
+        edge = next(iter(view.get_hypotheticals().edges))
+        self.assertEqual(view.connect_vertices(edge), copy.connect_vertices(edge))
+        self.assertEqual(view.connect_vertices(edge).get_scores(), copy.connect_vertices(edge).get_scores())
+        self.assertEqual(view.get_components(), copy.get_components())
+
+    def test_generation(self):
+        self.arena.store(self.population)
+        genetics.fast_non_dominated_sort(self.population)
+
+        children = genetics.make_children(self.population, 0.5, self.arena)
+        self.assertEqual([child.row for child in children], list(range(6, 12)))
+
+        parents, frontier = genetics.evaluate_generation(self.population, children, self.arena)
+        self.assertEqual([p.row for p in parents], list(range(6)))
+        for candidate in parents + frontier:
+            fresh = Chromosome(self.master_graph, candidate.chromosome.get_assignment()[:])
+            self.assertEqual(fresh, candidate.chromosome)
+            self.assertEqual(fresh.get_scores(), candidate.chromosome.get_scores())
+
+    def test_shared(self):
+        arena = PopulationArena(len(self.master_graph), 6, 1, shared=True)
+        context = process_context()
+        results = context.Queue()
+
+        stored = context.Event()
+
+        # the worker starts before the population is stored, so it can only see it through shared memory
+        process = context.Process(target=_read_row, args=(arena, 3, stored, results))
+        process.start()
+        arena.store(self.population)
+        stored.set()
+
+        self.assertEqual(results.get(timeout=10), self.population[3].chromosome.get_assignment())
+        process.join()
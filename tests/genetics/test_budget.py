@@ -0,0 +1,72 @@
+import os
+import signal
+import time
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import search
+from elbridge.evolution.budget import Budget, stop_on_signals
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class BudgetTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([6, 6])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: int(np.random.randint(1, 10)) for i in self.master_graph},
+                               name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+    def test_budget(self):
+        budget = Budget()
+        self.assertEqual(budget.remaining(), float('inf'))
+        self.assertIsNone(budget.should_stop(1e9))
+        budget.record_search(1.0, 10, 10)
+        self.assertEqual(budget.steps(20, 10), 20)
+
+        budget = Budget(10)
+        with budget.phase('breeding'):
+            pass
+        self.assertIn('breeding', budget.stats()['phases'])
+        self.assertEqual(budget.steps(20, 10), 20)
+        # a step on a child takes a second: ten children can afford one step in the ten seconds left
+        budget.record_search(100.0, 10, 10)
+        self.assertEqual(budget.steps(20, 10), 1)
+        budget.record_search(0.01, 10, 10)
+        self.assertEqual(budget.steps(20, 10), 20)
+
+        self.assertIsNone(budget.should_stop(1))
+        self.assertEqual(budget.should_stop(60), 'time_budget')
+
+    def test_signals(self):
+        budget = Budget()
+        previous = signal.getsignal(signal.SIGTERM)
+        with stop_on_signals(budget):
+            os.kill(os.getpid(), signal.SIGTERM)
+            self.assertEqual(budget.stop_reason, 'terminated')
+            with self.assertRaises(KeyboardInterrupt):
+                os.kill(os.getpid(), signal.SIGINT)
+        self.assertIs(signal.getsignal(signal.SIGTERM), previous)
+
+    def test_deadline(self):
+        chromosome = Chromosome.generate(self.master_graph)
+        self.assertIs(search.optimize(chromosome, multiprocess=False, deadline=time.time() - 1), chromosome)
+
+    def test_run(self):
+        started = time.time()
+        _, data = run_nsga2(
+            self.master_graph, Chromosome.objectives, max_generations=100000, pop_size=6, multiprocess=False,
+            optimization_interval=2, time_budget=1.0
+        )
+        self.assertLess(time.time() - started, 3.0)
+
+        stop_generation = max(data)
+        self.assertEqual(data[stop_generation]['stop_reason'], 'time_budget')
+        self.assertEqual(set(data[stop_generation]['budget']['phases']),
+                         {'seeding', 'breeding', 'search', 'selection', 'bookkeeping'})
+        self.assertIn('budget', data[1])
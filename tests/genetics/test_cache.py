@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+import networkx as nx
+
+from elbridge.evolution.cache import SCORE_CACHE, CachedScores, ScoreCache
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class ScoreCacheTest(TestCase):
+    def test_lru_eviction(self):
+        entry = CachedScores((0.0,), {1: {'total_pop': 1, 'components': 1}})
+        cache = ScoreCache()
+        cache.put([], 0, entry)
+        cache.resize(2 * cache.stats()['bytes'])
+
+        cache.put([], 1, entry)
+        cache.get([], 0)
+        cache.put([], 2, entry)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get([], 0))
+        self.assertIsNone(cache.get([], 1))
+        self.assertEqual(cache.stats(reset=True), {'hits': 2, 'misses': 1, 'entries': 2,
+                                                   'bytes': cache.stats()['bytes']})
+        self.assertEqual(cache.stats()['hits'], 0)
+
+    def test_new_objectives_invalidate(self):
+        cache = ScoreCache()
+        cache.put([1], 0, CachedScores((0.0,), {}))
+        self.assertIsNone(cache.get([2], 0))
+
+
+class ChromosomeCacheTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.path_graph(6)
+        self.master_graph.graph['districts'] = 2
+        nx.set_node_attributes(self.master_graph, {i: i for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+        SCORE_CACHE.clear()
+
+    def test_relabeled_plan_hits(self):
+        chromosome = Chromosome(self.master_graph, [1, 1, 1, 2, 2, 2])
+        SCORE_CACHE.stats(reset=True)
+
+        relabeled = Chromosome(self.master_graph, [2, 2, 2, 1, 1, 1])
+        self.assertEqual(SCORE_CACHE.stats()['hits'], 1)
+        self.assertEqual(relabeled.get_scores(), chromosome.get_scores())
+        self.assertEqual(relabeled.get_component_scores(), {
+            2: {'total_pop': 3, 'components': 1},
+            1: {'total_pop': 12, 'components': 1},
+        })
+
+    def test_mutate_rescores(self):
+        chromosome = Chromosome(self.master_graph, [1, 1, 1, 2, 2, 2])
+        for _ in range(10):
+            chromosome.mutate()
+            fresh = Chromosome(self.master_graph, chromosome.get_assignment()[:])
+            self.assertEqual(chromosome.get_scores(), fresh.get_scores())
+
+    def test_connect_vertices_rescores(self):
+        # moving vertex 1 joins both pieces of district 1
+        neighbor = Chromosome(self.master_graph, [1, 2, 1, 2, 2, 2]).connect_vertices((0, 1))
+        cached = Chromosome(self.master_graph, [1, 1, 1, 2, 2, 2])
+        SCORE_CACHE.clear()
+        fresh = Chromosome(self.master_graph, [1, 1, 1, 2, 2, 2])
+
+        self.assertEqual(neighbor.get_scores(), fresh.get_scores())
+        self.assertEqual(cached.get_scores(), fresh.get_scores())
+        self.assertEqual(neighbor.get_component_scores(), fresh.get_component_scores())
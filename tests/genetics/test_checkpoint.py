@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.checkpoint import capture, load_checkpoint, restore, save_checkpoint
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.memetic import MemeticScheduler
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.utilities.xceptions import CheckpointMismatchException
+
+
+class CheckpointTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([5, 5])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        self.objectives = [PopulationEquality(self.master_graph)]
+        Chromosome.objectives = self.objectives
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'checkpoint.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_seeded(self, max_generations, **kwargs):
+        frontier, self.data = run_nsga2(
+            self.master_graph, self.objectives, max_generations=max_generations, pop_size=6, multiprocess=False,
+            optimization_interval=2, checkpoint_path=self.path, **kwargs
+        )
+        return sorted((p.chromosome.get_assignment(), p.chromosome.get_scores()) for p in frontier)
+
+    def run_interrupted(self, max_generations, interrupted_at, **kwargs):
+        """Run, and run again from the checkpoint of an earlier run that stopped at interrupted_at."""
+        random.seed(0)
+        np.random.seed(0)
+        self.run_seeded(interrupted_at, **kwargs)
+        self.assertEqual(load_checkpoint(self.path).generation, interrupted_at)
+
+        # anything the interrupted process did after its last checkpoint must not matter
+        random.seed(1)
+        np.random.seed(1)
+        return self.run_seeded(max_generations, resume=True, **kwargs)
+
+    def test_round_trip(self):
+        parents = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(4)]
+        for rank, parent in enumerate(parents):
+            parent.rank, parent.distance = rank + 1, float(rank)
+        random.gauss(0, 1)
+        np.random.normal()
+
+        save_checkpoint(self.path, capture(parents, 7, 0.25))
+        self.assertEqual(os.listdir(self.directory.name), ['checkpoint.npz'])
+
+        expected = (random.random(), np.random.random())
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.generation, 7)
+        self.assertEqual(checkpoint.mutation_probability, 0.25)
+
+        restored = restore(self.master_graph, checkpoint)
+        self.assertEqual((random.random(), np.random.random()), expected)
+        self.assertEqual([p.chromosome for p in restored], [p.chromosome for p in parents])
+        self.assertEqual([(p.rank, p.distance) for p in restored], [(p.rank, p.distance) for p in parents])
+
+    def test_wrong_graph(self):
+        parents = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(2)]
+        save_checkpoint(self.path, capture(parents, 1, 0.5))
+
+        with self.assertRaises(CheckpointMismatchException):
+            restore(nx.grid_graph([4, 4]), load_checkpoint(self.path))
+
+    def test_resume(self):
+        random.seed(0)
+        np.random.seed(0)
+        uninterrupted = self.run_seeded(6)
+        self.assertEqual(self.run_interrupted(6, 3), uninterrupted)
+
+    def test_resume_uneven(self):
+        # hill-climbing every other generation, over districts of different populations
+        nx.set_node_attributes(self.master_graph, {(i, j): 1 + i * j for i, j in self.master_graph}, name='pop')
+        self.objectives = [PopulationEquality(self.master_graph)]
+        Chromosome.objectives = self.objectives
+
+        random.seed(0)
+        np.random.seed(0)
+        uninterrupted = self.run_seeded(6)
+        self.assertEqual(self.run_interrupted(6, 3), uninterrupted)
+
+    def test_resume_converged(self):
+        # with an epsilon this large, a run converges as soon as its window is full
+        options = {'convergence_window': 3, 'convergence_epsilon': 1.0}
+        random.seed(0)
+        np.random.seed(0)
+        uninterrupted = self.run_seeded(12, **options)
+        self.assertEqual(max(self.data), 4)
+
+        self.assertEqual(self.run_interrupted(12, 3, **options), uninterrupted)
+        self.assertEqual(self.data[4]['stop_reason'], 'converged')
+
+    def test_resume_adaptive(self):
+        self.run_seeded(3, adaptive_memetic=True)
+        state = load_checkpoint(self.path).scheduler_state
+        self.assertEqual(sorted(state), sorted(MemeticScheduler.STATE))
+        self.assertEqual(len(load_checkpoint(self.path).hypervolumes), 3)
+
+        # the scheduler picks up where it left off, with the hypervolume history it learns from
+        self.run_seeded(4, adaptive_memetic=True, resume=True)
+        self.assertIn('memetic', self.data[4])
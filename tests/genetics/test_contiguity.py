@@ -0,0 +1,66 @@
+import random
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.contiguity import district_fragments, fragment_counts, largest_fragments, neighbor_lists
+from elbridge.utilities.utils import number_connected_components, vertex_order
+
+
+class ContiguityTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([6, 6])
+
+    def _expected(self, assignment):
+        order = vertex_order(self.master_graph)
+        counts = [0] * (max(assignment) + 1)
+        for district in set(assignment):
+            component = {vertex for vertex in self.master_graph if assignment[order[vertex]] == district}
+            counts[district] = number_connected_components(self.master_graph, component)
+
+        return counts
+
+    def test_path_graph(self):
+        graph = nx.path_graph(6)
+        self.assertEqual(fragment_counts(graph, [1, 1, 2, 1, 2, 2]).tolist(), [0, 2, 2])
+        self.assertEqual(fragment_counts(graph, [1, 1, 1, 1, 1, 1]).tolist(), [0, 1])
+
+    def test_neighbor_lists(self):
+        order = vertex_order(self.master_graph)
+        indptr, indices = neighbor_lists(self.master_graph)
+        for vertex, idx in order.items():
+            self.assertEqual(sorted(indices[indptr[idx]:indptr[idx + 1]].tolist()),
+                             sorted(order[neighbor] for neighbor in self.master_graph[vertex]))
+
+    def test_single_district(self):
+        for _ in range(10):
+            assignment = [random.randint(1, 4) for _ in self.master_graph]
+            expected = self._expected(assignment)
+            for district in set(assignment):
+                self.assertEqual(district_fragments(self.master_graph, assignment, district), expected[district])
+
+    def test_matches_traversal(self):
+        for _ in range(10):
+            assignment = [random.randint(1, 4) for _ in self.master_graph]
+            self.assertEqual(fragment_counts(self.master_graph, assignment).tolist(), self._expected(assignment))
+
+    def test_batch(self):
+        batch = np.random.randint(1, 4, size=(5, len(self.master_graph)))
+        batch[:, 0] = 3
+        counts = fragment_counts(self.master_graph, batch)
+
+        self.assertEqual(counts.shape, (5, 4))
+        for row, assignment in zip(counts, batch):
+            self.assertEqual(row.tolist(), self._expected(assignment.tolist()))
+
+    def test_largest_fragments(self):
+        graph = nx.path_graph(7)
+        self.assertEqual(largest_fragments(graph, [1, 1, 2, 1, 1, 1, 2]).tolist(),
+                         [False, False, True, True, True, True, False])
+
+        batch = np.random.randint(1, 4, size=(5, len(self.master_graph)))
+        kept = largest_fragments(self.master_graph, batch)
+        self.assertEqual(kept.shape, batch.shape)
+        # exactly one fragment of every district is kept
+        self.assertTrue(np.all(fragment_counts(self.master_graph, np.where(kept, batch, 0))[:, 1:] == 1))
@@ -0,0 +1,77 @@
+import random
+import signal
+from unittest import TestCase
+
+import networkx as nx
+
+from elbridge.evolution import genetics
+from elbridge.evolution.budget import Budget, stop_on_signals
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.engine import ProcessEngine
+from elbridge.evolution.objectives import PopulationEquality
+
+
+def _signal_handlers(_):
+    return signal.getsignal(signal.SIGINT) == signal.SIG_IGN, signal.getsignal(signal.SIGTERM) == signal.SIG_DFL
+
+
+class ProcessEngineTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([6, 6])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        self.objectives = [PopulationEquality(self.master_graph)]
+        Chromosome.objectives = self.objectives
+
+        self.parents = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(8)]
+        for rank, parent in enumerate(self.parents):
+            parent.rank = rank
+
+    def test_children_are_scored(self):
+        pairs = genetics.select_pairs(self.parents)
+        with ProcessEngine(self.master_graph, self.objectives, processes=2) as engine:
+            children = engine.make_children(pairs, 0.5, optimize=True)
+
+        self.assertEqual(len(children), len(self.parents))
+        for child in children:
+            fresh = Chromosome(self.master_graph, child.chromosome.get_assignment()[:])
+            self.assertEqual(child.chromosome.get_scores(), fresh.get_scores())
+            self.assertEqual(child.chromosome.get_component_scores(), fresh.get_component_scores())
+
+    def test_deterministic(self):
+        pairs = genetics.select_pairs(self.parents)
+        children = []
+        for processes in (1, 3):
+            random.seed(0)
+            with ProcessEngine(self.master_graph, self.objectives, processes=processes) as engine:
+                children.append([c.chromosome.get_assignment() for c in engine.make_children(pairs, 1.0)])
+
+        self.assertEqual(children[0], children[1])
+
+    def test_graph_crossover(self):
+        pairs = genetics.select_pairs(self.parents)
+        children = []
+        for processes in (1, 2):
+            random.seed(0)
+            with ProcessEngine(self.master_graph, self.objectives, processes=processes, crossover='graph') as engine:
+                children.append([c.chromosome.get_assignment() for c in engine.make_children(pairs, 0.0)])
+
+        self.assertEqual(children[0], children[1])
+        self.assertEqual(len(children[0]), len(self.parents))
+
+    def test_optimize_children(self):
+        with ProcessEngine(self.master_graph, self.objectives, processes=2) as engine:
+            optimized = engine.optimize_children(self.parents, steps=5, sample_size=10)
+
+        self.assertEqual(len(optimized), len(self.parents))
+        for parent, child in zip(self.parents, optimized):
+            self.assertFalse(parent.dominates(child))
+
+    def test_worker_signals(self):
+        # the run's stop handlers are set before the engine forks, but the workers don't keep them
+        with stop_on_signals(Budget()):
+            with ProcessEngine(self.master_graph, self.objectives, processes=2) as engine:
+                handlers = engine.map(_signal_handlers, [0, 1])
+
+        self.assertEqual(handlers, [(True, True)] * 2)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import networkx as nx
+
+from elbridge.evolution import fingerprint
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class FingerprintTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([4, 4])
+        self.master_graph.graph['districts'] = 2
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+    def test_invariant_to_relabeling(self):
+        chromosome = Chromosome(self.master_graph, [2] * 8 + [1] * 8)
+        relabeled = Chromosome(self.master_graph, [1] * 8 + [2] * 8)
+        self.assertEqual(chromosome.get_fingerprint(), relabeled.get_fingerprint())
+
+        fp = chromosome.get_fingerprint()
+        chromosome.normalize()
+        self.assertEqual(chromosome.get_assignment(), [1] * 8 + [2] * 8)
+        self.assertEqual(chromosome.get_fingerprint(), fp)
+        self.assertEqual(chromosome, relabeled)
+        self.assertEqual(len({chromosome, relabeled}), 1)
+
+    def test_distinguishes_plans(self):
+        chromosome = Chromosome(self.master_graph, [1] * 8 + [2] * 8)
+        other = Chromosome(self.master_graph, [1] * 7 + [2] * 9)
+        self.assertNotEqual(chromosome, other)
+
+    def test_incremental_matches_full_pass(self):
+        chromosome = Chromosome(self.master_graph, [1] * 8 + [2] * 8)
+        moved = chromosome.connect_vertices(((1, 1), (2, 1)))
+
+        rebuilt = Chromosome(self.master_graph, moved.get_assignment()[:])
+        self.assertEqual(moved.get_fingerprint(), rebuilt.get_fingerprint())
+
+        for _ in range(20):
+            moved.mutate()
+            rebuilt = Chromosome(self.master_graph, moved.get_assignment()[:])
+            self.assertEqual(moved.get_fingerprint(), rebuilt.get_fingerprint())
+
+    def test_emptied_district_drops_out(self):
+        hashes = fingerprint.district_hashes(self.master_graph, [1] + [2] * 15)
+        key = int(fingerprint.vertex_keys(self.master_graph)[0])
+
+        new_hashes, new_fingerprint = fingerprint.move_vertex(
+            hashes, fingerprint.fingerprint(hashes), key, 1, 2
+        )
+        self.assertEqual(list(new_hashes), [2])
+        self.assertEqual(new_fingerprint, fingerprint.fingerprint(
+            fingerprint.district_hashes(self.master_graph, [2] * 16)
+        ))
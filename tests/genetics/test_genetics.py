@@ -1,4 +1,6 @@
+import os
 import random
+import tempfile
 from unittest import TestCase
 
 import networkx as nx
@@ -7,6 +9,7 @@ from shapely.geometry import box
 from elbridge.evolution import genetics
 from elbridge.evolution.candidate import Candidate
 from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.metrics import read_metrics
 from elbridge.evolution.objectives import PopulationEquality
 
 
@@ -57,17 +60,21 @@ class GeneticsLoadTest(TestCase):
         nx.set_node_attributes(master_graph, {i: 1 for i in master_graph}, name='pop')
         nx.set_node_attributes(master_graph, {(i, j): box(i, j, i+1, j+1) for (i, j) in master_graph}, name='shape')
 
-        frontier, data = genetics.run_nsga2(
-            master_graph, [PopulationEquality(master_graph)], multiprocess=True, max_generations=100, pop_size=500,
-            optimize=True
-        )
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_path = os.path.join(directory, 'metrics.jsonl')
+            frontier, _ = genetics.run_nsga2(
+                master_graph, [PopulationEquality(master_graph)], multiprocess=True, max_generations=100,
+                pop_size=500, optimize=True, metrics_path=metrics_path
+            )
+            records = read_metrics(metrics_path)
 
-        for gen_id in data:
-            if gen_id % 20 != 0:
-                continue
-            gen_data = data[gen_id]
-            random_pareto: Candidate = random.choice(gen_data.get('pareto_frontier'))
-            random_pareto.plot(save=True)
-            random_pareto.export()
+        self.assertEqual([record['generation'] for record in records], list(range(1, 101)))
+        for record in records:
+            if record['generation'] % 20 == 0:
+                print("generation {}: best {}".format(record['generation'], max(record['frontier'])))
+
+        random_pareto: Candidate = random.choice(frontier)
+        random_pareto.plot(save=True)
+        random_pareto.export()
 
         print("\n".join("{}".format(i.chromosome.get_component_scores()) for i in frontier))
@@ -0,0 +1,61 @@
+import itertools
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.hypervolume import converged, hypervolume
+from elbridge.evolution.objectives import PopulationEquality
+
+
+def dominated_cells(points: np.ndarray, size: int) -> int:
+    """Count the unit cells of a size^M grid dominated by integer points."""
+    count = 0
+    for cell in itertools.product(range(size), repeat=points.shape[1]):
+        if np.any(np.all(points >= np.array(cell) + 1, axis=1)):
+            count += 1
+    return count
+
+
+class HypervolumeTest(TestCase):
+    def test_two_objectives(self):
+        scores = np.array([[1, 3], [2, 2], [3, 1], [1, 1]])
+        self.assertAlmostEqual(hypervolume(scores, [0, 0], [4, 4]), 6 / 16)
+
+    def test_normalization(self):
+        scores = np.array([[-5, 10], [0, 5]])
+        # clipped to [-10, 0] x [0, 10]
+        self.assertAlmostEqual(hypervolume(scores, [-10, 0], [0, 10]), 0.5 * 1 + 0.5 * 0.5)
+        self.assertEqual(hypervolume(np.array([[-20, -20]]), [-10, 0], [0, 10]), 0)
+        self.assertEqual(hypervolume(np.zeros((0, 2)), [0, 0], [1, 1]), 0)
+
+    def test_matches_grid(self):
+        np.random.seed(0)
+        for objectives in (1, 2, 3, 4):
+            points = np.random.randint(0, 6, size=(8, objectives))
+            expected = dominated_cells(points, 6) / 6 ** objectives
+            self.assertAlmostEqual(hypervolume(points, [0] * objectives, [6] * objectives), expected)
+
+    def test_converged(self):
+        self.assertFalse(converged([0.1, 0.1], 2, 1e-3))
+        self.assertTrue(converged([0.1, 0.1, 0.1], 2, 1e-3))
+        self.assertFalse(converged([0.1, 0.1, 0.2], 2, 1e-3))
+        self.assertFalse(converged([0, 0, 0], 2, 1e-3))
+
+    def test_early_stopping(self):
+        master_graph = nx.grid_graph([4, 4])
+        master_graph.graph['districts'] = 2
+        nx.set_node_attributes(master_graph, {i: 1 for i in master_graph}, name='pop')
+        objectives = [PopulationEquality(master_graph)]
+        Chromosome.objectives = objectives
+
+        _, data = run_nsga2(
+            master_graph, objectives, max_generations=200, pop_size=6, multiprocess=False, optimize=False,
+            convergence_window=3, convergence_epsilon=1.0
+        )
+
+        self.assertEqual(sorted(data), [1, 2, 3, 4])
+        self.assertEqual(data[4]['stop_reason'], 'converged')
+        self.assertTrue(all(0 <= data[gen]['hypervolume'] <= 1 for gen in data))
@@ -0,0 +1,86 @@
+import time
+from multiprocessing import AuthenticationError
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import islands
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.utilities.xceptions import UnknownOptionException
+
+
+class TopologyTest(TestCase):
+    def test_neighbors(self):
+        self.assertEqual(islands.neighbors(3, 4, 'ring'), [0])
+        self.assertEqual(islands.neighbors(1, 4, 'full'), [0, 2, 3])
+        self.assertEqual(islands.neighbors(0, 1, 'ring'), [])
+
+        with self.assertRaises(UnknownOptionException):
+            islands.neighbors(0, 4, 'star')
+
+
+class TransportTest(TestCase):
+    def _round_trip(self, transport):
+        migrants = [(np.array([1, 2, 2], dtype=np.uint8), {1: {'total_pop': 1, 'components': 1}})]
+        transport.open(0)
+        try:
+            transport.send(0, migrants)
+            batches = []
+            for _ in range(100):
+                batches += transport.receive(0)
+                if batches:
+                    break
+                time.sleep(0.01)
+        finally:
+            transport.close()
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0][0][0].tolist(), [1, 2, 2])
+        self.assertEqual(batches[0][0][1], migrants[0][1])
+
+    def test_queue_transport(self):
+        self._round_trip(islands.QueueTransport(1))
+
+    def test_socket_transport(self):
+        self._round_trip(islands.SocketTransport.local(1))
+
+    def test_socket_authkey(self):
+        transport = islands.SocketTransport.local(1)
+        intruder = islands.SocketTransport(transport.addresses, authkey=b'elbridge')
+        transport.open(0)
+        try:
+            with self.assertRaises(AuthenticationError):
+                intruder.send(0, [])
+
+            # the listener outlives refused connections
+            transport.send(0, [])
+            batches = []
+            for _ in range(100):
+                batches += transport.receive(0)
+                if batches:
+                    break
+                time.sleep(0.01)
+        finally:
+            transport.close()
+
+        self.assertEqual(batches, [[]])
+
+
+class IslandLoadTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([6, 6])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+
+    def test_islands_merge_frontiers(self):
+        for transport in (None, islands.SocketTransport.local(3)):
+            frontier, stats = islands.run_islands(
+                self.master_graph, [PopulationEquality(self.master_graph)], islands=3, topology='full',
+                migration_interval=2, max_generations=6, pop_size=10, optimize=False, transport=transport, seed=1
+            )
+
+            self.assertTrue(frontier)
+            self.assertEqual(len({p.chromosome for p in frontier}), len(frontier))
+            self.assertEqual(sorted(stats), [0, 1, 2])
+            self.assertTrue(all(island['generations'] == 6 and island['migrants_sent'] > 0 for island in stats.values()))
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.memetic import MemeticPlan, MemeticScheduler, promising
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class PromisingTest(TestCase):
+    def test_fronts_then_distance(self):
+        scores = np.array([[0, 0], [3, 1], [1, 3], [2, 2], [1, 1], [2, 2.5]])
+        self.assertEqual(promising(scores, 1.0, [0, 0], [3, 3]), [0, 1, 2, 3, 4, 5])
+        # front one is 1, 2 and 5, and 5 is the most crowded of them
+        self.assertEqual(promising(scores, 0.3, [0, 0], [3, 3]), [1, 2])
+        self.assertEqual(promising(scores, 0.5, [0, 0], [3, 3]), [1, 2, 5])
+
+
+class MemeticSchedulerTest(TestCase):
+    def test_interval(self):
+        scheduler = MemeticScheduler(interval=3)
+        self.assertEqual([gen for gen in range(1, 10) if scheduler.plan(gen)], [3, 6, 9])
+
+    def test_grow_and_shrink(self):
+        scheduler = MemeticScheduler(interval=4, fraction=0.5, steps=10, sample_size=20)
+        scheduler.record(None, gain=1.0, seconds=1.0)
+        plan = MemeticPlan(0.5, 10, 20)
+
+        # one unit beyond evolution's one per second, in one second of local search
+        decision = scheduler.record(plan, gain=3.0, seconds=2.0, search_seconds=1.0)
+        self.assertEqual(decision['decision'], 'grow')
+        self.assertEqual((scheduler.fraction, scheduler.steps, scheduler.interval), (0.75, 15, 2))
+
+        for _ in range(20):
+            decision = scheduler.record(plan, gain=1.0, seconds=11.0, search_seconds=10.0)
+        self.assertEqual(decision['decision'], 'shrink')
+        self.assertEqual((scheduler.fraction, scheduler.steps), (scheduler.min_fraction, scheduler.min_steps))
+        self.assertEqual(scheduler.interval, scheduler.max_interval)
+
+
+class AdaptiveRunTest(TestCase):
+    def test_run(self):
+        master_graph = nx.grid_graph([4, 4])
+        master_graph.graph['districts'] = 2
+        nx.set_node_attributes(master_graph, {i: 1 for i in master_graph}, name='pop')
+        objectives = [PopulationEquality(master_graph)]
+        Chromosome.objectives = objectives
+
+        _, data = run_nsga2(
+            master_graph, objectives, max_generations=6, pop_size=6, multiprocess=False, optimization_interval=2,
+            adaptive_memetic=True
+        )
+
+        self.assertNotIn('memetic', data[1])
+        self.assertFalse(data[3]['memetic']['searched'])
+        # nothing to compare with until a generation without local search has been measured
+        self.assertEqual(data[2]['memetic']['decision'], 'hold')
+        self.assertIn(data[4]['memetic']['decision'], ('grow', 'shrink'))
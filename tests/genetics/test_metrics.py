@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.metrics import MetricsLog, best_scores, generation_record, read_metrics, time_to_target
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class MetricsLogTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'metrics.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        record = generation_record(np.array([[-3.0, 1.0], [-1.0, 0.0]]), [1, 1, 2, 3, 3], 5, 0.5, 0.7)
+        with MetricsLog(self.path) as log:
+            log.write(1, **record)
+            log.write(2, hypervolume=np.float64(0.25), **record)
+
+        records = read_metrics(self.path)
+        self.assertEqual([r['generation'] for r in records], [1, 2])
+        self.assertEqual(records[0]['front_sizes'], [2, 1, 2])
+        self.assertEqual(records[1]['hypervolume'], 0.25)
+        self.assertEqual(best_scores(records), [-1.0, -1.0])
+
+    def test_time_to_target(self):
+        records = [{'frontier': [[-5.0]], 'seconds': 1.0}, {'frontier': [[-2.0], [-4.0]], 'seconds': 0.5},
+                   {'frontier': [[-1.0]], 'seconds': 2.0}]
+        self.assertEqual(time_to_target(records, -2.0), 1.5)
+        self.assertEqual(time_to_target(records, -1.0), 3.5)
+        self.assertIsNone(time_to_target(records, 0.0))
+
+    def test_resumed_and_truncated(self):
+        with MetricsLog(self.path) as log:
+            log.write(1, value=1)
+            log.write(2, value=2)
+        # a resumed run repeats generation 2
+        with MetricsLog(self.path) as log:
+            log.write(2, value=3)
+        with open(self.path, 'a') as outfile:
+            outfile.write('{"generation": 3, "val')
+
+        self.assertEqual([(r['generation'], r['value']) for r in read_metrics(self.path)], [(1, 1), (2, 3)])
+
+    def test_run(self):
+        master_graph = nx.grid_graph([4, 4])
+        master_graph.graph['districts'] = 2
+        nx.set_node_attributes(master_graph, {i: 1 for i in master_graph}, name='pop')
+        objectives = [PopulationEquality(master_graph)]
+        Chromosome.objectives = objectives
+
+        _, data = run_nsga2(
+            master_graph, objectives, max_generations=3, pop_size=6, multiprocess=False, optimize=False,
+            metrics_path=self.path
+        )
+
+        with open(self.path) as infile:
+            self.assertEqual(len(infile.readlines()), 3)
+        records = read_metrics(self.path)
+        self.assertEqual([r['generation'] for r in records], [1, 2, 3])
+        self.assertEqual(records[-1]['stop_reason'], 'max_generations')
+        for record in records:
+            self.assertEqual(sum(record['front_sizes']), 6)
+            self.assertEqual(record['hypervolume'], data[record['generation']]['hypervolume'])
+            self.assertNotIn('pareto_frontier', data[record['generation']])
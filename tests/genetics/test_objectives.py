@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import genetics, variation
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.objectives import ObjectiveFunction, PopulationEquality, score_batch
+
+
+class Constant(ObjectiveFunction):
+    def __call__(self, chromosome):
+        return 0
+
+
+class ObjectivesTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([5, 5])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: 1 + sum(i) for i in self.master_graph}, name='pop')
+        nx.set_node_attributes(self.master_graph, {i: i[0] * 0.5 for i in self.master_graph}, name='area')
+
+    def test_score_batch(self):
+        objectives = [PopulationEquality(self.master_graph), PopulationEquality(self.master_graph, key='area')]
+        Chromosome.objectives = objectives
+
+        # fragmented plans, and plans with too few and too many districts
+        assignments = np.vstack([
+            np.random.randint(1, 4, size=(10, 25)),
+            np.random.randint(1, 3, size=(5, 25)),
+            np.random.randint(1, 6, size=(5, 25)),
+            np.ones((1, 25), dtype=np.int64),
+        ])
+        assignments = variation.normalize(assignments)
+
+        scores = score_batch(objectives, assignments)
+        self.assertEqual(scores.shape, (21, 2))
+        for assignment, row in zip(assignments, scores):
+            chromosome = Chromosome(self.master_graph, assignment.tolist())
+            self.assertTrue(np.allclose(row, chromosome.get_scores()))
+
+    def test_unsupported(self):
+        objectives = [PopulationEquality(self.master_graph), Constant()]
+        self.assertIsNone(score_batch(objectives, np.ones((2, 25), dtype=np.int64)))
+
+    def test_generate_population(self):
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+        population = genetics.generate_population(self.master_graph, 6)
+
+        self.assertEqual(len(population), 6)
+        for candidate in population:
+            fresh = Chromosome(self.master_graph, candidate.chromosome.get_assignment())
+            self.assertEqual(candidate.chromosome.get_assignment(), fresh.get_assignment())
+            self.assertEqual(candidate.chromosome.get_scores(), fresh.get_scores())
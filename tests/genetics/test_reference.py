@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import reference
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import run_nsga2
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.utilities.xceptions import UnknownOptionException
+
+
+class ReferenceTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+
+    def test_reference_directions(self):
+        directions = reference.reference_directions(3, 4)
+        self.assertEqual(len(directions), reference.direction_count(3, 4))
+        self.assertEqual(len(directions), 15)
+        self.assertTrue(np.allclose(directions.sum(axis=1), 1))
+        self.assertEqual(len(np.unique(directions, axis=0)), 15)
+        self.assertTrue(np.allclose(directions * 4, np.round(directions * 4)))
+
+        self.assertEqual(reference.reference_directions(2, 2).tolist(), [[0, 1], [0.5, 0.5], [1, 0]])
+        self.assertEqual(reference.reference_directions(1, 3).tolist(), [[1.0]])
+
+    def test_default_divisions(self):
+        self.assertEqual(reference.default_divisions(2, 10), 9)
+        self.assertEqual(reference.default_divisions(3, 100), 12)
+        self.assertEqual(reference.default_divisions(1, 100), 1)
+
+    def test_associate(self):
+        directions = reference.reference_directions(2, 2)
+        nearest, distances = reference.associate(np.array([[0, 1], [3, 3], [1, 0], [2, 0.1]]), directions)
+        self.assertEqual(nearest.tolist(), [0, 1, 2, 2])
+        self.assertTrue(np.allclose(distances, [0, 0, 0, 0.1]))
+
+    def test_select(self):
+        # one front along x + y = 10, crowded around (9, 1)
+        scores = np.array([[9, 1], [9.1, 0.9], [8.9, 1.1], [9.2, 0.8], [1, 9], [5, 5], [-1, -1]])
+        ranks = np.array([1, 1, 1, 1, 1, 1, 2])
+        directions = reference.reference_directions(2, 2)
+
+        survivors, niche_counts = reference.select(scores, ranks, 3, directions)
+        self.assertEqual(len(survivors), 3)
+        self.assertIn(4, survivors.tolist())
+        self.assertIn(5, survivors.tolist())
+        self.assertEqual(niche_counts.tolist(), [1, 1, 1])
+
+        # whole fronts are kept before anyone of the next
+        survivors, _ = reference.select(scores, ranks, 7, directions)
+        self.assertEqual(sorted(survivors.tolist()), list(range(7)))
+        survivors, _ = reference.select(scores, [2, 2, 2, 2, 2, 2, 1], 1, directions)
+        self.assertEqual(survivors.tolist(), [6])
+
+    def test_run(self):
+        master_graph = nx.grid_graph([4, 4])
+        master_graph.graph['districts'] = 2
+        for key in ('a', 'b', 'c', 'd'):
+            nx.set_node_attributes(master_graph, {i: np.random.randint(1, 10) for i in master_graph}, name=key)
+        objectives = [PopulationEquality(master_graph, key=key) for key in ('a', 'b', 'c', 'd')]
+        Chromosome.objectives = objectives
+
+        frontier, data = run_nsga2(
+            master_graph, objectives, max_generations=4, pop_size=10, multiprocess=False, optimize=False,
+            selection='reference'
+        )
+        self.assertEqual(sorted(data), [1, 2, 3, 4])
+        self.assertTrue(all(p.rank == 1 for p in frontier))
+
+        with self.assertRaises(UnknownOptionException):
+            run_nsga2(master_graph, objectives, max_generations=1, pop_size=4, selection='random')
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import genetics
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.contiguity import fragment_counts, largest_fragments
+from elbridge.evolution.engine import ProcessEngine
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.evolution.repair import REPAIRS, repair_fragments
+
+
+class RepairTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([8, 8])
+        self.master_graph.graph['districts'] = 4
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+        REPAIRS.stats(reset=True)
+
+    def test_path_graph(self):
+        graph = nx.path_graph(8)
+        nx.set_node_attributes(graph, {i: 1 for i in graph}, name='pop')
+        # the stray 1 borders districts 2 (three vertices) and 3 (two), and joins the smaller
+        repaired, counts = repair_fragments(graph, [1, 1, 2, 2, 2, 1, 3, 3])
+        self.assertEqual(repaired.tolist(), [[1, 1, 2, 2, 2, 3, 3, 3]])
+        self.assertEqual(counts.tolist(), [1])
+
+    def test_contiguous(self):
+        batch = np.random.randint(1, 5, size=(10, len(self.master_graph)))
+        repaired, counts = repair_fragments(self.master_graph, batch)
+
+        before = fragment_counts(self.master_graph, batch)
+        after = fragment_counts(self.master_graph, repaired)
+        for row, original, fixed, count in zip(repaired, before, after, counts):
+            self.assertEqual(np.unique(row).tolist(), [1, 2, 3, 4])
+            self.assertTrue(np.all(fixed[1:] == 1))
+            # a stray fragment moves at most once; some are reunited with their district by others' moves
+            self.assertTrue(0 < count <= original[1:].sum() - 4)
+
+        # contiguous plans are left alone
+        repaired_again, counts = repair_fragments(self.master_graph, repaired)
+        self.assertTrue(np.all(repaired_again == repaired))
+        self.assertEqual(counts.tolist(), [0] * 10)
+        self.assertTrue(np.all(largest_fragments(self.master_graph, repaired)))
+
+    def test_make_children(self):
+        parents = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(8)]
+        children = genetics.make_children(parents, 0.5, repair=True)
+
+        for child in children:
+            self.assertTrue(all(s['components'] == 1 for s in child.chromosome.get_component_scores().values()))
+        stats = REPAIRS.stats(reset=True)
+        self.assertEqual(stats['children'], 8)
+        self.assertGreater(stats['fragments'], 0)
+
+        with ProcessEngine(self.master_graph, Chromosome.objectives, processes=2, repair=True) as engine:
+            children = engine.make_children(genetics.select_pairs(parents), 0.5)
+        for child in children:
+            self.assertTrue(all(s['components'] == 1 for s in child.chromosome.get_component_scores().values()))
+        self.assertEqual(REPAIRS.stats()['children'], 8)
+
+    def test_run(self):
+        _, data = genetics.run_nsga2(
+            self.master_graph, Chromosome.objectives, max_generations=2, pop_size=6, multiprocess=False,
+            optimize=False, repair=True
+        )
+        self.assertEqual(data[1]['repair']['children'], 6)
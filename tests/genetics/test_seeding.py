@@ -0,0 +1,78 @@
+import random
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import seeding
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.contiguity import fragment_counts
+from elbridge.evolution.engine import ProcessEngine
+from elbridge.evolution.genetics import generate_population, run_nsga2
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.utilities.xceptions import UnknownOptionException
+
+
+class SeedingTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([12, 12])
+        self.master_graph.graph['districts'] = 5
+        nx.set_node_attributes(
+            self.master_graph, {i: int(np.random.randint(1, 20)) for i in self.master_graph}, name='pop'
+        )
+        self.populations = np.array([self.master_graph.nodes[v]['pop'] for v in self.master_graph])
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+    def test_strategies(self):
+        for strategy, tolerance in (('bfs', 1.0), ('tree', 0.1), ('spectral', 0.2)):
+            for _ in range(3):
+                assignment = seeding.seed_plan(self.master_graph, strategy)
+                self.assertEqual(sorted(np.unique(assignment).tolist()), [1, 2, 3, 4, 5], strategy)
+                self.assertTrue(np.all(fragment_counts(self.master_graph, assignment)[1:] == 1), strategy)
+
+                totals = np.bincount(assignment, weights=self.populations)[1:]
+                self.assertLess(totals.max() / totals.min() - 1, tolerance, strategy)
+
+        with self.assertRaises(UnknownOptionException):
+            seeding.seed_plan(self.master_graph, 'random')
+
+    def test_seeded_plan(self):
+        state = np.random.get_state()
+        first = seeding.seeded_plan(self.master_graph, ('tree', 7))
+        self.assertTrue(np.all(seeding.seeded_plan(self.master_graph, ('tree', 7)) == first))
+        self.assertTrue(np.all(np.random.get_state()[1] == state[1]))
+
+    def test_generate_population(self):
+        population = generate_population(self.master_graph, 6, seeding='mixed')
+        for candidate in population:
+            self.assertTrue(all(s['components'] == 1 for s in candidate.chromosome.get_component_scores().values()))
+
+        with ProcessEngine(self.master_graph, Chromosome.objectives, processes=2) as engine:
+            random.seed(1)
+            parallel = generate_population(self.master_graph, 4, seeding='bfs', engine=engine)
+        random.seed(1)
+        serial = generate_population(self.master_graph, 4, seeding='bfs')
+        self.assertEqual([p.chromosome.get_assignment() for p in parallel],
+                         [p.chromosome.get_assignment() for p in serial])
+
+    def test_warm_plans(self):
+        plan = seeding.seed_plan(self.master_graph, 'tree')
+        warm = seeding.warm_plans(self.master_graph, [plan], 4)
+        self.assertEqual(warm.shape, (4, 144))
+        self.assertTrue(np.all(warm[0] == plan))
+        for copy in warm[1:]:
+            self.assertTrue(0 < np.count_nonzero(copy != plan) < 20)
+            self.assertTrue(np.all(fragment_counts(self.master_graph, copy)[1:] == 1))
+
+        population = generate_population(self.master_graph, 6, seeding='bfs', plans=[plan], warm_fraction=0.5)
+        self.assertEqual(len(population), 6)
+        self.assertEqual(np.unique(population[0].chromosome.assignment_array()).tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(seeding.warm_plans(self.master_graph, [plan, plan + 0], 1).shape, (1, 144))
+
+    def test_run(self):
+        _, data = run_nsga2(
+            self.master_graph, Chromosome.objectives, max_generations=2, pop_size=6, multiprocess=False,
+            optimize=False, seeding='tree'
+        )
+        self.assertEqual(sorted(data), [1, 2])
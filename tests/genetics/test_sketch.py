@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import seeding, sketch
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.genetics import evaluate_generation, run_nsga2, sketch_population
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class SketchTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([10, 10])
+        self.master_graph.graph['districts'] = 4
+        nx.set_node_attributes(self.master_graph, {i: 1 for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+    def plans(self, count):
+        return [seeding.seed_plan(self.master_graph, 'tree') for _ in range(count)]
+
+    def test_sketches(self):
+        plan = np.repeat([1, 2, 3, 4], 25)
+        relabeled = 5 - plan
+        nearby = plan.copy()
+        nearby[25] = 1
+        other = np.random.randint(1, 5, size=100)
+
+        sketched = sketch.sketches(self.master_graph, [plan, relabeled, nearby, other])
+        self.assertEqual(sketched.shape, (4, sketch.SKETCH_SIZE))
+        self.assertTrue(np.all(sketched[0] == sketched[1]))
+        self.assertGreater(sketch.similarity(sketched[0], sketched[2]), 0.6)
+        self.assertLess(sketch.similarity(sketched[0], sketched[3]), 0.2)
+
+        # a single district cuts nothing
+        self.assertTrue(np.all(sketch.sketches(self.master_graph, np.ones(100, dtype=int)) == sketch.EMPTY))
+
+    def test_near_duplicates(self):
+        plans = self.plans(30)
+        # one vertex of a district's boundary moves over
+        plans[7] = plans[3]
+        vertex = int(np.flatnonzero(plans[3] != plans[3][0])[0])
+        plans[7][vertex] = plans[3][0]
+        sketched = sketch.sketches(self.master_graph, plans)
+
+        self.assertEqual(sketch.near_duplicates(sketched), [(3, 7)])
+        novelty = sketch.novelty(sketched)
+        self.assertLess(novelty[3], 0.2)
+        self.assertLess(novelty[7], 0.2)
+        self.assertTrue(np.all(np.delete(novelty, [3, 7]) > 0.5))
+
+    def test_tie_breaker(self):
+        plans = self.plans(3)
+        population = [Candidate(Chromosome(self.master_graph, plan.tolist())) for plan in (plans[0], plans[0])]
+        population += [Candidate(Chromosome(self.master_graph, plan.tolist())) for plan in plans[1:]]
+        self.assertEqual(sketch_population(population).shape, (4, sketch.SKETCH_SIZE))
+
+        # a front of four; the twins tie with the unique plans on rank, but not on novelty
+        parents, _ = evaluate_generation(population[:2], population[2:], diversity=True)
+        self.assertEqual([p.novelty for p in population[:2]], [0.0, 0.0])
+        self.assertTrue(all(p.novelty > 0.5 for p in population[2:]))
+        self.assertFalse(parents[0].novelty == parents[1].novelty == 0.0)
+
+    def test_run(self):
+        _, data = run_nsga2(
+            self.master_graph, Chromosome.objectives, max_generations=2, pop_size=6, multiprocess=False,
+            optimize=False, diversity=True
+        )
+        self.assertIn('near_duplicates', data[2])
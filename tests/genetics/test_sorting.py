@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+import numpy as np
+
+from elbridge.evolution import sorting
+from elbridge.utilities.utils import dominates
+
+
+def reference_ranks(scores):
+    """Peel fronts off one at a time with pairwise comparisons."""
+    ranks = [-1] * len(scores)
+    remaining = set(range(len(scores)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining if not any(dominates(list(scores[j]), list(scores[i])) for j in remaining)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+
+    return ranks
+
+
+class SortingTest(TestCase):
+    def test_two_objectives(self):
+        for _ in range(20):
+            scores = np.random.randint(0, 8, size=(60, 2))
+            self.assertEqual(sorting.non_dominated_ranks(scores).tolist(), reference_ranks(scores))
+            self.assertEqual(sorting._pairwise_ranks(scores.astype(float)).tolist(), reference_ranks(scores))
+
+    def test_many_objectives(self):
+        for objectives in (1, 3, 5):
+            scores = np.random.randint(0, 5, size=(50, objectives))
+            self.assertEqual(sorting.non_dominated_ranks(scores).tolist(), reference_ranks(scores))
+
+    def test_chunked_domination_matrix(self):
+        scores = np.random.rand(30, 3)
+        expected = sorting.domination_matrix(scores)
+
+        chunk_size, sorting.CHUNK_SIZE = sorting.CHUNK_SIZE, 7
+        try:
+            self.assertTrue(np.array_equal(sorting.domination_matrix(scores), expected))
+        finally:
+            sorting.CHUNK_SIZE = chunk_size
+
+    def test_fronts_from_ranks(self):
+        self.assertEqual(sorting.fronts_from_ranks(np.array([1, 0, 2, 0, 1])), [[1, 3], [0, 4], [2]])
+        self.assertEqual(sorting.fronts_from_ranks(np.array([])), [])
+
+
+def reference_crowding(scores, min_values, max_values):
+    """Textbook NSGA-II crowding distance, one candidate at a time."""
+    distances = [0.0] * len(scores)
+    for obj in range(len(min_values)):
+        ordered = sorted(range(len(scores)), key=lambda i, o=obj: scores[i][o])
+        distances[ordered[0]] = distances[ordered[-1]] = float('inf')
+        for pos in range(1, len(ordered) - 1):
+            gap = scores[ordered[pos + 1]][obj] - scores[ordered[pos - 1]][obj]
+            distances[ordered[pos]] += gap / (max_values[obj] - min_values[obj])
+
+    return distances
+
+
+class CrowdingTest(TestCase):
+    def test_matches_reference(self):
+        for objectives in (1, 2, 4):
+            scores = np.random.randint(-50, 0, size=(40, objectives))
+            min_values, max_values = [-50] * objectives, [0] * objectives
+
+            self.assertEqual(
+                np.round(sorting.crowding_distances(scores, min_values, max_values), 9).tolist(),
+                np.round(reference_crowding(scores.tolist(), min_values, max_values), 9).tolist()
+            )
+
+    def test_small_fronts_are_boundaries(self):
+        self.assertEqual(sorting.crowding_distances(np.zeros((2, 2)), [0, 0], [1, 1]).tolist(), [float('inf')] * 2)
+
+    def test_empty_range(self):
+        distances = sorting.crowding_distances(np.array([[0.0], [1.0], [2.0]]), [0], [0])
+        self.assertEqual(distances.tolist(), [float('inf'), 0.0, float('inf')])
@@ -0,0 +1,71 @@
+import random
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import genetics, sorting
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.objectives import PopulationEquality
+from elbridge.evolution.steady import SteadyStatePopulation, run_steady_state
+
+
+class SteadyStatePopulationTest(TestCase):
+    def setUp(self):
+        self.master_graph = nx.grid_graph([5, 5])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: random.randint(1, 9) for i in self.master_graph}, name='pop')
+        nx.set_node_attributes(self.master_graph, {i: random.randint(1, 9) for i in self.master_graph}, name='area')
+        Chromosome.objectives = [PopulationEquality(self.master_graph), PopulationEquality(self.master_graph, 'area')]
+
+    def candidates(self, count):
+        return [Candidate(Chromosome.generate(self.master_graph)) for _ in range(count)]
+
+    def assert_sorted(self, population):
+        members = population.members()
+        ranks = sorting.non_dominated_ranks(genetics.score_matrix(members))
+        self.assertEqual([p.rank for p in members], (ranks + 1).tolist())
+        self.assertEqual([len(front) for front in population.fronts], np.bincount(ranks).tolist())
+
+    def test_insert_keeps_fronts(self):
+        population = SteadyStatePopulation(self.candidates(10))
+        for candidate in self.candidates(30):
+            population.insert(candidate)
+            self.assert_sorted(population)
+
+    def test_remove_worst(self):
+        population = SteadyStatePopulation(self.candidates(10))
+        size = len(population)
+        for candidate in self.candidates(30):
+            if population.insert(candidate):
+                worst = population.remove_worst()
+                self.assertEqual(len(population), size)
+                self.assertNotIn(worst, population.members())
+                self.assert_sorted(population)
+
+    def test_duplicates(self):
+        candidate = self.candidates(1)[0]
+        population = SteadyStatePopulation([candidate])
+        duplicate = Candidate(Chromosome(self.master_graph, candidate.chromosome.get_assignment()[:]))
+        self.assertFalse(population.insert(duplicate))
+        self.assertEqual(len(population.members()), 1)
+
+
+class SteadyStateRunTest(TestCase):
+    def test_run(self):
+        master_graph = nx.grid_graph([5, 5])
+        master_graph.graph['districts'] = 2
+        nx.set_node_attributes(master_graph, {i: 1 for i in master_graph}, name='pop')
+        objectives = [PopulationEquality(master_graph)]
+
+        frontier, data = run_steady_state(
+            master_graph, objectives, max_generations=4, pop_size=8, processes=2, optimization_interval=3
+        )
+
+        self.assertEqual(sorted(data), [1, 2, 3, 4])
+        self.assertEqual(data[4]['stop_reason'], 'max_generations')
+        self.assertTrue(all(1 <= data[gen]['unique_parents'] <= 8 for gen in data))
+        self.assertTrue(frontier)
+        for candidate in frontier:
+            self.assertFalse(any(other.dominates(candidate) for other in frontier))
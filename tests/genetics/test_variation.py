@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution import genetics, variation
+from elbridge.evolution.candidate import Candidate
+from elbridge.evolution.chromosome import Chromosome
+from elbridge.evolution.objectives import PopulationEquality
+
+
+class VariationTest(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.master_graph = nx.grid_graph([5, 5])
+        self.master_graph.graph['districts'] = 3
+        nx.set_node_attributes(self.master_graph, {i: 1 + sum(i) for i in self.master_graph}, name='pop')
+        Chromosome.objectives = [PopulationEquality(self.master_graph)]
+
+    def test_tournament(self):
+        ranks = np.array([2, 1, 1, 3])
+        distances = np.array([5.0, 1.0, 2.0, 9.0])
+        # best to worst: 2, 1, 0, 3
+        preference = [2, 1, 0, 3]
+
+        np.random.seed(1)
+        entrants = np.random.randint(4, size=(100, 3))
+        np.random.seed(1)
+        winners = variation.tournament(ranks, distances, 100)
+
+        expected = [min(row, key=preference.index) for row in entrants.tolist()]
+        self.assertEqual(winners.tolist(), expected)
+
+    def test_crossover(self):
+        first = np.ones((50, 10), dtype=np.int64)
+        second = 2 * np.ones((50, 10), dtype=np.int64)
+        children = variation.crossover(first, second)
+
+        self.assertEqual(children.shape, (100, 10))
+        # each child is a prefix of one parent followed by a suffix of the other
+        self.assertTrue(np.all(np.diff(children[0::2], axis=1) >= 0))
+        self.assertTrue(np.all(np.diff(children[1::2], axis=1) <= 0))
+        self.assertTrue(np.all(children[0::2] + children[1::2] == 3))
+
+    def test_align(self):
+        first = np.array([[1, 1, 2, 2, 3, 3]])
+        second = np.array([[2, 2, 3, 3, 1, 4]])
+        self.assertEqual(variation.align(first, second).tolist(), [[1, 1, 2, 2, 3, 4]])
+
+    def test_graph_crossover(self):
+        vertices = list(self.master_graph)
+        # three vertical stripes, and the same stripes relabeled
+        first = np.array([[1 + vertex[0] * 3 // 5 for vertex in vertices]] * 4)
+        second = 4 - first
+        children = variation.graph_crossover(self.master_graph, first, second)
+        self.assertTrue(np.all(children == np.repeat(first, 2, axis=0)))
+
+        # random contiguous parents give contiguous children
+        parents = np.array([[1 + (vertex[i % 2] >= 1 + i % 3) for vertex in vertices] for i in range(10)])
+        children = variation.normalize(variation.graph_crossover(self.master_graph, parents[0::2], parents[1::2]))
+        self.assertEqual(children.shape, (10, 25))
+        counts = variation.fragment_counts(self.master_graph, children)
+        for child, row in zip(children, counts):
+            self.assertTrue(np.all(row[np.unique(child)] == 1))
+
+    def test_mutate(self):
+        children = np.tile(np.array([1, 2, 3, 3, 1]), (200, 1))
+        self.assertTrue(np.all(variation.mutate(children.copy(), 0.0) == children))
+
+        mutated = variation.mutate(children.copy(), 1.0)
+        self.assertTrue(np.all((mutated != children).sum(axis=1) <= 1))
+        self.assertTrue(np.all((mutated >= 1) & (mutated <= 3)))
+        self.assertTrue(np.any(mutated != children))
+
+    def test_normalize(self):
+        assignments = np.random.randint(1, 6, size=(20, 25))
+        normalized = variation.normalize(assignments)
+        for assignment, row in zip(assignments, normalized):
+            chromosome = Chromosome(self.master_graph, assignment.tolist())
+            chromosome.normalize()
+            self.assertEqual(row.tolist(), chromosome.get_assignment())
+
+    def test_component_scores(self):
+        assignments = variation.normalize(np.random.randint(1, 4, size=(20, 25)))
+        for assignment, scores in zip(assignments, variation.component_scores(self.master_graph, assignments)):
+            self.assertEqual(scores, Chromosome(self.master_graph, assignment.tolist()).get_component_scores())
+
+    def test_make_children(self):
+        parents = [Candidate(Chromosome.generate(self.master_graph)) for _ in range(9)]
+        children = genetics.make_children(parents, 0.5) + genetics.make_children(parents, 0.5, crossover='graph')
+
+        self.assertEqual(len(children), 16)
+        for child in children:
+            fresh = Chromosome(self.master_graph, child.chromosome.get_assignment()[:])
+            self.assertEqual(child.chromosome.get_scores(), fresh.get_scores())
+            self.assertEqual(child.chromosome.get_component_scores(), fresh.get_component_scores())
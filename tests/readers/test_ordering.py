@@ -0,0 +1,43 @@
+import random
+from unittest import TestCase
+
+import networkx as nx
+from shapely.geometry import box
+
+from elbridge.evolution.contiguity import neighbor_lists
+from elbridge.evolution.sketch import sketch_keys
+from elbridge.readers import ordering
+
+
+class OrderingTest(TestCase):
+    def setUp(self):
+        self.graph = nx.Graph()
+        cells = [(i, j) for i in range(8) for j in range(8)]
+        random.shuffle(cells)
+        self.graph.add_nodes_from(cells)
+        self.graph.add_edges_from(nx.grid_2d_graph(8, 8).edges())
+        nx.set_node_attributes(self.graph, {(i, j): box(i, j, i + 1, j + 1) for (i, j) in cells}, name='shape')
+
+    def _is_path(self, order):
+        by_index = sorted(order, key=order.get)
+        return all(self.graph.has_edge(a, b) for a, b in zip(by_index, by_index[1:]))
+
+    def test_hilbert_order_is_a_path(self):
+        order = ordering.hilbert_order(self.graph, bits=3)
+        self.assertEqual(sorted(order.values()), list(range(64)))
+        self.assertTrue(self._is_path(order))
+
+    def test_bandwidth_order(self):
+        order = ordering.bandwidth_order(self.graph)
+        self.assertEqual(sorted(order.values()), list(range(64)))
+        self.assertLessEqual(max(abs(order[i] - order[j]) for i, j in self.graph.edges()), 8)
+
+    def test_reorder_drops_derived_data(self):
+        # both build the adjacency too
+        neighbor_lists(self.graph)
+        sketch_keys(self.graph)
+        ordering.reorder(self.graph)
+
+        for key in ('adjacency', 'neighbor_lists', 'sketch_keys'):
+            self.assertNotIn(key, self.graph.graph)
+        self.assertEqual(sorted(self.graph.graph['order'].values()), list(range(64)))
@@ -0,0 +1,117 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import networkx as nx
+import numpy as np
+
+from elbridge.evolution.archive import ParetoArchive, write_plans, write_vertices
+from elbridge.evolution.metrics import MetricsLog
+from elbridge.readers import plans
+from elbridge.utilities.xceptions import PlanMismatchException, UnmatchedPlanException
+
+
+class PlansTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # a 4 x 4 grid named like block groups, row by row
+        grid = nx.grid_graph([4, 4])
+        self.graph = nx.relabel_nodes(grid, {(i, j): '5303300{}{}'.format(i, j) for i, j in grid})
+        nx.set_node_attributes(self.graph, {v: 1 for v in self.graph}, name='pop')
+        self.graph.graph['districts'] = 2
+        self.names = ['5303300{}{}'.format(i, j) for i in range(4) for j in range(4)]
+        self.order = [self.graph.graph.setdefault('order', {v: idx for idx, v in enumerate(self.graph)})[name]
+                      for name in self.names]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, filename, lines):
+        path = os.path.join(self.directory.name, filename)
+        with open(path, 'w') as outfile:
+            outfile.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_read_plan_csv(self):
+        path = self.write('plan.csv', ['GEOID,District', '530330000,3', '530330001,7'])
+        self.assertEqual(plans.read_plan_csv(path), {'530330000': '3', '530330001': '7'})
+
+        path = self.write('plain.csv', ['530330000,3', '530330001,7'])
+        self.assertEqual(plans.read_plan_csv(path), {'530330000': '3', '530330001': '7'})
+
+        # labels that aren't numbers don't make the first row a header
+        path = self.write('labels.csv', ['530330000,District 1', '530330001,District 2'])
+        self.assertEqual(plans.read_plan_csv(path), {'530330000': 'District 1', '530330001': 'District 2'})
+
+        # an exported chromosome
+        path = self.write('elements.csv', ['element,population,component', '530330000,12,2'])
+        self.assertEqual(plans.read_plan_csv(path), {'530330000': '2'})
+
+    def test_plan_assignment(self):
+        # left and right halves; one vertex missing, one the graph doesn't have
+        plan = {name: 'A' if name[-1] in '01' else 'B' for name in self.names}
+        del plan['530330012']
+        plan['539990000'] = 'A'
+
+        assignment = plans.plan_assignment(self.graph, plan)
+        by_name = assignment[self.order].reshape(4, 4)
+        self.assertEqual(by_name.tolist(), [[1, 1, 2, 2]] * 4)
+
+        with self.assertRaises(UnmatchedPlanException):
+            plans.plan_assignment(self.graph, {'539990000': '1'})
+
+        # a plan with more districts than the run
+        plan = {name: str(int(name[-1]) + 1) for name in self.names}
+        with self.assertRaises(PlanMismatchException):
+            plans.plan_assignment(self.graph, plan)
+
+    def test_fill_missing(self):
+        graph = nx.path_graph(6)
+        nx.set_node_attributes(graph, {v: 1 for v in graph}, name='pop')
+        self.assertEqual(plans.fill_missing(graph, [1, 0, 0, 2, 2, 0]).tolist(), [1, 1, 2, 2, 2, 2])
+
+        # vertices nothing assigned can reach join the least populated district
+        graph = nx.path_graph(6)
+        graph.add_node(6)
+        nx.set_node_attributes(graph, {v: 1 for v in graph}, name='pop')
+        self.assertEqual(plans.fill_missing(graph, [1, 1, 1, 2, 2, 2, 0]).tolist(), [1, 1, 1, 2, 2, 2, 1])
+
+    def test_read_plans(self):
+        csv_path = self.write('plan.csv', ['{},{}'.format(name, 1 + int(name[-2]) // 2) for name in self.names])
+
+        archive_path = os.path.join(self.directory.name, 'run.archive.jsonl')
+        archive = ParetoArchive(2)
+        with MetricsLog(archive_path) as log:
+            write_plans(log, 0, [archive.add(1, [0, 1], np.arange(16) % 2 + 1),
+                                 archive.add(2, [1, 0], np.arange(16) // 8 + 1)])
+
+        read = plans.read_plans(self.graph, [csv_path, archive_path])
+        self.assertEqual(read.shape, (3, 16))
+        self.assertEqual(read[0][self.order].tolist(), [1] * 8 + [2] * 8)
+
+        with self.assertRaises(PlanMismatchException):
+            plans.read_plans(nx.path_graph(3), [archive_path])
+
+        self.graph.graph['districts'] = 3
+        with self.assertRaises(PlanMismatchException):
+            plans.read_plans(self.graph, [archive_path])
+
+    def test_archive_vertex_names(self):
+        # left and right halves, by name
+        halves = np.array([1 if name[-1] in '01' else 2 for name in self.names])
+        assignment = np.zeros(16, dtype=np.int64)
+        assignment[self.order] = halves
+
+        archive_path = os.path.join(self.directory.name, 'run.archive.jsonl')
+        with MetricsLog(archive_path) as log:
+            write_vertices(log, self.graph)
+            write_plans(log, 0, [ParetoArchive(1).add(1, [0], assignment)])
+
+        # the same area after a data change: one vertex gone, and the rest in another order
+        changed = nx.Graph(self.graph.subgraph(self.names[1:]))
+        changed.graph = {'districts': 2, 'order': {name: idx for idx, name in enumerate(reversed(self.names[1:]))}}
+
+        read = plans.read_plans(changed, [archive_path])
+        self.assertEqual(read.shape, (1, 15))
+        by_name = {name: read[0][idx] for name, idx in changed.graph['order'].items()}
+        self.assertEqual([by_name[name] for name in self.names[1:]], halves[1:].tolist())
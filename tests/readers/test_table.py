@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import networkx as nx
+from shapely.geometry import box
+
+from elbridge.readers.table import get_table
+
+
+class NodeTableTest(TestCase):
+    def setUp(self):
+        self.graph = nx.path_graph(4)
+        nx.set_node_attributes(self.graph, {i: i + 1 for i in self.graph}, name='pop')
+        nx.set_node_attributes(self.graph, {0: 10, 3: 5}, name='DEM')
+        nx.set_node_attributes(self.graph, {i: box(i, 0, i + 1, 2) for i in self.graph}, name='shape')
+        self.graph.graph['order'] = {0: 3, 1: 2, 2: 1, 3: 0}
+
+    def test_columns_in_index_order(self):
+        table = get_table(self.graph)
+        self.assertEqual(table.pop.tolist(), [4, 3, 2, 1])
+        self.assertEqual(table.votes['DEM'].tolist(), [5, 0, 0, 10])
+        self.assertEqual(table.votes['REP'].tolist(), [0, 0, 0, 0])
+        self.assertEqual(table.area.tolist(), [2.0] * 4)
+        self.assertEqual(table.perimeter.tolist(), [6.0] * 4)
+        self.assertEqual(table.centroid_x.tolist(), [3.5, 2.5, 1.5, 0.5])
+        self.assertEqual(table.centroid_y.tolist(), [1.0] * 4)
+
+    def test_district_totals(self):
+        table = get_table(self.graph)
+        totals = table.district_totals('pop', [1, 1, 2, 2])
+        self.assertEqual(totals.tolist(), [0, 7, 3])
+        self.assertEqual(totals.dtype.kind, 'i')
+
+    def test_batch_district_totals(self):
+        table = get_table(self.graph)
+        totals = table.district_totals('pop', [[1, 1, 2, 2], [1, 2, 3, 1]], minlength=5)
+        self.assertEqual(totals.tolist(), [[0, 7, 3, 0, 0], [0, 5, 3, 2, 0]])
+
+    def test_rebuilt_when_order_changes(self):
+        table = get_table(self.graph)
+        self.assertIs(get_table(self.graph), table)
+
+        self.graph.graph['order'] = {i: i for i in self.graph}
+        self.assertEqual(get_table(self.graph).pop.tolist(), [1, 2, 3, 4])
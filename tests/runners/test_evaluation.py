@@ -0,0 +1,46 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from elbridge.evolution.genetics import RunOptions
+from elbridge.evolution.islands import run_islands
+from elbridge.evolution.steady import run_steady_state
+from elbridge.runners.evaluation import log_paths, nsga2_options, supported_options
+from elbridge.utilities.xceptions import UnsupportedOptionsException
+
+
+class EvaluationTest(TestCase):
+    def test_supported_options(self):
+        options = nsga2_options({'generations': 10, 'population_size': 20, 'topology': 'ring'})
+        self.assertEqual(supported_options(run_islands, options, 'island'), options)
+
+        with self.assertRaises(UnsupportedOptionsException) as context:
+            supported_options(run_islands, dict(options, convergence_window=100, resume=True), 'island')
+        self.assertIn('convergence_window, resume', str(context.exception))
+
+        with self.assertRaises(UnsupportedOptionsException):
+            supported_options(run_steady_state, dict(options, time_budget=60.0), 'steady state')
+
+        self.assertEqual(supported_options(RunOptions, dict(time_budget=60.0), 'generational'), {'time_budget': 60.0})
+        with self.assertRaises(UnsupportedOptionsException):
+            supported_options(RunOptions, dict(time_budget=60.0, topology='ring'), 'generational')
+
+    def test_log_paths(self):
+        self.assertEqual(log_paths('grid_1', {}), ('out/grid_1.jsonl', 'out/grid_1.archive.jsonl'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, 'checkpoint.npz')
+            metrics_path = os.path.join(directory, 'checkpoint.jsonl')
+            options = {'checkpoint_path': checkpoint_path, 'resume': True}
+            for path in (checkpoint_path, metrics_path):
+                with open(path, 'w') as outfile:
+                    outfile.write('{}\n')
+
+            # a resumed run keeps the logs of the run it continues, whenever it was started
+            archive_path = os.path.join(directory, 'checkpoint.archive.jsonl')
+            self.assertEqual(log_paths('grid_2', options), (metrics_path, archive_path))
+            self.assertTrue(os.path.exists(metrics_path))
+
+            # a fresh run starts them over
+            log_paths('grid_3', {'checkpoint_path': checkpoint_path})
+            self.assertFalse(os.path.exists(metrics_path))